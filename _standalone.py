@@ -0,0 +1,26 @@
+"""Load the integration's modules without Home Assistant.
+
+The package's __init__ sets up the Home Assistant integration. The scripts in
+the repository root and the tests register the package as a bare namespace
+instead, so its pure-Python modules import on their own.
+"""
+import importlib
+import sys
+import types
+from pathlib import Path
+
+PACKAGE_DIR = Path(__file__).parent / "custom_components" / "nl_fuel_prices"
+
+
+def register_package():
+    """Register nl_fuel_prices as a namespace package unless already imported."""
+    if "nl_fuel_prices" not in sys.modules:
+        package = types.ModuleType("nl_fuel_prices")
+        package.__path__ = [str(PACKAGE_DIR)]
+        sys.modules["nl_fuel_prices"] = package
+
+
+def load_module(name):
+    """Load a module of the integration without running its Home Assistant setup."""
+    register_package()
+    return importlib.import_module(f"nl_fuel_prices.{name}")
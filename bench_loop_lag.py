@@ -0,0 +1,266 @@
+"""Load test: event-loop lag and state writes with many config entries.
+
+Sets up N coordinators (10 to 500 by default) with their sensor entities
+against directlease_standin.py (on its own thread), all sharing one
+FuelPriceAPI as in Home Assistant, and drives refresh waves through
+DataUpdateCoordinator.async_refresh: a cold wave that downloads the
+catalogue, then warm waves with the detail cache cleared, as when the
+hourly refreshes of all entries line up. Every coordinator update writes
+the state of its sensors (native value and attributes, into hass.states),
+as CoordinatorEntity does.
+
+Per N it records:
+
+- event-loop lag: how late a 1ms ticker's callbacks run versus when they
+  were scheduled (p50/p99/max and total time blocked)
+- state-write throughput: states written per second of wave and per second
+  of loop time spent writing
+- wave duration and refresh failures
+
+The curve is written as JSON and printed, with the largest N whose worst
+stall stays under --stall-limit (asyncio's slow-callback threshold by
+default) reported as the safe limit. Needs a Python environment with Home
+Assistant installed; run from the repository root:
+
+    python bench_loop_lag.py [--entries 10,25,50,100,250,500] [--waves 3]
+        [--stations 4500] [--latency 0.02] [--spread 0]
+        [--stall-limit 100] [--output bench_loop_lag.json]
+"""
+import argparse
+import asyncio
+import json
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from homeassistant.core import HomeAssistant
+
+sys.path.insert(0, str(Path(__file__).parent / "custom_components"))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from bench_refresh import LoopMonitor, git_revision, make_entries, parse_list  # noqa: E402
+from directlease_standin import StandInConfig, start_in_thread  # noqa: E402
+from nl_fuel_prices import FuelPriceCoordinator  # noqa: E402
+from nl_fuel_prices.api import FuelPriceAPI  # noqa: E402
+from nl_fuel_prices.const import DOMAIN  # noqa: E402
+from nl_fuel_prices.json_decoder import JSON_DECODER  # noqa: E402
+from nl_fuel_prices.sensor import async_setup_entry as async_setup_sensors  # noqa: E402
+
+ENTRIES = (10, 25, 50, 100, 250, 500)
+STALL_LIMIT = 100  # ms, asyncio's default slow_callback_duration
+
+
+class StateWriter:
+    """Write the state of coordinator entities into hass.states and time it."""
+
+    def __init__(self, hass):
+        """Initialize the writer."""
+        self.hass = hass
+        self.entity_ids = []
+        self.writes = 0
+        self.seconds = 0.0
+
+    def add(self, coordinator, entities):
+        """Give the entities an entity_id and write their state on every update.
+
+        Entities disabled by default (diagnostics) write no state, as in HA.
+        """
+        entities = [entity for entity in entities if entity.entity_registry_enabled_default]
+        for index, entity in enumerate(entities):
+            entity.hass = self.hass
+            entity.entity_id = f"sensor.{coordinator.entry.entry_id}_{index}"
+            self.entity_ids.append(entity.entity_id)
+
+        def _handle_update():
+            for entity in entities:
+                self.write(entity)
+
+        coordinator.async_add_listener(_handle_update)
+
+    def write(self, entity):
+        """Write one entity's state the way async_write_ha_state would."""
+        started = time.perf_counter()
+        value = entity.native_value
+        attributes = dict(entity.extra_state_attributes or {})
+        attributes["friendly_name"] = entity.name
+        self.hass.states.async_set(
+            entity.entity_id, "unknown" if value is None else str(value), attributes
+        )
+        self.seconds += time.perf_counter() - started
+        self.writes += 1
+
+
+async def async_wave(coordinators, spread, rng):
+    """Refresh all coordinators, starting them uniformly within `spread` seconds."""
+
+    async def _async_refresh(coordinator):
+        if spread:
+            await asyncio.sleep(rng.uniform(0, spread))
+        started = time.perf_counter()
+        await coordinator.async_refresh()
+        return time.perf_counter() - started
+
+    return await asyncio.gather(*(_async_refresh(c) for c in coordinators))
+
+
+def summarize_wave(kind, durations, elapsed, monitor, writer, writes_before, seconds_before, coordinators):
+    """Return the metrics of one wave."""
+    writes = writer.writes - writes_before
+    write_seconds = writer.seconds - seconds_before
+    return {
+        "wave": kind,
+        "elapsed_s": round(elapsed, 3),
+        "refresh_p50_ms": round(statistics.median(durations) * 1000, 2),
+        "refresh_max_ms": round(max(durations) * 1000, 2),
+        "failed": sum(1 for c in coordinators if not c.last_update_success),
+        "state_writes": writes,
+        "state_writes_per_s": round(writes / elapsed, 1) if elapsed else None,
+        "write_loop_ms": round(write_seconds * 1000, 2),
+        "writes_per_loop_s": round(writes / write_seconds) if write_seconds else None,
+        **monitor.summary(),
+    }
+
+
+async def async_load_level(hass, base_url, entry_count, args):
+    """Set up `entry_count` entries with sensors, run the waves and tear down."""
+    rng = random.Random(entry_count)
+    api = FuelPriceAPI(executor=hass.async_add_executor_job, base_url=base_url)
+    api.limiter.set_budget(10**9, 10**6)
+    hass.data[DOMAIN] = {"api": api}
+    coordinators = []
+    for entry in make_entries(entry_count, args.radius, seed=entry_count):
+        entry.data["location_name"] = entry.entry_id
+        entry.data["postcode"] = entry.entry_id
+        coordinator = FuelPriceCoordinator(hass, api, entry)
+        hass.data[DOMAIN][entry.entry_id] = coordinator
+        coordinators.append(coordinator)
+
+    writer = StateWriter(hass)
+    waves = []
+    try:
+        for wave in range(args.waves):
+            if wave:
+                # Expired details, as at the next hourly refresh
+                api._detail_cache.clear()
+            writes_before, seconds_before = writer.writes, writer.seconds
+            started = time.perf_counter()
+            with LoopMonitor() as monitor:
+                durations = await async_wave(coordinators, args.spread, rng)
+            elapsed = time.perf_counter() - started
+            waves.append(summarize_wave(
+                "cold" if wave == 0 else "warm", durations, elapsed, monitor,
+                writer, writes_before, seconds_before, coordinators,
+            ))
+            if wave == 0:
+                # Platforms are set up after the first refresh, as in async_setup_entry
+                for coordinator in coordinators:
+                    if not coordinator.data:
+                        continue
+                    entities = []
+                    await async_setup_sensors(hass, coordinator.entry, entities.extend)
+                    writer.add(coordinator, entities)
+    finally:
+        await api.async_close()
+        for entity_id in writer.entity_ids:
+            hass.states.async_remove(entity_id)
+
+    warm = [wave for wave in waves if wave["wave"] == "warm"] or waves
+    return {
+        "entries": entry_count,
+        "entities": len(writer.entity_ids),
+        "waves": waves,
+        "worst_stall_ms": max(wave["longest_stall_ms"] for wave in waves),
+        "lag_p99_ms": max(wave["lag_p99_ms"] for wave in warm),
+        "state_writes_per_s": statistics.median(wave["state_writes_per_s"] or 0 for wave in warm),
+        "writes_per_loop_s": statistics.median(wave["writes_per_loop_s"] or 0 for wave in warm),
+    }
+
+
+async def async_run(args):
+    """Run every load level and return the curve."""
+    curve = []
+    standin, base_url, stop_standin = start_in_thread(StandInConfig(
+        stations=args.stations,
+        latency=args.latency,
+        jitter=args.latency / 2,
+        price_change_rate=0.1,
+    ))
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        try:
+            for entry_count in args.entries:
+                standin.reset_counts()
+                level = await async_load_level(hass, base_url, entry_count, args)
+                level["standin_requests"] = dict(standin.counts)
+                curve.append(level)
+                print_level(level)
+        finally:
+            stop_standin()
+            await hass.async_stop(force=True)
+    return curve
+
+
+def print_level(level):
+    """Print one line per load level."""
+    cold = level["waves"][0]
+    print(
+        f"{level['entries']:>4} entries | cold wave {cold['elapsed_s']:>6.2f}s "
+        f"stall {cold['longest_stall_ms']:>7.1f}ms | warm lag p99 {level['lag_p99_ms']:>7.2f}ms "
+        f"worst stall {level['worst_stall_ms']:>7.1f}ms | "
+        f"{level['state_writes_per_s']:>8.1f} writes/s ({level['writes_per_loop_s']:>7} per loop s)"
+    )
+
+
+def safe_limit(curve, stall_limit):
+    """Return the largest entry count below the first level whose worst stall exceeds the limit."""
+    safe = None
+    for level in sorted(curve, key=lambda item: item["entries"]):
+        if level["worst_stall_ms"] > stall_limit:
+            break
+        safe = level["entries"]
+    return safe
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the event loop with many config entries.")
+    parser.add_argument("--entries", type=parse_list, default=ENTRIES)
+    parser.add_argument("--waves", type=int, default=3, help="refresh waves per level, the first one cold")
+    parser.add_argument("--stations", type=int, default=4500, help="stand-in catalogue size")
+    parser.add_argument("--radius", type=float, default=10)
+    parser.add_argument("--latency", type=float, default=0.02, help="stand-in seconds per detail request")
+    parser.add_argument("--spread", type=float, default=0.0, help="seconds over which a wave's refreshes start")
+    parser.add_argument("--stall-limit", type=float, default=STALL_LIMIT, help="ms, longest acceptable stall")
+    parser.add_argument("--output", default="bench_loop_lag.json")
+    args = parser.parse_args()
+
+    curve = asyncio.run(async_run(args))
+    limit = safe_limit(curve, args.stall_limit)
+    report = {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "json_decoder": JSON_DECODER,
+            "stations": args.stations,
+            "standin_latency": args.latency,
+            "spread": args.spread,
+            "stall_limit_ms": args.stall_limit,
+        },
+        "safe_entries": limit,
+        "curve": curve,
+    }
+    with open(args.output, "w", encoding="utf-8") as output:
+        json.dump(report, output, indent=2)
+    if limit is None:
+        print(f"\nEven {curve[0]['entries']} entries stall the loop for more than {args.stall_limit:g}ms")
+    else:
+        print(f"\nSafe limit: {limit} entries (worst stall under {args.stall_limit:g}ms)")
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
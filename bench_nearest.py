@@ -0,0 +1,114 @@
+"""Benchmark: nearest-k station selection.
+
+Compares three ways of picking the k nearest stations within a radius:
+
+- dicts:   the previous path, one dict per in-radius place, full sort, slice
+- sort:    catalogue radius query, full sort of (distance, row), slice
+- heap:    catalogue bounded-heap selection (StationCatalogue.nearest)
+
+and checks that the heap returns exactly what the sort returns. Run from the
+repository root:
+
+    python bench_nearest.py [stations] [k]
+"""
+import math
+import random
+import sys
+import time
+
+from _standalone import load_module
+
+catalogue_module = load_module("catalogue")
+
+# Locations in the Randstad, where station density is highest
+LOCATIONS = {
+    "Amsterdam": (52.3676, 4.9041),
+    "Rotterdam": (51.9244, 4.4777),
+    "Utrecht": (52.0907, 5.1214),
+    "Hoorn": (52.6424, 5.0597),
+}
+RADII = (5, 10, 25, 50)
+
+
+def make_places(count, seed=1):
+    """Return places spread over the Netherlands, denser around the Randstad."""
+    rng = random.Random(seed)
+    places = []
+    for station_id in range(1, count + 1):
+        if rng.random() < 0.4:
+            lat, lng = rng.choice(list(LOCATIONS.values()))
+            lat += rng.gauss(0, 0.15)
+            lng += rng.gauss(0, 0.2)
+        else:
+            lat = 50.75 + rng.random() * 2.8
+            lng = 3.35 + rng.random() * 3.85
+        places.append({"id": station_id, "lat": lat, "lng": lng, "brand": "Shell", "city": "X"})
+    return places
+
+
+def select_dicts(places, latitude, longitude, radius, count):
+    """Previous path: a dict per place in the radius, sorted by distance."""
+    nearby = []
+    for item in places:
+        distance = catalogue_module.haversine(latitude, longitude, item["lat"], item["lng"])
+        if distance <= radius:
+            nearby.append({
+                "id": item["id"],
+                "lat": item["lat"],
+                "lng": item["lng"],
+                "distance": distance,
+                "brand": item.get("brand", "Unknown"),
+                "city": item.get("city", ""),
+            })
+    nearby.sort(key=lambda station: station["distance"])
+    return [(station["distance"], station["id"]) for station in nearby[:count]]
+
+
+def select_sort(catalogue, latitude, longitude, radius, count):
+    """Catalogue radius query followed by a full sort."""
+    matches = catalogue.query_radius(latitude, longitude, radius)
+    matches.sort()
+    return matches[:count]
+
+
+def select_heap(catalogue, latitude, longitude, radius, count):
+    """Catalogue bounded-heap selection."""
+    return catalogue.nearest(latitude, longitude, radius, count)
+
+
+def timed(func, *args, rounds=20):
+    """Return (mean seconds, result) over `rounds` calls."""
+    started = time.perf_counter()
+    for _ in range(rounds):
+        result = func(*args)
+    return (time.perf_counter() - started) / rounds, result
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 4500
+    k = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    places = make_places(count)
+    catalogue = catalogue_module.StationCatalogue.from_places(places)
+
+    print(f"{count} stations, k={k}")
+    print(f"{'location':<10} {'radius':>6} {'in radius':>9} {'dicts':>9} {'sort':>9} {'heap':>9}")
+    for name, (latitude, longitude) in LOCATIONS.items():
+        for radius in RADII:
+            in_radius = len(catalogue.query_radius(latitude, longitude, radius))
+            dicts_time, dicts = timed(select_dicts, places, latitude, longitude, radius, k)
+            sort_time, by_sort = timed(select_sort, catalogue, latitude, longitude, radius, k)
+            heap_time, by_heap = timed(select_heap, catalogue, latitude, longitude, radius, k)
+
+            assert by_heap == by_sort, (name, radius)
+            heap_ids = [(distance, catalogue.ids[row]) for distance, row in by_heap]
+            assert all(math.isclose(a[0], b[0]) and a[1] == b[1] for a, b in zip(heap_ids, dicts))
+
+            print(
+                f"{name:<10} {radius:>4}km {in_radius:>9} "
+                f"{dicts_time * 1000:>7.2f}ms {sort_time * 1000:>7.2f}ms {heap_time * 1000:>7.2f}ms"
+            )
+    print("Heap selection matches the sorted selection for every query")
+
+
+if __name__ == "__main__":
+    main()
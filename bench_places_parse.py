@@ -0,0 +1,118 @@
+"""Benchmark: peak memory of parsing the DirectLease places list.
+
+Compares the previous path (read the whole body, decode, json.loads) with the
+streaming parser and with streaming into the columnar station catalogue used
+by the integration. Run from the repository root:
+
+    python bench_places_parse.py [stations]
+"""
+import gc
+import json
+import random
+import sys
+import time
+import tracemalloc
+
+from _standalone import load_module
+
+places_stream = load_module("places_stream")
+catalogue = load_module("catalogue")
+
+
+def make_place(rng, station_id):
+    """Return a place roughly shaped like a DirectLease places entry."""
+    return {
+        "id": station_id,
+        "lat": round(50.75 + rng.random() * 2.8, 6),
+        "lng": round(3.35 + rng.random() * 3.85, 6),
+        "brand": rng.choice(["Shell", "BP", "Esso", "Tango", "TinQ", "Tamoil", "Texaco"]),
+        "city": rng.choice(["Amsterdam", "Utrecht", "Hoorn", "Zwolle", "Medemblik", "Eindhoven"]),
+        "name": f"Station {station_id}",
+        "address": f"Hoofdweg {rng.randint(1, 400)}",
+        "postalCode": f"{rng.randint(1000, 9999)}AB",
+        "logo": f"https://tankservice.app-it-up.com/logos/{station_id}.png",
+        "fuels": ["E10", "E5", "B7"] if rng.random() < 0.8 else ["E10", "B7", "LPG"],
+        "open24h": rng.random() < 0.3,
+        "unmanned": rng.random() < 0.2,
+    }
+
+
+def body_chunks(count, chunk_size=places_stream.DEFAULT_CHUNK_SIZE, seed=1):
+    """Yield the encoded places list in chunks, as they arrive from the network."""
+    rng = random.Random(seed)
+    pending = bytearray(b"[")
+    for station_id in range(1, count + 1):
+        if station_id > 1:
+            pending += b","
+        pending += json.dumps(make_place(rng, station_id)).encode()
+        while len(pending) >= chunk_size:
+            yield bytes(pending[:chunk_size])
+            del pending[:chunk_size]
+    pending += b"]"
+    yield bytes(pending)
+
+
+def parse_full(chunks):
+    """Previous path: buffer the body, then decode it as a whole."""
+    body = b"".join(chunks)
+    return json.loads(body.decode("utf-8"))
+
+
+def parse_streaming(chunks):
+    """Streaming path: decode chunk by chunk, keeping only indexed fields."""
+    parser = places_stream.PlacesStreamParser()
+    for chunk in chunks:
+        parser.feed(chunk)
+    return parser.close()
+
+
+def parse_catalogue(chunks):
+    """Streaming straight into the columnar station catalogue."""
+    builder = catalogue.CatalogueBuilder()
+    parser = places_stream.PlacesStreamParser(sink=builder.add)
+    for chunk in chunks:
+        parser.feed(chunk)
+    parser.close()
+    return builder.build()
+
+
+def measure(func, chunks):
+    """Return (seconds, peak bytes, retained bytes, result length).
+
+    The chunks are generated up front and not traced; they stand in for data
+    arriving from the socket.
+    """
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = func(chunks)
+    elapsed = time.perf_counter() - started
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, retained, len(result)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 4500
+    chunks = list(body_chunks(count))
+    print(f"Places list with {count} stations ({sum(map(len, chunks)) / 1024:.0f}KB)")
+    print(f"{'path':<10} {'time':>8} {'peak':>10} {'retained':>10}")
+    results = {}
+    for name, func in (
+        ("full", parse_full),
+        ("streaming", parse_streaming),
+        ("catalogue", parse_catalogue),
+    ):
+        elapsed, peak, retained, length = measure(func, chunks)
+        assert length == count
+        results[name] = (peak, retained)
+        print(f"{name:<10} {elapsed * 1000:>6.0f}ms {peak / 1024:>8.0f}KB {retained / 1024:>8.0f}KB")
+    for name in ("streaming", "catalogue"):
+        print(
+            f"{name}: peak memory {1 - results[name][0] / results['full'][0]:.0%} lower, "
+            f"retained {1 - results[name][1] / results['full'][1]:.0%} lower"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,311 @@
+"""Benchmark: end-to-end coordinator refreshes against the local stand-in API.
+
+Runs FuelPriceCoordinator._async_update_data for a grid of catalogue sizes,
+entry counts and radii against directlease_standin.py (on its own thread) and
+records, per scenario:
+
+- wall time per refresh (first refresh, which downloads the catalogue, and
+  a second warm round; p50/p95/max)
+- event-loop blocking: time the loop was late by more than 1ms, measured by
+  a 1ms ticker task, in total and the longest single stall
+- peak traced memory of a separate cold pass (tracemalloc slows the loop,
+  so it is not enabled during the timed pass)
+- API requests per refresh, by endpoint
+
+Results are written as JSON; pass an earlier result file with --compare to
+print the change per scenario. Price notifications and history are not set
+up, so only the API pipeline (catalogue, distance filtering, details) is
+measured. Needs a Python environment with Home Assistant installed; run from
+the repository root:
+
+    python bench_refresh.py [--stations 1000,5000,20000,50000]
+        [--entries 1,10,50,200] [--radii 5,10,25] [--latency 0.005]
+        [--output bench_refresh.json] [--compare previous.json] [--quick]
+"""
+import argparse
+import asyncio
+import gc
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from homeassistant.core import HomeAssistant
+
+sys.path.insert(0, str(Path(__file__).parent / "custom_components"))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from directlease_standin import CENTRES, StandInConfig, start_in_thread  # noqa: E402
+from nl_fuel_prices import FuelPriceCoordinator  # noqa: E402
+from nl_fuel_prices.api import FuelPriceAPI  # noqa: E402
+from nl_fuel_prices.const import DOMAIN  # noqa: E402
+from nl_fuel_prices.json_decoder import JSON_DECODER  # noqa: E402
+
+STATIONS = (1000, 5000, 20000, 50000)
+ENTRIES = (1, 10, 50, 200)
+RADII = (5, 10, 25)
+QUICK = ((1000, 5000), (1, 10), (10,))
+
+LOOP_TICK = 0.001  # seconds
+LOOP_TOLERANCE = 0.001  # lateness below this does not count as blocking
+
+
+@dataclass
+class BenchEntry:
+    """The parts of a config entry the coordinator reads."""
+
+    entry_id: str
+    data: dict = field(default_factory=dict)
+
+
+class LoopMonitor:
+    """Measure how long the event loop is blocked, with a ticker task."""
+
+    def __init__(self, tick=LOOP_TICK, tolerance=LOOP_TOLERANCE):
+        """Initialize the monitor."""
+        self.tick = tick
+        self.tolerance = tolerance
+        self.blocked = 0.0
+        self.longest = 0.0
+        self.lags = []
+        self._task = None
+
+    async def _async_run(self):
+        """Sleep one tick at a time and record how late each wakeup is."""
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.tick
+            await asyncio.sleep(self.tick)
+            lag = loop.time() - expected
+            self.lags.append(lag)
+            if lag > self.tolerance:
+                self.blocked += lag
+                self.longest = max(self.longest, lag)
+
+    def __enter__(self):
+        """Start monitoring."""
+        self._task = asyncio.get_running_loop().create_task(self._async_run())
+        return self
+
+    def __exit__(self, *exc_info):
+        """Stop monitoring."""
+        self._task.cancel()
+
+    def summary(self):
+        """Return the blocking statistics in milliseconds."""
+        lags = sorted(self.lags) or [0.0]
+        return {
+            "blocked_ms": round(self.blocked * 1000, 2),
+            "longest_stall_ms": round(self.longest * 1000, 2),
+            "lag_p50_ms": round(lags[len(lags) // 2] * 1000, 3),
+            "lag_p99_ms": round(lags[min(len(lags) - 1, int(len(lags) * 0.99))] * 1000, 3),
+        }
+
+
+def make_entries(count, radius, seed=1):
+    """Return config entries at random locations around the population centres."""
+    rng = random.Random(seed)
+    entries = []
+    for index in range(count):
+        lat, lon = rng.choice(CENTRES)
+        entries.append(BenchEntry(f"bench_{index}", {
+            "latitude": lat + rng.gauss(0, 0.1),
+            "longitude": lon + rng.gauss(0, 0.15),
+            "radius": radius,
+            "fuel_type": rng.choice(["euro95", "euro95", "diesel", "lpg"]),
+        }))
+    return entries
+
+
+def percentile(values, share):
+    """Return the `share` percentile of `values` (nearest rank)."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * share))]
+
+
+def summarize(durations, requests):
+    """Summarize the refreshes of one round."""
+    return {
+        "refreshes": len(durations),
+        "total_ms": round(sum(durations) * 1000, 2),
+        "p50_ms": round(statistics.median(durations) * 1000, 3),
+        "p95_ms": round(percentile(durations, 0.95) * 1000, 3),
+        "max_ms": round(max(durations) * 1000, 3),
+        "requests": {
+            endpoint: sum(counts.get(endpoint, 0) for counts in requests)
+            for endpoint in ("places", "detail")
+        },
+        "requests_per_refresh": round(sum(sum(counts.values()) for counts in requests) / len(requests), 2),
+    }
+
+
+async def async_refresh_round(coordinators):
+    """Refresh every coordinator once, one after the other, and time each."""
+    durations, requests = [], []
+    for coordinator in coordinators:
+        started = time.perf_counter()
+        data = await coordinator._async_update_data()
+        durations.append(time.perf_counter() - started)
+        coordinator.data = data
+        requests.append((data or {}).get("requests", {}))
+    return durations, requests
+
+
+async def async_scenario(hass, base_url, stations, entry_count, radius, trace_memory):
+    """Run a cold and a warm round for one scenario on a fresh API client."""
+    api = FuelPriceAPI(executor=hass.async_add_executor_job, base_url=base_url)
+    api.limiter.set_budget(10**9, 10**6)
+    hass.data[DOMAIN] = {"api": api}
+    coordinators = [FuelPriceCoordinator(hass, api, entry) for entry in make_entries(entry_count, radius)]
+    result = {}
+    try:
+        if trace_memory:
+            gc.collect()
+            tracemalloc.start()
+            await async_refresh_round(coordinators)
+            result["peak_memory_kb"] = round(tracemalloc.get_traced_memory()[1] / 1024, 1)
+            tracemalloc.stop()
+            return result
+
+        with LoopMonitor() as monitor:
+            cold = summarize(*await async_refresh_round(coordinators))
+        result["cold"] = {**cold, **monitor.summary()}
+        with LoopMonitor() as monitor:
+            warm = summarize(*await async_refresh_round(coordinators))
+        result["warm"] = {**warm, **monitor.summary()}
+        result["stations_per_refresh"] = round(
+            statistics.mean(len((c.data or {}).get("stations", [])) for c in coordinators), 2
+        )
+        return result
+    finally:
+        await api.async_close()
+
+
+async def async_run(args):
+    """Run the whole grid and return the results."""
+    results = []
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        try:
+            for stations in args.stations:
+                standin, base_url, stop_standin = start_in_thread(
+                    StandInConfig(stations=stations, latency=args.latency)
+                )
+                try:
+                    for entry_count in args.entries:
+                        for radius in args.radii:
+                            scenario = {"stations": stations, "entries": entry_count, "radius": radius}
+                            standin.reset_counts()
+                            scenario.update(await async_scenario(hass, base_url, stations, entry_count, radius, False))
+                            scenario["standin_requests"] = dict(standin.counts)
+                            if not args.no_memory:
+                                scenario.update(
+                                    await async_scenario(hass, base_url, stations, entry_count, radius, True)
+                                )
+                            results.append(scenario)
+                            print_scenario(scenario)
+                finally:
+                    stop_standin()
+        finally:
+            await hass.async_stop(force=True)
+    return results
+
+
+def print_scenario(scenario):
+    """Print one line per scenario."""
+    cold, warm = scenario["cold"], scenario["warm"]
+    print(
+        f"{scenario['stations']:>6} stations {scenario['entries']:>4} entries {scenario['radius']:>3}km | "
+        f"cold p50 {cold['p50_ms']:>8.2f}ms max {cold['max_ms']:>8.2f}ms blocked {cold['blocked_ms']:>7.1f}ms | "
+        f"warm p50 {warm['p50_ms']:>8.2f}ms blocked {warm['blocked_ms']:>7.1f}ms | "
+        f"req/refresh {cold['requests_per_refresh']:>5} / {warm['requests_per_refresh']:>5} | "
+        f"peak {scenario.get('peak_memory_kb', 0) / 1024:>6.1f}MB"
+    )
+
+
+def git_revision():
+    """Return the current commit, if this is a git checkout."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).parent, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(previous_file, results):
+    """Print the change of the main metrics against an earlier result file."""
+    with open(previous_file, encoding="utf-8") as source:
+        previous = {
+            (item["stations"], item["entries"], item["radius"]): item
+            for item in json.load(source)["scenarios"]
+        }
+    print(f"\nChange against {previous_file}:")
+    for scenario in results:
+        old = previous.get((scenario["stations"], scenario["entries"], scenario["radius"]))
+        if old is None:
+            continue
+        changes = []
+        for label, path in (
+            ("cold p50", ("cold", "p50_ms")),
+            ("warm p50", ("warm", "p50_ms")),
+            ("blocked", ("cold", "blocked_ms")),
+            ("requests", ("cold", "requests_per_refresh")),
+            ("peak", ("peak_memory_kb",)),
+        ):
+            new_value, old_value = scenario, old
+            for key in path:
+                new_value = new_value.get(key) if isinstance(new_value, dict) else None
+                old_value = old_value.get(key) if isinstance(old_value, dict) else None
+            if new_value is not None and old_value:
+                changes.append(f"{label} {new_value / old_value - 1:+.0%}")
+        print(f"{scenario['stations']:>6}/{scenario['entries']:>4}/{scenario['radius']:>3}km: {', '.join(changes)}")
+
+
+def parse_list(value):
+    """Parse a comma-separated list of numbers."""
+    return tuple(float(item) if "." in item else int(item) for item in value.split(","))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark coordinator refreshes against the stand-in API.")
+    parser.add_argument("--stations", type=parse_list, default=STATIONS)
+    parser.add_argument("--entries", type=parse_list, default=ENTRIES)
+    parser.add_argument("--radii", type=parse_list, default=RADII)
+    parser.add_argument("--latency", type=float, default=0.005, help="stand-in seconds per detail request")
+    parser.add_argument("--quick", action="store_true", help="small grid for a smoke run")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    parser.add_argument("--output", default="bench_refresh.json")
+    parser.add_argument("--compare", help="earlier result file to compare against")
+    args = parser.parse_args()
+    if args.quick:
+        args.stations, args.entries, args.radii = QUICK
+
+    results = asyncio.run(async_run(args))
+    report = {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "json_decoder": JSON_DECODER,
+            "standin_latency": args.latency,
+        },
+        "scenarios": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as output:
+        json.dump(report, output, indent=2)
+    print(f"Results written to {args.output}")
+    if args.compare:
+        compare(args.compare, results)
+
+
+if __name__ == "__main__":
+    main()
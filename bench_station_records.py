@@ -0,0 +1,117 @@
+"""Benchmark: memory and allocations of station dicts vs slotted records.
+
+Builds the per-refresh station records the way the integration did before
+(one dict per station) and with the slotted dataclasses from models.py, then
+compares traced memory, allocation counts and attribute access time. Run from
+the repository root:
+
+    python bench_station_records.py [stations]
+"""
+import gc
+import sys
+import time
+import tracemalloc
+
+from _standalone import load_module
+
+models = load_module("models")
+
+SERVICES = ["shop", "carwash", "unmanned"]
+
+
+def build_dicts(count):
+    """Station records as 16-key dicts (previous representation)."""
+    stations = []
+    for index in range(count):
+        stations.append({
+            "id": str(index),
+            "name": f"Station {index}",
+            "brand": "Shell",
+            "address": "Hoofdweg 1, Hoorn 1621AB",
+            "latitude": 52.64 + index * 1e-5,
+            "longitude": 5.06 + index * 1e-5,
+            "fuel_type": "euro95",
+            "price": 1.899 + index * 1e-4,
+            "opening_hours": "06:00-22:00",
+            "last_updated": "2025-01-01T08:00:00",
+            "distance": index * 0.01,
+            "services": SERVICES,
+            "is_unmanned": False,
+            "has_shop": True,
+            "shop_hours": None,
+            "rank": index + 1,
+        })
+    return stations
+
+
+def build_records(count):
+    """Station records as slotted StationPrice dataclasses."""
+    return [
+        models.StationPrice(
+            id=str(index),
+            name=f"Station {index}",
+            brand="Shell",
+            address="Hoofdweg 1, Hoorn 1621AB",
+            latitude=52.64 + index * 1e-5,
+            longitude=5.06 + index * 1e-5,
+            fuel_type="euro95",
+            price=1.899 + index * 1e-4,
+            opening_hours="06:00-22:00",
+            last_updated="2025-01-01T08:00:00",
+            distance=index * 0.01,
+            services=SERVICES,
+            is_unmanned=False,
+            has_shop=True,
+            shop_hours=None,
+            rank=index + 1,
+        )
+        for index in range(count)
+    ]
+
+
+def measure(build, count):
+    """Return (traced bytes, allocated blocks, build seconds) for `count` records."""
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    records = build(count)
+    elapsed = time.perf_counter() - started
+    snapshot = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    stats = snapshot.statistics("filename")
+    size = sum(stat.size for stat in stats)
+    blocks = sum(stat.count for stat in stats)
+    del records
+    return size, blocks, elapsed
+
+
+def access_time(records, getter, rounds=20):
+    """Return seconds to read price and distance of every record `rounds` times."""
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for record in records:
+            getter(record)
+    return time.perf_counter() - started
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    print(f"{count} station records")
+    print(f"{'representation':<16} {'memory':>10} {'blocks':>8} {'build':>8} {'access':>8}")
+    results = {}
+    for name, build, getter in (
+        ("dict", build_dicts, lambda record: (record.get("price"), record.get("distance"))),
+        ("slotted", build_records, lambda record: (record.price, record.distance)),
+    ):
+        size, blocks, elapsed = measure(build, count)
+        accessed = access_time(build(count), getter)
+        results[name] = size
+        print(
+            f"{name:<16} {size / 1024:>8.0f}KB {blocks:>8} "
+            f"{elapsed * 1000:>6.0f}ms {accessed * 1000:>6.0f}ms"
+        )
+    print(f"Memory reduced by {1 - results['slotted'] / results['dict']:.0%}")
+
+
+if __name__ == "__main__":
+    main()
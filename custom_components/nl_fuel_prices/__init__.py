@@ -2,19 +2,58 @@
 from __future__ import annotations
 
 import logging
-from datetime import timedelta
+from datetime import datetime, timedelta
+from functools import partial
+from time import monotonic
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE, Platform
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_create_clientsession
+from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
-from .const import DOMAIN, CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL
-from .api import FuelPriceAPI
+from .const import (
+    DOMAIN,
+    CONF_UPDATE_INTERVAL,
+    CONF_SCHEDULED_MAX_AGE,
+    CONF_ADAPTIVE_POLLING,
+    CONF_MIN_UPDATE_INTERVAL,
+    CONF_MAX_UPDATE_INTERVAL,
+    CONF_SENTINEL_MODE,
+    CONF_SENTINEL_MAX_STALENESS,
+    CONF_REQUEST_BUDGET,
+    CONF_HEDGED_REQUESTS,
+    CONF_LATENCY_BUDGET,
+    CONF_MAX_STATIONS,
+    CONF_PRICE_PLANNER,
+    CONF_BACKGROUND_CRAWLER,
+    CONF_CRAWLER_BUDGET,
+    DEFAULT_UPDATE_INTERVAL,
+    DEFAULT_SCHEDULED_MAX_AGE,
+    DEFAULT_MIN_UPDATE_INTERVAL,
+    DEFAULT_MAX_UPDATE_INTERVAL,
+    DEFAULT_SENTINEL_MAX_STALENESS,
+    DEFAULT_REQUEST_BUDGET,
+    DEFAULT_LATENCY_BUDGET,
+    DEFAULT_MAX_STATIONS,
+    DEFAULT_CRAWLER_BUDGET,
+    SCHEDULED_COALESCE_WINDOW,
+    SENTINEL_CHECK_INTERVAL,
+    SENTINEL_STATION_COUNT,
+)
+from .adaptive_polling import MIN_HISTORY_SAMPLES, VolatilityModel
+from .api import FuelPriceAPI, FuelPriceAPIError, count_requests, measure_decoding
+from .catalogue import StationCatalogue
+from .crawler import StationCrawler
 from .daily_notifications import DailyNotificationManager
+from .models import StationPrice
 from .price_change_notifications import PriceChangeNotificationManager
-from .scheduled_updates import ScheduledUpdates
+from .scheduled_updates import ScheduledUpdates, async_run_scheduled_batch
+from .scheduler import FuelPriceScheduler, JOB_SCHEDULED_UPDATE
+from .timing import StageTimings, collect_spans, format_spans, span
+from .transport import DirectLeaseTransport
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -42,9 +81,22 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         hass.config_entries.async_update_entry(entry, data=new_data)
         _LOGGER.info(f"Migrated entry {entry.entry_id} to include postcode: {postcode}")
     
+    # Initialize the shared scheduler for all timed jobs if not already done
+    if "scheduler" not in hass.data[DOMAIN]:
+        scheduler = FuelPriceScheduler(
+            hass, coalesce_window=timedelta(seconds=SCHEDULED_COALESCE_WINDOW)
+        )
+        scheduler.async_set_batch_handler(
+            JOB_SCHEDULED_UPDATE,
+            lambda jobs: async_run_scheduled_batch(hass, jobs),
+        )
+        hass.data[DOMAIN]["scheduler"] = scheduler
+    scheduler = hass.data[DOMAIN]["scheduler"]
+    
     # Initialize daily notification manager if not already done
     if "daily_manager" not in hass.data[DOMAIN]:
-        daily_manager = DailyNotificationManager(hass)
+        daily_manager = DailyNotificationManager(hass, scheduler)
+        await daily_manager.async_load()
         hass.data[DOMAIN]["daily_manager"] = daily_manager
     
     # Initialize price change notification manager if not already done
@@ -52,13 +104,35 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         price_change_manager = PriceChangeNotificationManager(hass)
         hass.data[DOMAIN]["price_change_manager"] = price_change_manager
     
-    session = async_get_clientsession(hass)
-    api = FuelPriceAPI(session)
+    # One API client for all entries so catalogue and detail caches are shared.
+    # Its session comes from Home Assistant, limited per DirectLease host.
+    if "api" not in hass.data[DOMAIN]:
+        api = FuelPriceAPI(
+            transport=DirectLeaseTransport(
+                session_factory=partial(async_create_clientsession, hass)
+            ),
+            executor=hass.async_add_executor_job,
+        )
+        hass.data[DOMAIN]["api"] = api
+        
+        async def _async_close_api(event: Event) -> None:
+            await api.async_close()
+        
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, _async_close_api)
+    api = hass.data[DOMAIN]["api"]
+    
+    _update_request_budget(hass, entry)
     
     coordinator = FuelPriceCoordinator(hass, api, entry)
-    await coordinator.async_config_entry_first_refresh()
+    try:
+        await coordinator.async_config_entry_first_refresh()
+    except Exception:
+        _update_request_budget(hass)
+        raise
     
     hass.data[DOMAIN][entry.entry_id] = coordinator
+    coordinator.async_start_sentinel_checks()
+    await _async_update_crawler(hass)
     
     # Set up daily notifications for this entry
     daily_manager = hass.data[DOMAIN]["daily_manager"]
@@ -68,7 +142,8 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     scheduled_updates = ScheduledUpdates(
         hass,
         entry,
-        coordinator.async_request_refresh
+        coordinator.async_scheduled_refresh,
+        scheduler,
     )
     await scheduled_updates.async_setup()
     hass.data[DOMAIN][f"{entry.entry_id}_scheduled"] = scheduled_updates
@@ -88,13 +163,11 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         await scheduled_updates.async_unload()
         hass.data[DOMAIN].pop(f"{entry.entry_id}_scheduled")
     
-    # Cancel daily notification tracker for this entry
+    # Cancel daily notification job for this entry
     if "daily_manager" in hass.data[DOMAIN]:
         daily_manager = hass.data[DOMAIN]["daily_manager"]
-        if entry.entry_id in daily_manager._cancel_trackers:
-            daily_manager._cancel_trackers[entry.entry_id]()
-            del daily_manager._cancel_trackers[entry.entry_id]
-            _LOGGER.info(f"Cancelled daily notification tracker for entry {entry.entry_id}")
+        daily_manager.unload(entry.entry_id)
+        _LOGGER.info(f"Cancelled daily notification job for entry {entry.entry_id}")
     
     # Clear price change history
     if "price_change_manager" in hass.data[DOMAIN]:
@@ -102,11 +175,89 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         price_change_manager.clear_price(entry.entry_id)
     
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
-        hass.data[DOMAIN].pop(entry.entry_id)
+        hass.data[DOMAIN].pop(entry.entry_id).async_stop_sentinel_checks()
+        # The request budget sensor went with this entry; the next location
+        # that sets up adds it again
+        if hass.data[DOMAIN].get("request_budget_entry") == entry.entry_id:
+            hass.data[DOMAIN].pop("request_budget_entry")
+    _update_request_budget(hass)
+    await _async_update_crawler(hass)
+    
+    # Release pooled connections once no entry uses the API anymore; the
+    # client keeps its caches and reopens the pool on the next request
+    if "api" in hass.data[DOMAIN] and not any(
+        isinstance(value, FuelPriceCoordinator) for value in hass.data[DOMAIN].values()
+    ):
+        await hass.data[DOMAIN]["api"].async_close()
     
     return unload_ok
 
 
+def _update_request_budget(hass: HomeAssistant, setting_up: ConfigEntry | None = None) -> None:
+    """Apply the most conservative request budget of the loaded entries.
+
+    Entries that are disabled, failed to load or were unloaded don't count;
+    `setting_up` is the entry being loaded, which has no coordinator yet.
+    """
+    api: FuelPriceAPI | None = hass.data[DOMAIN].get("api")
+    entries = [
+        value.entry for value in hass.data[DOMAIN].values()
+        if isinstance(value, FuelPriceCoordinator)
+    ]
+    if setting_up is not None:
+        entries.append(setting_up)
+    if api is None or not entries:
+        return
+    api.limiter.set_budget(
+        min(
+            config_entry.data.get(CONF_REQUEST_BUDGET, DEFAULT_REQUEST_BUDGET)
+            for config_entry in entries
+        )
+    )
+
+
+async def _async_update_crawler(hass: HomeAssistant) -> None:
+    """Run the background crawler while any loaded entry enables it.
+
+    The crawler prioritizes the stations around every loaded entry and its
+    budget follows the most conservative entry that enables it.
+    """
+    coordinators = [
+        value for value in hass.data[DOMAIN].values()
+        if isinstance(value, FuelPriceCoordinator)
+    ]
+    enabled = [
+        coordinator.entry for coordinator in coordinators
+        if coordinator.entry.data.get(CONF_BACKGROUND_CRAWLER, False)
+    ]
+    crawler: StationCrawler | None = hass.data[DOMAIN].get("crawler")
+    
+    if not enabled:
+        # Keep the crawler (and what it learned) around for a reload
+        if crawler is not None and crawler.running:
+            await crawler.async_stop()
+            _LOGGER.info("Stopped background price crawler")
+        return
+    
+    if crawler is None:
+        crawler = StationCrawler(hass.data[DOMAIN]["api"])
+        hass.data[DOMAIN]["crawler"] = crawler
+    crawler.set_budget(
+        min(entry.data.get(CONF_CRAWLER_BUDGET, DEFAULT_CRAWLER_BUDGET) for entry in enabled)
+    )
+    crawler.set_locations([
+        (
+            coordinator.entry.data.get("latitude"),
+            coordinator.entry.data.get("longitude"),
+            coordinator.entry.data.get("radius", 10),
+        )
+        for coordinator in coordinators
+    ])
+    if not crawler.running:
+        crawler.start(hass.async_create_background_task)
+        _LOGGER.info(f"Started background price crawler ({crawler.limiter.budget} requests/hour)")
+
+
 async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Reload config entry."""
     await async_unload_entry(hass, entry)
@@ -128,17 +279,238 @@ class FuelPriceCoordinator(DataUpdateCoordinator):
         )
         self.api = api
         self.entry = entry
+        self.last_refresh: datetime | None = None
+        self._base_interval = timedelta(minutes=update_interval)
+        self._last_full_sweep: datetime | None = None
+        self._adaptive_active: bool | None = None
+        self._force_full_sweep = False
+        self._unsub_sentinel_checks: CALLBACK_TYPE | None = None
+        self.stage_timings = StageTimings()
+
+    def _async_adapt_interval(self) -> None:
+        """Adapt the polling interval to the learned volatility of this hour."""
+        if not self.entry.data.get(CONF_ADAPTIVE_POLLING, False):
+            return
+
+        daily_manager = self.hass.data[DOMAIN].get("daily_manager")
+        if not daily_manager:
+            return
+
+        min_interval = timedelta(
+            minutes=self.entry.data.get(CONF_MIN_UPDATE_INTERVAL, DEFAULT_MIN_UPDATE_INTERVAL)
+        )
+        max_interval = timedelta(
+            minutes=self.entry.data.get(CONF_MAX_UPDATE_INTERVAL, DEFAULT_MAX_UPDATE_INTERVAL)
+        )
+        if max_interval < min_interval:
+            min_interval, max_interval = max_interval, min_interval
+
+        model = VolatilityModel.from_history(
+            daily_manager.get_price_history(self.entry.entry_id)
+        )
+        interval = model.interval_for(dt_util.now(), min_interval, max_interval)
+        active = interval is not None
+        if active != self._adaptive_active:
+            self._adaptive_active = active
+            if active:
+                _LOGGER.info(f"Adaptive polling active for {self.entry.entry_id}")
+            else:
+                _LOGGER.info(
+                    f"Adaptive polling for {self.entry.entry_id} inactive until "
+                    f"{MIN_HISTORY_SAMPLES} hourly price samples are recorded "
+                    f"(have {model.total_samples}); polling every {self._base_interval}"
+                )
+        if interval is None:
+            # Not enough history yet, keep the configured interval
+            interval = self._base_interval
+
+        if interval != self.update_interval:
+            _LOGGER.debug(
+                f"Adaptive polling for {self.entry.entry_id}: interval "
+                f"{self.update_interval} -> {interval}"
+            )
+            self.update_interval = interval
+
+    def _sentinels(self) -> list[StationPrice] | None:
+        """Return the stations to re-check, or None when a full sweep is due."""
+        previous = (self.data or {}).get("stations")
+        if not (self.entry.data.get(CONF_SENTINEL_MODE, False) and previous and self._last_full_sweep):
+            return None
+        if self._force_full_sweep:
+            return None
+        max_staleness = timedelta(
+            minutes=self.entry.data.get(
+                CONF_SENTINEL_MAX_STALENESS, DEFAULT_SENTINEL_MAX_STALENESS
+            )
+        )
+        if dt_util.utcnow() - self._last_full_sweep >= max_staleness:
+            return None
+        return previous[:SENTINEL_STATION_COUNT]
+
+    def plan_detail_requests(self, catalogue: StationCatalogue) -> list[int]:
+        """Return the ids of the stations the next refresh fetches details for."""
+        sentinels = self._sentinels()
+        if sentinels is not None:
+            return [int(sentinel.id) for sentinel in sentinels]
+        candidates = self.api.select_candidates(
+            catalogue,
+            self.entry.data.get("latitude"),
+            self.entry.data.get("longitude"),
+            self.entry.data.get("radius", 10),
+            self.entry.data.get("fuel_type", "euro95"),
+            self.entry.data.get(CONF_MAX_STATIONS, DEFAULT_MAX_STATIONS),
+            self.entry.data.get(CONF_PRICE_PLANNER, False),
+        )
+        return [catalogue.ids[row] for _, row in candidates]
+
+    async def _async_fetch_stations(self) -> tuple[list[StationPrice], bool]:
+        """Fetch stations, polling only sentinel stations when possible.
+
+        Returns the stations and whether a full sweep was done. In sentinel
+        mode only the current cheapest and runner-up are re-checked; the full
+        detail sweep runs when one of them changed price or the last sweep is
+        older than the configured staleness.
+        """
+        latitude = self.entry.data.get("latitude")
+        longitude = self.entry.data.get("longitude")
+        radius = self.entry.data.get("radius", 10)
+        fuel_type = self.entry.data.get("fuel_type", "euro95")
+        
+        sentinels = self._sentinels()
+        if sentinels is not None:
+            if not await self._async_sentinels_changed(sentinels, fuel_type):
+                return self.data["stations"], False
+        
+        stations = await self.api.get_fuel_prices(
+            latitude,
+            longitude,
+            radius,
+            fuel_type,
+            hedge=self.entry.data.get(CONF_HEDGED_REQUESTS, False),
+            latency_budget=self.entry.data.get(CONF_LATENCY_BUDGET, DEFAULT_LATENCY_BUDGET),
+            max_stations=self.entry.data.get(CONF_MAX_STATIONS, DEFAULT_MAX_STATIONS),
+            plan_by_price=self.entry.data.get(CONF_PRICE_PLANNER, False),
+            crawled_max_age=self.crawled_max_age,
+        )
+        if stations:
+            self._last_full_sweep = dt_util.utcnow()
+            self._force_full_sweep = False
+        return stations, True
+
+    async def _async_sentinels_changed(
+        self, sentinels: list[StationPrice], fuel_type: str
+    ) -> bool:
+        """Re-check the sentinel stations and return whether one changed price."""
+        with span("sentinels"):
+            for sentinel in sentinels:
+                price = await self.api.async_get_station_price(
+                    sentinel.id, fuel_type, crawled_max_age=SENTINEL_CHECK_INTERVAL * 60
+                )
+                if price != sentinel.price:
+                    _LOGGER.debug(
+                        f"Sentinel {sentinel.id} changed: {sentinel.price} -> {price}"
+                    )
+                    return True
+        return False
+
+    def async_start_sentinel_checks(self) -> None:
+        """Check the sentinel stations on a short timer in sentinel mode."""
+        self.async_stop_sentinel_checks()
+        if not self.entry.data.get(CONF_SENTINEL_MODE, False):
+            return
+        self._unsub_sentinel_checks = async_track_time_interval(
+            self.hass,
+            self._async_check_sentinels,
+            timedelta(minutes=SENTINEL_CHECK_INTERVAL),
+        )
+
+    def async_stop_sentinel_checks(self) -> None:
+        """Cancel the sentinel timer."""
+        if self._unsub_sentinel_checks:
+            self._unsub_sentinel_checks()
+            self._unsub_sentinel_checks = None
+
+    async def _async_check_sentinels(self, now: datetime) -> None:
+        """Refresh fully as soon as a sentinel station changed price.
+
+        Only the sentinels are requested, so a price change is noticed within
+        the sentinel check interval instead of at the next regular update.
+        """
+        sentinels = self._sentinels()
+        if not sentinels or not self.last_update_success or self.data.get("stale"):
+            return
+        if (
+            self.last_refresh is not None
+            and dt_util.utcnow() - self.last_refresh < timedelta(minutes=SENTINEL_CHECK_INTERVAL)
+        ):
+            # The last update just checked them
+            return
+        fuel_type = self.entry.data.get("fuel_type", "euro95")
+        if await self._async_sentinels_changed(sentinels, fuel_type):
+            _LOGGER.debug(f"Sentinel price change for {self.entry.entry_id}, refreshing all stations")
+            self._force_full_sweep = True
+            await self.async_refresh()
+
+    @property
+    def crawled_max_age(self) -> float:
+        """Return the age (seconds) up to which crawled details answer a refresh.
+
+        A crawled price younger than the update interval is as recent as one
+        the regular polling would have fetched.
+        """
+        return self.update_interval.total_seconds()
+
+    def is_fresh(self) -> bool:
+        """Return whether the data is younger than the scheduled max-age."""
+        max_age = timedelta(
+            minutes=self.entry.data.get(CONF_SCHEDULED_MAX_AGE, DEFAULT_SCHEDULED_MAX_AGE)
+        )
+        return bool(
+            self.data
+            and self.last_update_success
+            and self.last_refresh is not None
+            and dt_util.utcnow() - self.last_refresh < max_age
+        )
+
+    async def async_scheduled_refresh(self) -> None:
+        """Refresh for a scheduled trigger unless the current data is still fresh.
+
+        async_refresh re-arms the interval timer from now, so the interval
+        and scheduled refreshes never run back to back.
+        """
+        if self.is_fresh():
+            _LOGGER.debug(
+                f"Skipping scheduled refresh for {self.entry.entry_id}: "
+                f"data refreshed at {self.last_refresh.isoformat()}"
+            )
+            return
+
+        await self.async_refresh()
 
     async def _async_update_data(self):
-        """Fetch data from API."""
+        """Fetch data from API, timing each stage of the refresh."""
+        started = monotonic()
+        with collect_spans() as spans:
+            try:
+                return await self._async_refresh_data()
+            finally:
+                spans["refresh"] = monotonic() - started
+                self.stage_timings.add(spans)
+                _LOGGER.debug(f"Refresh stages for {self.entry.entry_id}: {format_spans(spans)}")
+
+    async def _async_refresh_data(self):
+        """Fetch stations, store history and notify price changes."""
         try:
-            latitude = self.entry.data.get("latitude")
-            longitude = self.entry.data.get("longitude")
-            radius = self.entry.data.get("radius", 10)
-            fuel_type = self.entry.data.get("fuel_type", "euro95")
+            with count_requests() as requests, measure_decoding() as decoding:
+                stations, full_sweep = await self._async_fetch_stations()
             
-            stations = await self.api.get_fuel_prices(
-                latitude, longitude, radius, fuel_type
+            request_count = sum(requests.values())
+            _LOGGER.debug(
+                f"Refresh for {self.entry.entry_id} used {request_count} API request(s) "
+                f"(places: {requests['places']}, detail: {requests['detail']}, "
+                f"full sweep: {full_sweep}); decoding blocked the event loop for "
+                f"{decoding['loop_seconds'] * 1000:.1f}ms "
+                f"({decoding['offloaded']} of {decoding['decoded']} step(s) in executor)"
             )
             
             if not stations:
@@ -146,27 +518,50 @@ class FuelPriceCoordinator(DataUpdateCoordinator):
                 return {}
             
             # Find cheapest station
-            cheapest = min(stations, key=lambda x: x["price"])
+            cheapest = min(stations, key=lambda x: x.price)
             
             # Store price history
             daily_manager = self.hass.data[DOMAIN].get("daily_manager")
             if daily_manager:
-                await daily_manager.store_current_price(self.entry.entry_id, cheapest)
+                with span("history"):
+                    await daily_manager.store_current_price(self.entry.entry_id, cheapest)
             
             # Check for price changes and send notifications
             price_change_manager = self.hass.data[DOMAIN].get("price_change_manager")
             if price_change_manager:
-                await price_change_manager.check_and_notify(
-                    self.entry,
-                    cheapest["price"],
-                    cheapest,
-                )
+                with span("notifications"):
+                    await price_change_manager.check_and_notify(
+                        self.entry,
+                        cheapest.price,
+                        cheapest,
+                    )
+            
+            self.last_refresh = dt_util.utcnow()
+            self._async_adapt_interval()
             
             return {
                 "stations": stations,
                 "cheapest": cheapest,
                 "total_stations": len(stations),
+                "request_count": request_count,
+                "requests": dict(requests),
+                "full_sweep": full_sweep,
+                "stale": False,
             }
             
+        except FuelPriceAPIError as err:
+            # Serve the last good data instead of blanking the sensors
+            if self.data and self.data.get("stations"):
+                _LOGGER.warning(
+                    f"DirectLease API unavailable ({err}), serving last known prices "
+                    f"for {self.entry.entry_id}"
+                )
+                return {
+                    **self.data,
+                    "stale": True,
+                    "stale_since": self.data.get("stale_since") or dt_util.utcnow().isoformat(),
+                    "request_count": 0,
+                }
+            raise UpdateFailed(f"Error communicating with API: {err}")
         except Exception as err:
             raise UpdateFailed(f"Error communicating with API: {err}")
@@ -0,0 +1,88 @@
+"""Adaptive polling interval based on observed price volatility."""
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timedelta
+from typing import Any
+
+from homeassistant.util import dt as dt_util
+
+_LOGGER = logging.getLogger(__name__)
+
+HOURS_PER_WEEK = 168
+
+# Minimum number of history samples before the model is trusted
+MIN_HISTORY_SAMPLES = 24
+
+# Change rate (changes per sample) treated as fully volatile
+HIGH_VOLATILITY_RATE = 0.5
+
+
+def hour_of_week(when: datetime) -> int:
+    """Return the local hour-of-week bucket (0 = Monday 00:00)."""
+    local = dt_util.as_local(when)
+    return local.weekday() * 24 + local.hour
+
+
+class VolatilityModel:
+    """Per hour-of-week rate at which the cheapest price or station changes."""
+
+    def __init__(self) -> None:
+        """Initialize an empty model."""
+        self._changes = [0] * HOURS_PER_WEEK
+        self._samples = [0] * HOURS_PER_WEEK
+        self.total_samples = 0
+        self.total_changes = 0
+
+    @classmethod
+    def from_history(cls, history: list[dict[str, Any]]) -> VolatilityModel:
+        """Build a model from stored price history (oldest first)."""
+        model = cls()
+        previous = None
+        for sample in sorted(history, key=lambda item: item["timestamp"]):
+            if previous is not None:
+                changed = (
+                    sample.get("price") != previous.get("price")
+                    or sample.get("station_id") != previous.get("station_id")
+                )
+                model.add_observation(sample["timestamp"], changed)
+            previous = sample
+        return model
+
+    def add_observation(self, when: datetime, changed: bool) -> None:
+        """Record whether the cheapest price/station changed at `when`."""
+        bucket = hour_of_week(when)
+        self._samples[bucket] += 1
+        self.total_samples += 1
+        if changed:
+            self._changes[bucket] += 1
+            self.total_changes += 1
+
+    def change_rate(self, bucket: int) -> float:
+        """Return the change rate of a bucket, falling back to the overall rate."""
+        bucket %= HOURS_PER_WEEK
+        if self._samples[bucket]:
+            return self._changes[bucket] / self._samples[bucket]
+        if self.total_samples:
+            return self.total_changes / self.total_samples
+        return 0.0
+
+    def interval_for(
+        self,
+        when: datetime,
+        min_interval: timedelta,
+        max_interval: timedelta,
+    ) -> timedelta | None:
+        """Return the polling interval for `when`, or None without enough history.
+
+        The current and the next hour are both considered, so polling speeds
+        up ahead of a volatile window instead of after it started.
+        """
+        if self.total_samples < MIN_HISTORY_SAMPLES:
+            return None
+
+        bucket = hour_of_week(when)
+        rate = max(self.change_rate(bucket), self.change_rate(bucket + 1))
+        volatility = min(1.0, rate / HIGH_VOLATILITY_RATE)
+
+        return max_interval - (max_interval - min_interval) * volatility
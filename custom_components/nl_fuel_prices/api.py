@@ -1,22 +1,47 @@
 """API client for Dutch fuel prices using DirectLease Tank Service API."""
 from __future__ import annotations
 
+import asyncio
+import heapq
 import logging
-from typing import Any
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Iterator
 from datetime import datetime
-import math
 import json
 import hashlib
 import uuid
-from time import time
+from time import monotonic, time
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 
 import aiohttp
 
+from .cache import TTLCache
+from .catalogue import CatalogueBuilder, StationCatalogue, haversine
+from .circuit_breaker import CircuitBreaker
+from .const import DEFAULT_MAX_STATIONS, DEFAULT_REQUEST_BUDGET, DEFAULT_REQUEST_BURST
+from .rate_limiter import (
+    TokenBucket,
+    WaitTicket,
+    PRIORITY_CHEAPEST,
+    PRIORITY_CATALOGUE,
+    PRIORITY_DETAIL,
+)
+from .json_decoder import DECODE_OFFLOAD_THRESHOLD, JSON_DECODER, json_loads
+from .models import FuelPriceQuery, Station, StationPrice
+from .places_stream import DEFAULT_CHUNK_SIZE, PlacesStreamParser
+from .planner import PriceBook, plan_candidates
+from .timing import span
+from .transport import DirectLeaseTransport
+
 _LOGGER = logging.getLogger(__name__)
 
 # DirectLease Tank Service API - public mobile API
 DIRECTLEASE_API_BASE = "https://tankservice.app-it-up.com/Tankservice/v2"
-DIRECTLEASE_API_PLACES = f"{DIRECTLEASE_API_BASE}/places?fmt=web&country=NL&lang=en"
+DIRECTLEASE_PLACES_PATH = "/places?fmt=web&country=NL&lang=en"
+DIRECTLEASE_API_PLACES = f"{DIRECTLEASE_API_BASE}{DIRECTLEASE_PLACES_PATH}"
 
 FUEL_TYPE_MAP = {
     "euro95": "E10",
@@ -25,6 +50,99 @@ FUEL_TYPE_MAP = {
     "lpg": "LPG",
 }
 
+# Catalogue and detail documents are shared between entries refreshing in the
+# same window, so a coalesced batch costs one catalogue download and one
+# detail request per unique station.
+PLACES_CACHE_TTL = 120  # seconds
+DETAIL_CACHE_TTL = 120  # seconds
+# Key under which a fetched detail document records its wall-clock fetch time
+DETAIL_FETCHED_AT = "_fetched_at"
+DETAIL_CACHE_SIZE = 512
+
+# Hedged detail requests: a duplicate is sent once a request is slower than
+# the observed p95 latency (after enough samples have been collected)
+HEDGE_MIN_SAMPLES = 20
+LATENCY_SAMPLES = 200
+
+# Concurrent detail requests when a refresh wave prefetches its stations
+PREFETCH_CONCURRENCY = 8
+
+# Request counters of the refreshes (and waves) running in the current task context
+_REQUEST_COUNTER: ContextVar[tuple[dict[str, int], ...]] = ContextVar(
+    "nl_fuel_prices_request_counter", default=()
+)
+
+
+@contextmanager
+def count_requests() -> Iterator[dict[str, int]]:
+    """Count the API requests issued within this context (and its child tasks).
+
+    Requests are also counted by every enclosing `count_requests` context.
+    """
+    counts = {"places": 0, "detail": 0}
+    token = _REQUEST_COUNTER.set((*_REQUEST_COUNTER.get(), counts))
+    try:
+        yield counts
+    finally:
+        _REQUEST_COUNTER.reset(token)
+
+
+# Decoding statistics of the refresh running in the current task context
+_DECODE_STATS: ContextVar[dict[str, float] | None] = ContextVar(
+    "nl_fuel_prices_decode_stats", default=None
+)
+
+
+@contextmanager
+def measure_decoding() -> Iterator[dict[str, float]]:
+    """Measure event-loop time spent decoding responses within this context."""
+    stats = {"loop_seconds": 0.0, "decoded": 0, "offloaded": 0}
+    token = _DECODE_STATS.set(stats)
+    try:
+        yield stats
+    finally:
+        _DECODE_STATS.reset(token)
+
+
+# Detail documents prefetched for the refresh wave running in this context
+_PREFETCHED: ContextVar[dict[str, dict[str, Any]] | None] = ContextVar(
+    "nl_fuel_prices_prefetched", default=None
+)
+
+
+@contextmanager
+def use_prefetched(details: dict[str, dict[str, Any]]) -> Iterator[None]:
+    """Serve detail documents from `details` (keyed by station id) within this context."""
+    token = _PREFETCHED.set(details)
+    try:
+        yield
+    finally:
+        _PREFETCHED.reset(token)
+
+
+class FuelPriceAPIError(Exception):
+    """DirectLease API request failed (connection error, timeout or bad status)."""
+
+
+class CircuitOpenError(FuelPriceAPIError):
+    """Request not sent because the circuit breaker is open."""
+
+
+@dataclass
+class _Flight:
+    """A single-flight request and the number of callers awaiting it."""
+
+    task: asyncio.Task
+    ticket: WaitTicket
+    callers: int = 0
+
+
+def _normalize_url(url: str) -> str:
+    """Normalize a URL so equivalent requests share one single-flight key."""
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path, query, ""))
+
 
 def _generate_checksum(url: str) -> str:
     """Generate DirectLease API checksum for authentication."""
@@ -44,12 +162,65 @@ def _generate_checksum(url: str) -> str:
     return f"{date_uuid_part}/{timestamp}/{hashed}"
 
 
+def _fetched_at(detail_data: dict[str, Any]) -> datetime:
+    """Return when a detail document was fetched (now when unknown)."""
+    fetched = detail_data.get(DETAIL_FETCHED_AT)
+    return datetime.fromtimestamp(fetched) if fetched else datetime.now()
+
+
+def _fetched_within(detail_data: Any, max_age: float) -> bool:
+    """Return whether a detail document was fetched at most `max_age` seconds ago."""
+    if not isinstance(detail_data, dict):
+        return False
+    fetched = detail_data.get(DETAIL_FETCHED_AT)
+    return fetched is not None and time() - fetched <= max_age
+
+
 class FuelPriceAPI:
     """API client for Dutch fuel price data using DirectLease Tank Service."""
 
-    def __init__(self, session: aiohttp.ClientSession) -> None:
-        """Initialize the API client."""
-        self.session = session
+    def __init__(
+        self,
+        session: aiohttp.ClientSession | None = None,
+        transport: DirectLeaseTransport | None = None,
+        executor: Callable[..., Awaitable[Any]] | None = None,
+        loads: Callable[[bytes], Any] = json_loads,
+        base_url: str = DIRECTLEASE_API_BASE,
+    ) -> None:
+        """Initialize the API client.
+
+        Without a transport a dedicated DirectLease transport is created; a
+        given session is then used instead of the transport's own pool.
+        `executor` (e.g. `hass.async_add_executor_job`) runs the decoding of
+        large payloads off the event loop; `loads` is the JSON decoder.
+        `base_url` points the client at another Tank Service (e.g. a local
+        stand-in).
+        """
+        self.base_url = base_url.rstrip("/")
+        self.transport = transport or DirectLeaseTransport(session)
+        self._executor = executor
+        self._loads = loads
+        self.decode_loop_time = 0.0
+        self.decoded_payloads = 0
+        self.offloaded_decodes = 0
+        self._places_cache = TTLCache(PLACES_CACHE_TTL, maxsize=1)
+        self._detail_cache = TTLCache(DETAIL_CACHE_TTL, maxsize=DETAIL_CACHE_SIZE)
+        self.request_counts = {"places": 0, "detail": 0}
+        self.limiter = TokenBucket(DEFAULT_REQUEST_BUDGET, DEFAULT_REQUEST_BURST)
+        self._inflight: dict[str, _Flight] = {}
+        self.breaker = CircuitBreaker()
+        self._detail_latencies: deque[float] = deque(maxlen=LATENCY_SAMPLES)
+        self.hedged_requests = 0
+        self.hedge_wins = 0
+        self.coalesced_requests = 0
+        self.price_book = PriceBook()
+        self.crawled_details: TTLCache | None = None
+
+    def _record_request(self, endpoint: str) -> None:
+        """Count an outgoing request globally and for the current refresh."""
+        self.request_counts[endpoint] += 1
+        for counter in _REQUEST_COUNTER.get():
+            counter[endpoint] += 1
 
     async def get_fuel_prices(
         self,
@@ -57,191 +228,666 @@ class FuelPriceAPI:
         longitude: float,
         radius: float,
         fuel_type: str,
-    ) -> list[dict[str, Any]]:
-        """Get fuel prices using the DirectLease Tank Service API."""
+        hedge: bool = False,
+        latency_budget: float | None = None,
+        max_stations: int = DEFAULT_MAX_STATIONS,
+        plan_by_price: bool = False,
+        crawled_max_age: float | None = None,
+    ) -> list[StationPrice]:
+        """Get fuel prices using the DirectLease Tank Service API.
+
+        Returns an empty list when no station in the radius has a price and
+        raises FuelPriceAPIError when the API could not be reached. With
+        `hedge`, slow detail requests get a duplicate; with `latency_budget`
+        (seconds) detail requests still running after the budget are dropped
+        and the partial result is returned. Details are fetched for
+        `max_stations` stations: the nearest ones, or with `plan_by_price`
+        the ones expected to be cheapest plus a few unexplored ones. With
+        `crawled_max_age` (seconds), details the background crawler fetched
+        at most that long ago are used instead of a request; each station's
+        `last_updated` is its detail's fetch time either way.
+        """
+        catalogue = await self.async_get_places()
+        return await self._parse_directlease_data(
+            catalogue, latitude, longitude, radius, fuel_type, hedge, latency_budget,
+            max_stations, plan_by_price, crawled_max_age,
+        )
+
+    async def _async_request_json(
+        self,
+        url: str,
+        endpoint: str,
+        timeout: float,
+        priority: int,
+        hedge: bool = False,
+    ) -> Any | None:
+        """GET a resource once for all concurrent callers (single-flight).
+
+        Concurrent requests for the same normalized URL await one shared task,
+        so the number of requests equals the number of unique resources. The
+        task is shielded: a cancelled caller does not cancel the others, but
+        once every caller is gone (for example dropped by the latency budget)
+        the task is cancelled too, so it does not keep waiting for a token or
+        a response nobody reads. A caller joining with a better priority
+        promotes the shared task's place in the limiter queue, so it never
+        waits behind background work.
+        """
+        key = _normalize_url(url)
+        flight = self._inflight.get(key)
+        if flight is None:
+            ticket = WaitTicket(priority)
+            task = asyncio.ensure_future(
+                self._async_send_request(url, endpoint, timeout, ticket, hedge)
+            )
+            flight = self._inflight[key] = _Flight(task, ticket)
+            task.add_done_callback(lambda done: self._async_flight_done(key, done))
+        else:
+            self.coalesced_requests += 1
+            _LOGGER.debug(f"Joining in-flight request for {key}")
+            self.limiter.promote(flight.ticket, priority)
+        flight.callers += 1
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.callers -= 1
+            if not flight.callers and not flight.task.done():
+                _LOGGER.debug(f"Cancelling request nobody waits for anymore: {key}")
+                flight.task.cancel()
+
+    def _async_flight_done(self, key: str, task: asyncio.Task) -> None:
+        """Forget a finished single-flight task."""
+        flight = self._inflight.get(key)
+        if flight is not None and flight.task is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # Mark the exception retrieved even if every caller was cancelled
+            task.exception()
+
+    async def _async_send_request(
+        self,
+        url: str,
+        endpoint: str,
+        timeout: float,
+        ticket: WaitTicket,
+        hedge: bool = False,
+    ) -> Any | None:
+        """Send a rate-limited, checksummed GET and return decoded JSON.
+
+        Returns None for 404 (unknown station). Connection errors, timeouts and
+        other statuses raise FuelPriceAPIError and count towards the circuit
+        breaker; while the circuit is open no request is sent at all. A detail
+        request cancelled after it was sent adds its elapsed time to the
+        latency samples as a lower bound, so requests too slow to be waited
+        for still raise the hedging threshold.
+        """
+        if not self.breaker.allow_request():
+            raise CircuitOpenError(
+                f"circuit open, retry in {self.breaker.retry_in():.0f}s"
+            )
         
-        api_fuel_type = FUEL_TYPE_MAP.get(fuel_type, fuel_type.upper())
+        sent: float | None = None
+        try:
+            await self.limiter.acquire(ticket=ticket)
+            sent = monotonic()
+            
+            hedge_after = self.detail_latency_p95() if hedge and endpoint == "detail" else None
+            if hedge_after is not None:
+                data = await self._async_hedged_get(url, endpoint, timeout, hedge_after)
+            else:
+                data = await self._async_get(url, endpoint, timeout)
+        except asyncio.CancelledError:
+            self.breaker.abort_probe()
+            if sent is not None and endpoint == "detail":
+                self._detail_latencies.append(monotonic() - sent)
+            raise
+        except FuelPriceAPIError:
+            self.breaker.record_failure()
+            raise
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as err:
+            self.breaker.record_failure()
+            raise FuelPriceAPIError(f"DirectLease API connection error: {err}") from err
         
-        # DirectLease API endpoint
-        url = DIRECTLEASE_API_PLACES
+        self.breaker.record_success()
+        return data
+
+    async def _async_get(self, url: str, endpoint: str, timeout: float) -> Any | None:
+        """Send one checksummed GET; return decoded JSON or None for 404."""
+        # Generate authentication checksum
+        headers = {"X-Checksum": _generate_checksum(url)}
         
-        _LOGGER.debug(f"Fetching from DirectLease Tank Service API: {url}")
+        self._record_request(endpoint)
+        started = monotonic()
+        async with self.transport.get(url, endpoint, timeout, headers) as response:
+            if response.status == 200:
+                if endpoint == "places":
+                    data = await self._async_read_places(response)
+                else:
+                    body = await response.read()
+                    data = await self._async_decode(len(body), self._loads, body)
+                if endpoint == "detail":
+                    self._detail_latencies.append(monotonic() - started)
+                return data
+            if response.status == 404:
+                return None
+            if response.status == 403:
+                _LOGGER.error("DirectLease API blocked request - IP may be blocked. Contact tankservice-block@app-it-up.com")
+                raise FuelPriceAPIError("request blocked (403)")
+            text = await response.text()
+            _LOGGER.debug(f"Response: {text[:200]}")
+            raise FuelPriceAPIError(f"DirectLease API returned status {response.status}")
+
+    async def _async_read_places(self, response: aiohttp.ClientResponse) -> StationCatalogue:
+        """Decode the national list incrementally straight into a catalogue.
+
+        With an executor, chunks are batched up to the offload threshold so
+        the parser runs off the event loop without buffering the whole body.
+        """
+        builder = CatalogueBuilder()
+        parser = PlacesStreamParser(sink=builder.add)
+        batch: list[bytes] = []
+        batched = 0
+        total = 0
+        async for chunk in response.content.iter_chunked(DEFAULT_CHUNK_SIZE):
+            batch.append(chunk)
+            batched += len(chunk)
+            total += len(chunk)
+            if self._executor is None or batched >= DECODE_OFFLOAD_THRESHOLD:
+                await self._async_decode(batched, parser.feed, b"".join(batch))
+                batch.clear()
+                batched = 0
+        if batch:
+            await self._async_decode(batched, parser.feed, b"".join(batch))
+        parser.close()
+        return await self._async_decode(total, builder.build)
+
+    async def _async_decode(self, size: int, func: Callable[..., Any], *args: Any) -> Any:
+        """Run a decoding step, in the executor for payloads above the threshold.
+
+        Time spent decoding on the event loop is recorded for the current refresh.
+        """
+        stats = _DECODE_STATS.get()
+        self.decoded_payloads += 1
+        if stats is not None:
+            stats["decoded"] += 1
         
-        # Generate authentication checksum
-        checksum = _generate_checksum(url)
+        if self._executor is not None and size >= DECODE_OFFLOAD_THRESHOLD:
+            self.offloaded_decodes += 1
+            if stats is not None:
+                stats["offloaded"] += 1
+            with span("decode"):
+                return await self._executor(func, *args)
         
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Linux; Android 13; Pixel 7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.6099.230 Mobile Safari/537.36",
-            "Accept": "application/json",
-            "X-Checksum": checksum,
+        started = monotonic()
+        try:
+            with span("decode"):
+                return func(*args)
+        finally:
+            elapsed = monotonic() - started
+            self.decode_loop_time += elapsed
+            if stats is not None:
+                stats["loop_seconds"] += elapsed
+
+    def cache_stats(self) -> dict[str, Any]:
+        """Return statistics of the catalogue and detail caches."""
+        return {
+            "places": self._places_cache.stats(),
+            "detail": self._detail_cache.stats(),
         }
+    
+    def catalogue_stats(self) -> dict[str, Any]:
+        """Return the size and age (seconds) of the last downloaded catalogue."""
+        catalogue = self._places_cache.peek("places")
+        age = self._places_cache.age("places")
+        return {
+            "stations": len(catalogue) if catalogue is not None else None,
+            "age": round(age, 1) if age is not None else None,
+        }
+
+    def decode_stats(self) -> dict[str, Any]:
+        """Return JSON decoding statistics."""
+        return {
+            "json_decoder": JSON_DECODER if self._loads is json_loads else "custom",
+            "offload_threshold": DECODE_OFFLOAD_THRESHOLD if self._executor else None,
+            "decoded_payloads": self.decoded_payloads,
+            "offloaded_decodes": self.offloaded_decodes,
+            "loop_time": round(self.decode_loop_time, 3),
+        }
+
+    async def _async_hedged_get(
+        self,
+        url: str,
+        endpoint: str,
+        timeout: float,
+        hedge_after: float,
+    ) -> Any | None:
+        """GET with a duplicate request once the first exceeds `hedge_after` seconds.
+
+        The first successful response wins and the other request is cancelled.
+        No duplicate is sent when the rate limiter has no token to spare. When
+        the duplicate wins, the primary's elapsed time is recorded as a lower
+        bound of its latency; leaving it out would pull the p95 down and make
+        hedges ever more frequent.
+        """
+        started = monotonic()
+        primary = asyncio.ensure_future(self._async_get(url, endpoint, timeout))
+        pending = {primary}
+        try:
+            done, pending = await asyncio.wait(pending, timeout=hedge_after)
+            if done:
+                return primary.result()
+            
+            if self.limiter.try_acquire():
+                self.hedged_requests += 1
+                _LOGGER.debug(f"Hedging slow request after {hedge_after:.2f}s: {url}")
+                secondary = asyncio.ensure_future(self._async_get(url, endpoint, timeout))
+                pending.add(secondary)
+            
+            error: BaseException | None = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is not primary:
+                            self.hedge_wins += 1
+                            if not primary.done():
+                                self._detail_latencies.append(monotonic() - started)
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def async_close(self) -> None:
+        """Close the transport's connection pool."""
+        await self.transport.async_close()
+
+    def detail_latency_p95(self) -> float | None:
+        """Return the p95 detail request latency, or None with too few samples."""
+        if len(self._detail_latencies) < HEDGE_MIN_SAMPLES:
+            return None
+        ordered = sorted(self._detail_latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+    async def get_fuel_prices_many(
+        self,
+        queries: list[FuelPriceQuery],
+        plan_by_price: bool = False,
+        concurrency: int = PREFETCH_CONCURRENCY,
+    ) -> list[list[StationPrice]]:
+        """Get fuel prices for many locations and fuel types at once.
+
+        All queries use one catalogue snapshot and one distance matrix
+        (StationCatalogue.query_radius_many). The details of all selected
+        stations are fetched once with bounded concurrency, however many
+        queries share them. Returns the stations of each query, cheapest
+        first, in query order.
+        """
+        catalogue = await self.async_get_places()
+        matches = catalogue.query_radius_many(
+            [(query.latitude, query.longitude, query.radius) for query in queries]
+        )
+        
+        selected: list[list[Station]] = []
+        for query, in_radius in zip(queries, matches):
+            if plan_by_price:
+                candidates = plan_candidates(
+                    catalogue, in_radius, self.price_book, query.fuel_type, query.max_stations
+                )
+            else:
+                candidates = heapq.nsmallest(query.max_stations, in_radius)
+            selected.append([catalogue.station(row, distance) for distance, row in candidates])
+        
+        station_ids = [station.id for stations in selected for station in stations]
+        details = await self.async_prefetch_details(station_ids, concurrency)
+        if station_ids and not details:
+            raise FuelPriceAPIError("No station details could be fetched")
+        _LOGGER.debug(
+            f"Bulk query of {len(queries)} location(s) selected {len(station_ids)} stations, "
+            f"{len(set(station_ids))} unique"
+        )
+        
+        results = []
+        for query, stations in zip(queries, selected):
+            priced = []
+            for station_info in stations:
+                detail_data = details.get(str(station_info.id))
+                if detail_data is None:
+                    continue
+                try:
+                    station = self._build_station(station_info, detail_data, query.fuel_type)
+                except Exception as err:
+                    _LOGGER.debug(f"Failed to parse station {station_info.id}: {err}")
+                    continue
+                if station is not None:
+                    priced.append(station)
+            results.append(_rank_stations(priced))
+        return results
+
+    async def async_get_places(self, force: bool = False) -> StationCatalogue:
+        """Get the national station catalogue, shared between entries for a short TTL.
+
+        The catalogue is the single source for all radius queries. Raises FuelPriceAPIError when the list cannot be fetched.
+        """
+        if not force:
+            cached = self._places_cache.get("places")
+            if cached is not None:
+                _LOGGER.debug("Using cached DirectLease places list")
+                return cached
+        
+        # DirectLease API endpoint
+        url = f"{self.base_url}{DIRECTLEASE_PLACES_PATH}"
+        
+        _LOGGER.debug(f"Fetching from DirectLease Tank Service API: {url}")
         
         try:
-            async with self.session.get(url, headers=headers, timeout=aiohttp.ClientTimeout(total=15)) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return await self._parse_directlease_data(data, latitude, longitude, radius, fuel_type)
-                elif response.status == 403:
-                    _LOGGER.error("DirectLease API blocked request - IP may be blocked. Contact tankservice-block@app-it-up.com")
-                    return []
-                else:
-                    _LOGGER.warning(f"DirectLease API returned status {response.status}")
-                    text = await response.text()
-                    _LOGGER.debug(f"Response: {text[:200]}")
-                    return []
-        except aiohttp.ClientError as err:
-            _LOGGER.error(f"DirectLease API connection error: {err}")
-            return []
-        except Exception as err:
+            with span("places"):
+                data = await self._async_request_json(url, "places", 15, PRIORITY_CATALOGUE)
+        except CircuitOpenError as err:
+            _LOGGER.debug(f"Skipping DirectLease places request: {err}")
+            raise
+        except FuelPriceAPIError as err:
             _LOGGER.error(f"DirectLease API failed: {err}")
-            return []
+            raise
+        
+        if data is None:
+            raise FuelPriceAPIError("DirectLease places list not found")
+        self._places_cache.set("places", data)
+        return data
+
+    async def async_get_station_detail(
+        self,
+        station_id: Any,
+        priority: int = PRIORITY_DETAIL,
+        hedge: bool = False,
+        crawled_max_age: float | None = None,
+    ) -> dict[str, Any] | None:
+        """Get the detail document of a single station, cached for a short TTL.
+
+        With `crawled_max_age` (seconds) and the background crawler running,
+        a crawled detail fetched at most that long ago is served without a
+        request. Fetched documents carry their fetch time under
+        DETAIL_FETCHED_AT.
+        """
+        cache_key = str(station_id)
+        prefetched = _PREFETCHED.get()
+        if prefetched is not None and cache_key in prefetched:
+            return prefetched[cache_key]
+        cached = self._detail_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        if crawled_max_age is not None and self.crawled_details is not None:
+            crawled = self.crawled_details.get(cache_key)
+            if _fetched_within(crawled, crawled_max_age):
+                return crawled
+        
+        detail_url = f"{self.base_url}/places/{station_id}?_v48&lang=en"
+        detail_data = await self._async_request_json(detail_url, "detail", 10, priority, hedge)
+        if detail_data is not None:
+            if isinstance(detail_data, dict):
+                detail_data.setdefault(DETAIL_FETCHED_AT, time())
+            self._detail_cache.set(cache_key, detail_data)
+            if self.crawled_details is not None:
+                self.crawled_details.set(cache_key, detail_data)
+            self._record_prices(station_id, detail_data)
+        return detail_data
+    
+    async def async_prefetch_details(
+        self,
+        station_ids: list[Any],
+        concurrency: int = PREFETCH_CONCURRENCY,
+        crawled_max_age: float | None = None,
+    ) -> dict[str, dict[str, Any]]:
+        """Fetch the details of many stations with bounded concurrency.
+
+        Returns the documents that could be fetched, keyed by station id;
+        failed stations are left out and fetched again by the refresh.
+        Crawled details are used as in `async_get_station_detail`.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def _async_fetch(station_id: Any) -> dict[str, Any] | None:
+            async with semaphore:
+                return await self.async_get_station_detail(
+                    station_id, crawled_max_age=crawled_max_age
+                )
+        
+        unique = list(dict.fromkeys(str(station_id) for station_id in station_ids))
+        results = await asyncio.gather(
+            *(_async_fetch(station_id) for station_id in unique), return_exceptions=True
+        )
+        details = {}
+        for station_id, result in zip(unique, results):
+            if isinstance(result, FuelPriceAPIError):
+                _LOGGER.debug(f"Failed to prefetch station {station_id}: {result}")
+            elif isinstance(result, dict):
+                details[station_id] = result
+        return details
+    
+    def station_prices(self, detail_data: dict[str, Any]) -> tuple[float | None, ...]:
+        """Return the price of every fuel type (FUEL_TYPE_MAP order) in a detail document."""
+        try:
+            return tuple(
+                self._match_fuel_price(detail_data, fuel_type) for fuel_type in FUEL_TYPE_MAP
+            )
+        except (AttributeError, TypeError):
+            return ()
     
+    def _record_prices(self, station_id: Any, detail_data: dict[str, Any]) -> None:
+        """Remember the prices of all fuel types in a detail document."""
+        try:
+            station_id = int(station_id)
+        except (TypeError, ValueError):
+            return
+        for fuel_type, price in zip(FUEL_TYPE_MAP, self.station_prices(detail_data)):
+            if price:
+                self.price_book.record(fuel_type, station_id, round(price, 3))
+    
+    async def async_get_station_price(
+        self, station_id: Any, fuel_type: str, crawled_max_age: float | None = None
+    ) -> float | None:
+        """Get the current price of one station, or None if unavailable.
+
+        The price is fetched live unless a crawled detail is younger than
+        `crawled_max_age` seconds.
+        """
+        try:
+            detail_data = await self.async_get_station_detail(
+                station_id, PRIORITY_CHEAPEST, crawled_max_age=crawled_max_age
+            )
+        except Exception as err:
+            _LOGGER.debug(f"Failed to fetch station {station_id}: {err}")
+            return None
+        if detail_data is None:
+            return None
+        price = self._match_fuel_price(detail_data, fuel_type)
+        return round(price, 3) if price else None
+
     async def _parse_directlease_data(
         self,
-        data: Any,
+        catalogue: StationCatalogue,
         latitude: float,
         longitude: float,
         radius: float,
         fuel_type: str,
-    ) -> list[dict[str, Any]]:
-        """Parse DirectLease Tank Service API response and fetch station details."""
+        hedge: bool = False,
+        latency_budget: float | None = None,
+        max_stations: int = DEFAULT_MAX_STATIONS,
+        plan_by_price: bool = False,
+        crawled_max_age: float | None = None,
+    ) -> list[StationPrice]:
+        """Pick stations in the radius and fetch their details."""
         stations = []
         
-        if not data or not isinstance(data, list):
-            _LOGGER.debug(f"Invalid data format: {type(data)}")
+        if not catalogue:
+            _LOGGER.debug("Empty station catalogue")
             return stations
         
-        api_fuel_type = FUEL_TYPE_MAP.get(fuel_type, fuel_type.upper())
-        
-        _LOGGER.debug(f"Processing {len(data)} stations from API")
+        _LOGGER.debug(f"Processing {len(catalogue)} stations from API")
         
-        # First, filter stations by radius
-        nearby_stations = []
-        for item in data:
-            try:
-                # Get coordinates (API uses 'lat' and 'lng')
-                station_lat = item.get("lat")
-                station_lon = item.get("lng")
-                
-                if station_lat is None or station_lon is None:
-                    continue
-                
-                # Calculate distance
-                distance = self._calculate_distance(latitude, longitude, station_lat, station_lon)
-                
-                if distance <= radius:
-                    nearby_stations.append({
-                        "id": item.get("id"),
-                        "lat": station_lat,
-                        "lng": station_lon,
-                        "distance": distance,
-                        "brand": item.get("brand", "Unknown"),
-                        "city": item.get("city", ""),
-                    })
-            except (KeyError, ValueError, TypeError):
-                continue
+        with span("filter"):
+            candidates = self.select_candidates(
+                catalogue, latitude, longitude, radius, fuel_type, max_stations, plan_by_price
+            )
+            nearby_stations = [catalogue.station(row, distance) for distance, row in candidates]
         
-        _LOGGER.debug(f"Found {len(nearby_stations)} stations within {radius}km radius")
+        _LOGGER.debug(
+            f"Selected {len(nearby_stations)} stations within {radius}km radius "
+            f"({'by expected price' if plan_by_price else 'nearest'})"
+        )
         
-        # Limit to 5 closest stations (matching displayed alternatives)
-        nearby_stations.sort(key=lambda x: x["distance"])
-        nearby_stations = nearby_stations[:5]
+        # Fetch details for all nearby stations concurrently
+        tasks = [
+            asyncio.ensure_future(
+                self.async_get_station_detail(
+                    station_info.id, hedge=hedge, crawled_max_age=crawled_max_age
+                )
+            )
+            for station_info in nearby_stations
+        ]
+        pending: set[asyncio.Future] = set()
+        if tasks:
+            with span("details"):
+                _, pending = await asyncio.wait(tasks, timeout=latency_budget or None)
+            if pending:
+                _LOGGER.debug(
+                    f"Latency budget of {latency_budget}s exceeded, "
+                    f"dropping {len(pending)} slow station detail request(s)"
+                )
+                for task in pending:
+                    task.cancel()
         
-        # Fetch details for each nearby station
-        for station_info in nearby_stations:
-            try:
-                station_id = station_info["id"]
-                detail_url = f"{DIRECTLEASE_API_BASE}/places/{station_id}?_v48&lang=en"
-                checksum = _generate_checksum(detail_url)
-                
-                headers = {
-                    "User-Agent": "Mozilla/5.0 (Linux; Android 13; Pixel 7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.6099.230 Mobile Safari/537.36",
-                    "Accept": "application/json",
-                    "X-Checksum": checksum,
-                }
-                
-                async with self.session.get(detail_url, headers=headers, timeout=aiohttp.ClientTimeout(total=10)) as response:
-                    if response.status != 200:
+        with span("build"):
+            api_error: FuelPriceAPIError | None = None
+            for station_info, task in zip(nearby_stations, tasks):
+                if task.cancelled():
+                    continue
+                try:
+                    detail_data = task.result()
+                    if detail_data is None:
                         continue
                     
-                    detail_data = await response.json()
-                    
-                    # Find matching fuel price
-                    fuels = detail_data.get("fuels", [])
-                    matching_price = None
-                    
-                    for fuel_item in fuels:
-                        fuel_key = fuel_item.get("key", "").lower()
-                        fuel_name = fuel_item.get("name", "")
+                    station = self._build_station(station_info, detail_data, fuel_type)
+                    if station is not None:
+                        stations.append(station)
                         
-                        # Match by key using actual API fuel type keys
-                        if (fuel_type == "euro95" and fuel_key == "e10") or \
-                           (fuel_type == "euro98" and fuel_key == "euro98") or \
-                           (fuel_type == "diesel" and fuel_key == "diesel") or \
-                           (fuel_type == "lpg" and fuel_key == "autogas"):
-                            price_value = fuel_item.get("price")
-                            if price_value and price_value > 0:
-                                # DirectLease returns price in cents per liter (e.g., 1899 = €1.899)
-                                matching_price = price_value / 1000
-                                break
-                    
-                    if matching_price is None or matching_price == 0:
-                        continue
-                    
-                    # Build station data
-                    station_name = detail_data.get("name", "")
-                    if not station_name:
-                        station_name = f"{detail_data.get('brand', 'Unknown')} {detail_data.get('city', '')}"
-                    
-                    # Get services
-                    services = detail_data.get("services", [])
-                    is_unmanned = "unmanned" in services
-                    has_shop = "shop" in services
-                    
-                    # Get shop opening hours if has shop
-                    shop_hours = None
-                    if has_shop:
-                        opening_times = detail_data.get("openingTimes", [])
-                        for schedule in opening_times:
-                            if "shop" in schedule.get("types", []):
-                                shop_hours = schedule
-                                break
-                    
-                    station = {
-                        "id": str(station_id),
-                        "name": station_name.strip(),
-                        "brand": detail_data.get("brand", "Unknown"),
-                        "address": f"{detail_data.get('address', '')}, {detail_data.get('city', '')} {detail_data.get('postalCode', '')}".strip(", "),
-                        "latitude": station_info["lat"],
-                        "longitude": station_info["lng"],
-                        "fuel_type": fuel_type,
-                        "price": round(matching_price, 3),
-                        "opening_hours": self._parse_opening_hours(detail_data.get("openingTimes", [])),
-                        "last_updated": datetime.now().isoformat(),
-                        "distance": round(station_info["distance"], 2),
-                        "services": services,
-                        "is_unmanned": is_unmanned,
-                        "has_shop": has_shop,
-                        "shop_hours": shop_hours,
-                    }
-                    
-                    stations.append(station)
-                    
-            except Exception as err:
-                _LOGGER.debug(f"Failed to fetch station {station_info.get('id')}: {err}")
-                continue
-        
-        # Sort by price (cheapest first)
-        stations.sort(key=lambda x: x["price"])
-        
-        # Add ranking
-        for idx, station in enumerate(stations, 1):
-            station["rank"] = idx
+                except FuelPriceAPIError as err:
+                    api_error = err
+                    _LOGGER.debug(f"Failed to fetch station {station_info.id}: {err}")
+                    continue
+                except Exception as err:
+                    _LOGGER.debug(f"Failed to fetch station {station_info.id}: {err}")
+                    continue
+            
+            # Every detail request failed: report an outage rather than "no stations"
+            if not stations and api_error is not None:
+                raise api_error
+            if not stations and pending:
+                raise FuelPriceAPIError(
+                    f"no station details within the latency budget of {latency_budget}s "
+                    f"({len(pending)} request(s) dropped)"
+                )
+            
+            _rank_stations(stations)
         
         _LOGGER.debug(f"Found {len(stations)} stations within {radius}km with {fuel_type} prices")
         
         return stations
     
+    def select_candidates(
+        self,
+        catalogue: StationCatalogue,
+        latitude: float,
+        longitude: float,
+        radius: float,
+        fuel_type: str,
+        max_stations: int = DEFAULT_MAX_STATIONS,
+        plan_by_price: bool = False,
+    ) -> list[tuple[float, int]]:
+        """Return (distance, row) of the stations a refresh fetches details for."""
+        if plan_by_price:
+            # Expected cheapest stations plus an exploration quota
+            return plan_candidates(
+                catalogue,
+                catalogue.query_radius(latitude, longitude, radius),
+                self.price_book,
+                fuel_type,
+                max_stations,
+            )
+        # Closest stations within the radius (matching displayed alternatives)
+        return catalogue.nearest(latitude, longitude, radius, max_stations)
+    
+    def _build_station(
+        self,
+        station_info: Station,
+        detail_data: dict[str, Any],
+        fuel_type: str,
+    ) -> StationPrice | None:
+        """Build a priced station from catalogue info and its detail document."""
+        station_id = station_info.id
+        
+        # Find matching fuel price
+        matching_price = self._match_fuel_price(detail_data, fuel_type)
+
+        if matching_price is None or matching_price == 0:
+            return None
+
+        # Build station data
+        station_name = detail_data.get("name", "")
+        if not station_name:
+            station_name = f"{detail_data.get('brand', 'Unknown')} {detail_data.get('city', '')}"
+
+        # Get services
+        services = detail_data.get("services", [])
+        is_unmanned = "unmanned" in services
+        has_shop = "shop" in services
+
+        # Get shop opening hours if has shop
+        shop_hours = None
+        if has_shop:
+            opening_times = detail_data.get("openingTimes", [])
+            for schedule in opening_times:
+                if "shop" in schedule.get("types", []):
+                    shop_hours = schedule
+                    break
+
+        return StationPrice(
+            id=str(station_id),
+            name=station_name.strip(),
+            brand=detail_data.get("brand", "Unknown"),
+            address=f"{detail_data.get('address', '')}, {detail_data.get('city', '')} {detail_data.get('postalCode', '')}".strip(", "),
+            latitude=station_info.latitude,
+            longitude=station_info.longitude,
+            fuel_type=fuel_type,
+            price=round(matching_price, 3),
+            opening_hours=self._parse_opening_hours(detail_data.get("openingTimes", [])),
+            last_updated=_fetched_at(detail_data).isoformat(),
+            distance=round(station_info.distance, 2),
+            services=services,
+            is_unmanned=is_unmanned,
+            has_shop=has_shop,
+            shop_hours=shop_hours,
+        )
+    
+    def _match_fuel_price(self, detail_data: dict[str, Any], fuel_type: str) -> float | None:
+        """Return the price in EUR/L for a fuel type from a detail document."""
+        fuels = detail_data.get("fuels", [])
+
+        for fuel_item in fuels:
+            fuel_key = fuel_item.get("key", "").lower()
+
+            # Match by key using actual API fuel type keys
+            if (fuel_type == "euro95" and fuel_key == "e10") or \
+               (fuel_type == "euro98" and fuel_key == "euro98") or \
+               (fuel_type == "diesel" and fuel_key == "diesel") or \
+               (fuel_type == "lpg" and fuel_key == "autogas"):
+                price_value = fuel_item.get("price")
+                if price_value and price_value > 0:
+                    # DirectLease returns price in cents per liter (e.g., 1899 = €1.899)
+                    return price_value / 1000
+
+        return None
+    
     def _parse_opening_hours(self, opening_times: list) -> str:
         """Parse opening hours from API format."""
         if not opening_times:
@@ -262,21 +908,10 @@ class FuelPriceAPI:
         except Exception:
             return "Unknown"
 
-    def _calculate_distance(
-        self, lat1: float, lon1: float, lat2: float, lon2: float
-    ) -> float:
-        """Calculate distance between two coordinates in km using Haversine formula."""
-        R = 6371
-        
-        lat1_rad = math.radians(lat1)
-        lat2_rad = math.radians(lat2)
-        delta_lat = math.radians(lat2 - lat1)
-        delta_lon = math.radians(lon2 - lon1)
-        
-        a = (
-            math.sin(delta_lat / 2) ** 2
-            + math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(delta_lon / 2) ** 2
-        )
-        c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-        
-        return R * c
+
+def _rank_stations(stations: list[StationPrice]) -> list[StationPrice]:
+    """Sort stations by price (cheapest first) and number their rank."""
+    stations.sort(key=lambda station: station.price)
+    for rank, station in enumerate(stations, 1):
+        station.rank = rank
+    return stations
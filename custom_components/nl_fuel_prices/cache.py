@@ -0,0 +1,92 @@
+"""Small in-memory caches for DirectLease API responses."""
+from __future__ import annotations
+
+from collections import OrderedDict
+from time import monotonic
+from typing import Any
+
+
+class TTLCache:
+    """LRU cache whose entries expire after a fixed time-to-live (seconds)."""
+
+    def __init__(self, ttl: float, maxsize: int = 1024) -> None:
+        """Initialize the cache."""
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data: OrderedDict[Any, tuple[float, Any]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Any, max_age: float | None = None) -> Any | None:
+        """Return a cached value, or None when missing or older than max_age/ttl."""
+        item = self._data.get(key)
+        if item is None:
+            self.misses += 1
+            return None
+
+        stored_at, value = item
+        age = monotonic() - stored_at
+        if age > self.ttl:
+            del self._data[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+        if max_age is not None and age > max_age:
+            self.misses += 1
+            return None
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def peek(self, key: Any) -> Any | None:
+        """Return a cached value regardless of age, without touching statistics."""
+        item = self._data.get(key)
+        return item[1] if item else None
+
+    def set(self, key: Any, value: Any) -> None:
+        """Store a value, evicting the least recently used entry when full."""
+        self._data[key] = (monotonic(), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def age(self, key: Any) -> float | None:
+        """Return the age of a cached value in seconds."""
+        item = self._data.get(key)
+        if item is None:
+            return None
+        return monotonic() - item[0]
+
+    def pop(self, key: Any) -> None:
+        """Remove a value from the cache."""
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove all values."""
+        self._data.clear()
+
+    def __contains__(self, key: Any) -> bool:
+        """Return whether a key is cached (even if expired)."""
+        return key in self._data
+
+    def __len__(self) -> int:
+        """Return the number of cached values."""
+        return len(self._data)
+
+    def stats(self) -> dict[str, Any]:
+        """Return cache statistics."""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+        }
@@ -0,0 +1,334 @@
+"""Columnar in-memory catalogue of all DirectLease stations."""
+from __future__ import annotations
+
+import heapq
+import logging
+import math
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Any, Iterator, NamedTuple, Sequence
+
+from .models import Station
+
+_LOGGER = logging.getLogger(__name__)
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Whether the pure-Python fallback of query_radius_many was logged already
+_fallback_logged = False
+
+EARTH_RADIUS_KM = 6371
+KM_PER_DEGREE_LAT = EARTH_RADIUS_KM * math.pi / 180
+
+# Margin (degrees) on the latitude band so rounding never drops a station
+_BAND_MARGIN = 1e-9
+
+# Largest query x station distance matrix computed at once (8 bytes per cell)
+MATRIX_MAX_CELLS = 1_000_000
+
+
+def haversine(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Calculate distance between two coordinates in km using Haversine formula."""
+    lat1_rad = math.radians(lat1)
+    lat2_rad = math.radians(lat2)
+    delta_lat = math.radians(lat2 - lat1)
+    delta_lon = math.radians(lon2 - lon1)
+
+    a = (
+        math.sin(delta_lat / 2) ** 2
+        + math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(delta_lon / 2) ** 2
+    )
+    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+
+    return EARTH_RADIUS_KM * c
+
+
+class CatalogueView(NamedTuple):
+    """Zero-copy view on a contiguous range of catalogue rows."""
+
+    start: int
+    ids: memoryview
+    latitudes: memoryview
+    longitudes: memoryview
+
+
+class StationCatalogue:
+    """All stations of the national places list in parallel typed columns.
+
+    Rows are ordered by latitude, so a radius query only scans the latitude
+    band that can contain matches (through zero-copy memoryview slices).
+    Brands and cities are interned and stored as indices. Ids map to rows in
+    O(1).
+    """
+
+    def __init__(
+        self,
+        ids: array,
+        latitudes: array,
+        longitudes: array,
+        brand_index: array,
+        city_index: array,
+        brands: list[str | None],
+        cities: list[str | None],
+    ) -> None:
+        """Initialize the catalogue from latitude-sorted columns."""
+        self.ids = ids
+        self.latitudes = latitudes
+        self.longitudes = longitudes
+        self.brand_index = brand_index
+        self.city_index = city_index
+        self.brands = brands
+        self.cities = cities
+        self._rows = {station_id: row for row, station_id in enumerate(ids)}
+
+    @classmethod
+    def from_places(cls, places: list[dict[str, Any]]) -> StationCatalogue:
+        """Build a catalogue from decoded places."""
+        builder = CatalogueBuilder()
+        for place in places:
+            builder.add(place)
+        return builder.build()
+
+    def __len__(self) -> int:
+        """Return the number of stations."""
+        return len(self.ids)
+
+    def __contains__(self, station_id: Any) -> bool:
+        """Return whether a station id is in the catalogue."""
+        return self.row_of(station_id) is not None
+
+    def row_of(self, station_id: Any) -> int | None:
+        """Return the row of a station id, or None when unknown."""
+        try:
+            return self._rows.get(int(station_id))
+        except (TypeError, ValueError):
+            return None
+
+    def station(self, row: int, distance: float = 0.0) -> Station:
+        """Return the station at `row`."""
+        return Station(
+            self.ids[row],
+            self.latitudes[row],
+            self.longitudes[row],
+            distance,
+            self.brands[self.brand_index[row]],
+            self.cities[self.city_index[row]],
+        )
+
+    def view(self, start: int = 0, stop: int | None = None) -> CatalogueView:
+        """Return memoryviews on the id and coordinate columns of a row range."""
+        stop = len(self) if stop is None else stop
+        return CatalogueView(
+            start,
+            memoryview(self.ids)[start:stop],
+            memoryview(self.latitudes)[start:stop],
+            memoryview(self.longitudes)[start:stop],
+        )
+
+    def band(self, latitude: float, radius: float) -> CatalogueView:
+        """Return the rows whose latitude is within `radius` km of `latitude`.
+
+        The great-circle distance is never shorter than the distance along
+        the meridian, so no station within the radius lies outside the band.
+        """
+        degrees = radius / KM_PER_DEGREE_LAT + _BAND_MARGIN
+        start = bisect_left(self.latitudes, latitude - degrees)
+        stop = bisect_right(self.latitudes, latitude + degrees, start)
+        return self.view(start, stop)
+
+    def iter_radius(
+        self,
+        latitude: float,
+        longitude: float,
+        radius: float,
+    ) -> Iterator[tuple[float, int]]:
+        """Yield (distance, row) of every station within `radius` km."""
+        view = self.band(latitude, radius)
+        row = view.start
+        for station_lat, station_lon in zip(view.latitudes, view.longitudes):
+            distance = haversine(latitude, longitude, station_lat, station_lon)
+            if distance <= radius:
+                yield distance, row
+            row += 1
+
+    def query_radius(
+        self,
+        latitude: float,
+        longitude: float,
+        radius: float,
+    ) -> list[tuple[float, int]]:
+        """Return (distance, row) of every station within `radius` km."""
+        return list(self.iter_radius(latitude, longitude, radius))
+
+    def query_radius_many(
+        self,
+        queries: Sequence[tuple[float, float, float]],
+    ) -> list[list[tuple[float, int]]]:
+        """Return (distance, row) within the radius of each (latitude, longitude, radius).
+
+        With numpy the distances from all queries to all stations in the
+        latitude band they span are computed as one matrix (in blocks of at
+        most MATRIX_MAX_CELLS cells); without it every query scans its own
+        band. Rows of each result are in catalogue order, like query_radius.
+        """
+        global _fallback_logged
+        if np is None and queries and not _fallback_logged:
+            _fallback_logged = True
+            _LOGGER.debug(
+                "numpy is not installed; batched radius queries scan each query's "
+                "latitude band in pure Python"
+            )
+        if np is None or not queries:
+            return [self.query_radius(*query) for query in queries]
+
+        query_lat = np.array([query[0] for query in queries], dtype=np.float64)
+        query_lon = np.array([query[1] for query in queries], dtype=np.float64)
+        radii = np.array([query[2] for query in queries], dtype=np.float64)
+        degrees = float(radii.max()) / KM_PER_DEGREE_LAT + _BAND_MARGIN
+        start = bisect_left(self.latitudes, float(query_lat.min()) - degrees)
+        stop = bisect_right(self.latitudes, float(query_lat.max()) + degrees, start)
+        if start == stop:
+            return [[] for _ in queries]
+
+        station_lat = np.radians(np.frombuffer(self.latitudes, dtype=np.float64)[start:stop])
+        station_lon = np.radians(np.frombuffer(self.longitudes, dtype=np.float64)[start:stop])
+        cos_station_lat = np.cos(station_lat)
+
+        results: list[list[tuple[float, int]]] = []
+        block = max(1, MATRIX_MAX_CELLS // (stop - start))
+        for first in range(0, len(queries), block):
+            lat = np.radians(query_lat[first:first + block])[:, None]
+            lon = np.radians(query_lon[first:first + block])[:, None]
+            a = (
+                np.sin((station_lat - lat) / 2) ** 2
+                + np.cos(lat) * cos_station_lat * np.sin((station_lon - lon) / 2) ** 2
+            )
+            distances = EARTH_RADIUS_KM * 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+            for index, radius in enumerate(radii[first:first + block]):
+                rows = np.flatnonzero(distances[index] <= radius)
+                results.append(list(zip(distances[index, rows].tolist(), (rows + start).tolist())))
+        return results
+
+    def nearest(
+        self,
+        latitude: float,
+        longitude: float,
+        radius: float,
+        count: int,
+    ) -> list[tuple[float, int]]:
+        """Return (distance, row) of the `count` nearest stations within `radius` km.
+
+        Rows are visited outwards from `latitude` while a bounded max-heap
+        keeps the best `count` candidates. Once the heap is full, the search
+        stops as soon as the latitude gap alone exceeds the worst kept
+        distance. The result equals `sorted(query_radius(...))[:count]`,
+        including the order of equal distances.
+        """
+        if count <= 0:
+            return []
+
+        latitudes = self.latitudes
+        longitudes = self.longitudes
+        below = bisect_left(latitudes, latitude) - 1
+        above = below + 1
+        rows = len(latitudes)
+
+        heap: list[tuple[float, int]] = []  # (-distance, -row): worst candidate on top
+        limit = radius
+        while below >= 0 or above < rows:
+            gap_below = latitude - latitudes[below] if below >= 0 else math.inf
+            gap_above = latitudes[above] - latitude if above < rows else math.inf
+            if gap_below <= gap_above:
+                row, gap = below, gap_below
+                below -= 1
+            else:
+                row, gap = above, gap_above
+                above += 1
+
+            # Every remaining row is at least this far along the meridian
+            if (gap - _BAND_MARGIN) * KM_PER_DEGREE_LAT > limit:
+                break
+
+            distance = haversine(latitude, longitude, latitudes[row], longitudes[row])
+            if distance > radius:
+                continue
+            candidate = (-distance, -row)
+            if len(heap) < count:
+                heapq.heappush(heap, candidate)
+            elif candidate > heap[0]:
+                heapq.heapreplace(heap, candidate)
+            else:
+                continue
+            if len(heap) == count:
+                limit = -heap[0][0]
+
+        return sorted((-distance, -row) for distance, row in heap)
+
+    def memory_usage(self) -> int:
+        """Return the approximate memory used by the catalogue in bytes."""
+        columns = (self.ids, self.latitudes, self.longitudes, self.brand_index, self.city_index)
+        size = sum(column.itemsize * len(column) for column in columns)
+        size += sys.getsizeof(self._rows) + sum(sys.getsizeof(key) for key in self._rows)
+        size += sum(sys.getsizeof(name) for name in (*self.brands, *self.cities))
+        return size
+
+
+class CatalogueBuilder:
+    """Collect places one at a time (e.g. from the streaming parser)."""
+
+    def __init__(self) -> None:
+        """Initialize empty columns."""
+        self._ids = array("q")
+        self._latitudes = array("d")
+        self._longitudes = array("d")
+        self._brand_index = array("I")
+        self._city_index = array("I")
+        self._brands: dict[str | None, int] = {}
+        self._cities: dict[str | None, int] = {}
+        self._seen: set[int] = set()
+        self.skipped = 0
+
+    def add(self, place: dict[str, Any]) -> None:
+        """Add one place; places without a numeric id or coordinates are skipped."""
+        try:
+            station_id = int(place["id"])
+            latitude = float(place["lat"])
+            longitude = float(place["lng"])
+        except (KeyError, TypeError, ValueError):
+            self.skipped += 1
+            return
+        if station_id in self._seen:
+            self.skipped += 1
+            return
+        self._seen.add(station_id)
+
+        self._ids.append(station_id)
+        self._latitudes.append(latitude)
+        self._longitudes.append(longitude)
+        self._brand_index.append(_intern(self._brands, place.get("brand", "Unknown")))
+        self._city_index.append(_intern(self._cities, place.get("city", "")))
+
+    def build(self) -> StationCatalogue:
+        """Return the catalogue with rows ordered by latitude."""
+        order = sorted(range(len(self._ids)), key=self._latitudes.__getitem__)
+        return StationCatalogue(
+            array("q", (self._ids[row] for row in order)),
+            array("d", (self._latitudes[row] for row in order)),
+            array("d", (self._longitudes[row] for row in order)),
+            array("I", (self._brand_index[row] for row in order)),
+            array("I", (self._city_index[row] for row in order)),
+            list(self._brands),
+            list(self._cities),
+        )
+
+
+def _intern(values: dict[str | None, int], value: str | None) -> int:
+    """Return the index of a string in an interning table, adding it when new."""
+    index = values.get(value)
+    if index is None:
+        index = values[value] = len(values)
+    return index
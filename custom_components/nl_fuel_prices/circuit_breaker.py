@@ -0,0 +1,117 @@
+"""Circuit breaker for the DirectLease API."""
+from __future__ import annotations
+
+import logging
+import random
+from time import monotonic
+from typing import Any
+
+_LOGGER = logging.getLogger(__name__)
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+DEFAULT_FAILURE_THRESHOLD = 3
+DEFAULT_BASE_BACKOFF = 60  # seconds
+DEFAULT_MAX_BACKOFF = 3600  # seconds
+
+
+class CircuitBreaker:
+    """Closed/open/half-open circuit breaker with exponential backoff and jitter.
+
+    After `failure_threshold` consecutive failures the circuit opens and no
+    requests are sent until the backoff expires. Then a single probe request
+    is allowed (half-open): success closes the circuit, failure re-opens it
+    with a doubled backoff.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        base_backoff: float = DEFAULT_BASE_BACKOFF,
+        max_backoff: float = DEFAULT_MAX_BACKOFF,
+    ) -> None:
+        """Initialize the breaker."""
+        self.failure_threshold = failure_threshold
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self._state = STATE_CLOSED
+        self._failures = 0
+        self._trips = 0
+        self._open_until = 0.0
+        self._probe_in_flight = False
+        self.total_failures = 0
+        self.total_rejected = 0
+        self.total_trips = 0
+
+    @property
+    def state(self) -> str:
+        """Return the current state, moving from open to half-open when due."""
+        if self._state == STATE_OPEN and monotonic() >= self._open_until:
+            self._state = STATE_HALF_OPEN
+            self._probe_in_flight = False
+            _LOGGER.debug("Circuit half-open, allowing a probe request")
+        return self._state
+
+    def allow_request(self) -> bool:
+        """Return whether a request may be sent now."""
+        state = self.state
+        if state == STATE_CLOSED:
+            return True
+        if state == STATE_HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+        self.total_rejected += 1
+        return False
+
+    def retry_in(self) -> float:
+        """Return the seconds until the circuit allows a probe again."""
+        if self._state != STATE_OPEN:
+            return 0.0
+        return max(0.0, self._open_until - monotonic())
+
+    def record_success(self) -> None:
+        """Record a successful request and close the circuit."""
+        if self._state != STATE_CLOSED:
+            _LOGGER.info("DirectLease API recovered, circuit closed")
+        self._state = STATE_CLOSED
+        self._failures = 0
+        self._trips = 0
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        """Record a failed request and open the circuit when needed."""
+        self._failures += 1
+        self.total_failures += 1
+        if self._state == STATE_HALF_OPEN or self._failures >= self.failure_threshold:
+            self._open()
+
+    def abort_probe(self) -> None:
+        """Release the half-open probe slot without an outcome (e.g. cancelled)."""
+        self._probe_in_flight = False
+
+    def _open(self) -> None:
+        """Open the circuit with exponential backoff and equal jitter."""
+        backoff = min(self.max_backoff, self.base_backoff * 2 ** self._trips)
+        backoff = backoff / 2 + random.uniform(0, backoff / 2)
+        self._trips += 1
+        self.total_trips += 1
+        self._state = STATE_OPEN
+        self._open_until = monotonic() + backoff
+        self._probe_in_flight = False
+        _LOGGER.warning(
+            f"DirectLease API failing, circuit open for {backoff:.0f}s "
+            f"after {self._failures} consecutive failure(s)"
+        )
+
+    def stats(self) -> dict[str, Any]:
+        """Return breaker statistics."""
+        return {
+            "state": self.state,
+            "consecutive_failures": self._failures,
+            "retry_in": round(self.retry_in(), 1),
+            "total_failures": self.total_failures,
+            "total_rejected": self.total_rejected,
+            "total_trips": self.total_trips,
+        }
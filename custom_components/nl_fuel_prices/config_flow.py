@@ -31,15 +31,36 @@ from .const import (
     CONF_PRICE_INCREASE_THRESHOLD,
     CONF_SCHEDULED_UPDATES,
     CONF_SCHEDULED_UPDATE_TIMES,
+    CONF_SCHEDULED_MAX_AGE,
+    CONF_ADAPTIVE_POLLING,
+    CONF_MIN_UPDATE_INTERVAL,
+    CONF_MAX_UPDATE_INTERVAL,
+    CONF_SENTINEL_MODE,
+    CONF_SENTINEL_MAX_STALENESS,
+    CONF_REQUEST_BUDGET,
+    CONF_HEDGED_REQUESTS,
+    CONF_LATENCY_BUDGET,
+    CONF_MAX_STATIONS,
+    CONF_PRICE_PLANNER,
+    CONF_BACKGROUND_CRAWLER,
+    CONF_CRAWLER_BUDGET,
     FUEL_TYPES,
     FUEL_EURO95,
     DEFAULT_RADIUS,
     DEFAULT_UPDATE_INTERVAL,
+    DEFAULT_MIN_UPDATE_INTERVAL,
+    DEFAULT_MAX_UPDATE_INTERVAL,
+    DEFAULT_SENTINEL_MAX_STALENESS,
+    DEFAULT_REQUEST_BUDGET,
+    DEFAULT_CRAWLER_BUDGET,
+    DEFAULT_LATENCY_BUDGET,
+    DEFAULT_MAX_STATIONS,
     DEFAULT_DAILY_TIME,
     DEFAULT_DAILY_DAYS,
     DEFAULT_PRICE_DROP_THRESHOLD,
     DEFAULT_PRICE_INCREASE_THRESHOLD,
     DEFAULT_SCHEDULED_UPDATE_TIMES,
+    DEFAULT_SCHEDULED_MAX_AGE,
 )
 
 
@@ -155,10 +176,36 @@ class FuelPricesConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 vol.Required(CONF_RADIUS, default=DEFAULT_RADIUS): vol.All(
                     vol.Coerce(int), vol.Range(min=1, max=50)
                 ),
+                vol.Optional(CONF_MAX_STATIONS, default=DEFAULT_MAX_STATIONS): vol.All(
+                    vol.Coerce(int), vol.Range(min=1, max=20)
+                ),
                 vol.Required(CONF_FUEL_TYPE, default=FUEL_EURO95): vol.In(FUEL_TYPES),
                 vol.Optional(CONF_UPDATE_INTERVAL, default=DEFAULT_UPDATE_INTERVAL): vol.All(
                     vol.Coerce(int), vol.Range(min=5, max=60)
                 ),
+                vol.Optional(CONF_ADAPTIVE_POLLING, default=False): bool,
+                vol.Optional(CONF_MIN_UPDATE_INTERVAL, default=DEFAULT_MIN_UPDATE_INTERVAL): vol.All(
+                    vol.Coerce(int), vol.Range(min=5, max=60)
+                ),
+                vol.Optional(CONF_MAX_UPDATE_INTERVAL, default=DEFAULT_MAX_UPDATE_INTERVAL): vol.All(
+                    vol.Coerce(int), vol.Range(min=15, max=360)
+                ),
+                vol.Optional(CONF_SENTINEL_MODE, default=False): bool,
+                vol.Optional(CONF_SENTINEL_MAX_STALENESS, default=DEFAULT_SENTINEL_MAX_STALENESS): vol.All(
+                    vol.Coerce(int), vol.Range(min=15, max=720)
+                ),
+                vol.Optional(CONF_REQUEST_BUDGET, default=DEFAULT_REQUEST_BUDGET): vol.All(
+                    vol.Coerce(int), vol.Range(min=30, max=3600)
+                ),
+                vol.Optional(CONF_PRICE_PLANNER, default=True): bool,
+                vol.Optional(CONF_HEDGED_REQUESTS, default=False): bool,
+                vol.Optional(CONF_LATENCY_BUDGET, default=DEFAULT_LATENCY_BUDGET): vol.All(
+                    vol.Coerce(int), vol.Range(min=0, max=60)
+                ),
+                vol.Optional(CONF_BACKGROUND_CRAWLER, default=False): bool,
+                vol.Optional(CONF_CRAWLER_BUDGET, default=DEFAULT_CRAWLER_BUDGET): vol.All(
+                    vol.Coerce(int), vol.Range(min=10, max=3600)
+                ),
                 vol.Optional(CONF_SCHEDULED_UPDATES, default=False): bool,
                 vol.Optional(CONF_SCHEDULED_UPDATE_TIMES, default=DEFAULT_SCHEDULED_UPDATE_TIMES): selector.SelectSelector(
                     selector.SelectSelectorConfig(
@@ -176,6 +223,9 @@ class FuelPricesConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                         mode=selector.SelectSelectorMode.DROPDOWN,
                     )
                 ),
+                vol.Optional(CONF_SCHEDULED_MAX_AGE, default=DEFAULT_SCHEDULED_MAX_AGE): vol.All(
+                    vol.Coerce(int), vol.Range(min=0, max=120)
+                ),
                 vol.Optional(CONF_DAILY_NOTIFICATION, default=False): bool,
                 vol.Optional(CONF_DAILY_NOTIFICATION_TIME, default=DEFAULT_DAILY_TIME): selector.TimeSelector(),
                 vol.Optional(CONF_DAILY_NOTIFICATION_DAYS, default=DEFAULT_DAILY_DAYS): selector.SelectSelector(
@@ -249,10 +299,58 @@ class FuelPricesOptionsFlow(config_entries.OptionsFlow):
                     CONF_RADIUS,
                     default=self.config_entry.data.get(CONF_RADIUS, DEFAULT_RADIUS),
                 ): vol.All(vol.Coerce(int), vol.Range(min=1, max=50)),
+                vol.Optional(
+                    CONF_MAX_STATIONS,
+                    default=self.config_entry.data.get(CONF_MAX_STATIONS, DEFAULT_MAX_STATIONS),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=20)),
                 vol.Required(
                     CONF_UPDATE_INTERVAL,
                     default=self.config_entry.data.get(CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL),
                 ): vol.All(vol.Coerce(int), vol.Range(min=5, max=60)),
+                vol.Optional(
+                    CONF_ADAPTIVE_POLLING,
+                    default=self.config_entry.data.get(CONF_ADAPTIVE_POLLING, False),
+                ): bool,
+                vol.Optional(
+                    CONF_MIN_UPDATE_INTERVAL,
+                    default=self.config_entry.data.get(CONF_MIN_UPDATE_INTERVAL, DEFAULT_MIN_UPDATE_INTERVAL),
+                ): vol.All(vol.Coerce(int), vol.Range(min=5, max=60)),
+                vol.Optional(
+                    CONF_MAX_UPDATE_INTERVAL,
+                    default=self.config_entry.data.get(CONF_MAX_UPDATE_INTERVAL, DEFAULT_MAX_UPDATE_INTERVAL),
+                ): vol.All(vol.Coerce(int), vol.Range(min=15, max=360)),
+                vol.Optional(
+                    CONF_SENTINEL_MODE,
+                    default=self.config_entry.data.get(CONF_SENTINEL_MODE, False),
+                ): bool,
+                vol.Optional(
+                    CONF_SENTINEL_MAX_STALENESS,
+                    default=self.config_entry.data.get(CONF_SENTINEL_MAX_STALENESS, DEFAULT_SENTINEL_MAX_STALENESS),
+                ): vol.All(vol.Coerce(int), vol.Range(min=15, max=720)),
+                vol.Optional(
+                    CONF_REQUEST_BUDGET,
+                    default=self.config_entry.data.get(CONF_REQUEST_BUDGET, DEFAULT_REQUEST_BUDGET),
+                ): vol.All(vol.Coerce(int), vol.Range(min=30, max=3600)),
+                vol.Optional(
+                    CONF_PRICE_PLANNER,
+                    default=self.config_entry.data.get(CONF_PRICE_PLANNER, False),
+                ): bool,
+                vol.Optional(
+                    CONF_HEDGED_REQUESTS,
+                    default=self.config_entry.data.get(CONF_HEDGED_REQUESTS, False),
+                ): bool,
+                vol.Optional(
+                    CONF_LATENCY_BUDGET,
+                    default=self.config_entry.data.get(CONF_LATENCY_BUDGET, DEFAULT_LATENCY_BUDGET),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=60)),
+                vol.Optional(
+                    CONF_BACKGROUND_CRAWLER,
+                    default=self.config_entry.data.get(CONF_BACKGROUND_CRAWLER, False),
+                ): bool,
+                vol.Optional(
+                    CONF_CRAWLER_BUDGET,
+                    default=self.config_entry.data.get(CONF_CRAWLER_BUDGET, DEFAULT_CRAWLER_BUDGET),
+                ): vol.All(vol.Coerce(int), vol.Range(min=10, max=3600)),
                 vol.Optional(
                     CONF_SCHEDULED_UPDATES,
                     default=self.config_entry.data.get(CONF_SCHEDULED_UPDATES, False),
@@ -276,6 +374,10 @@ class FuelPricesOptionsFlow(config_entries.OptionsFlow):
                         mode=selector.SelectSelectorMode.DROPDOWN,
                     )
                 ),
+                vol.Optional(
+                    CONF_SCHEDULED_MAX_AGE,
+                    default=self.config_entry.data.get(CONF_SCHEDULED_MAX_AGE, DEFAULT_SCHEDULED_MAX_AGE),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=120)),
                 vol.Optional(
                     CONF_DAILY_NOTIFICATION,
                     default=self.config_entry.data.get(CONF_DAILY_NOTIFICATION, False),
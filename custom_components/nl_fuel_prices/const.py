@@ -6,6 +6,7 @@ DOMAIN = "nl_fuel_prices"
 CONF_LOCATION_LAT = "latitude"
 CONF_LOCATION_LON = "longitude"
 CONF_RADIUS = "radius"
+CONF_MAX_STATIONS = "max_stations"
 CONF_FUEL_TYPE = "fuel_type"
 CONF_UPDATE_INTERVAL = "update_interval"
 CONF_NOTIFY_ON_CHANGE = "notify_on_change"
@@ -17,6 +18,18 @@ CONF_DAILY_NOTIFICATION_TIME = "daily_notification_time"
 CONF_DAILY_NOTIFICATION_DAYS = "daily_notification_days"
 CONF_SCHEDULED_UPDATES = "scheduled_updates"
 CONF_SCHEDULED_UPDATE_TIMES = "scheduled_update_times"
+CONF_SCHEDULED_MAX_AGE = "scheduled_max_age"
+CONF_ADAPTIVE_POLLING = "adaptive_polling"
+CONF_MIN_UPDATE_INTERVAL = "min_update_interval"
+CONF_MAX_UPDATE_INTERVAL = "max_update_interval"
+CONF_SENTINEL_MODE = "sentinel_mode"
+CONF_SENTINEL_MAX_STALENESS = "sentinel_max_staleness"
+CONF_REQUEST_BUDGET = "request_budget"
+CONF_HEDGED_REQUESTS = "hedged_requests"
+CONF_LATENCY_BUDGET = "latency_budget"
+CONF_PRICE_PLANNER = "price_planner"
+CONF_BACKGROUND_CRAWLER = "background_crawler"
+CONF_CRAWLER_BUDGET = "crawler_budget"
 
 # Fuel types
 FUEL_EURO95 = "euro95"
@@ -43,12 +56,27 @@ EVENT_DAILY_REPORT = f"{DOMAIN}_daily_report"
 
 # Defaults
 DEFAULT_RADIUS = 10  # km
+DEFAULT_MAX_STATIONS = 5  # stations whose details are fetched per refresh
 DEFAULT_UPDATE_INTERVAL = 60  # minutes (1 hour)
+DEFAULT_MIN_UPDATE_INTERVAL = 15  # minutes, adaptive polling during volatile hours
+DEFAULT_MAX_UPDATE_INTERVAL = 180  # minutes, adaptive polling during quiet hours
+DEFAULT_SENTINEL_MAX_STALENESS = 120  # minutes between full sweeps in sentinel mode
+SENTINEL_STATION_COUNT = 2  # cheapest + runner-up
+SENTINEL_CHECK_INTERVAL = 10  # minutes between sentinel-only checks in sentinel mode
+DEFAULT_REQUEST_BUDGET = 300  # API requests per hour, shared by all entries
+DEFAULT_REQUEST_BURST = 30  # requests that may be sent back to back
+DEFAULT_CRAWLER_BUDGET = 120  # background crawler requests per hour, part of the request budget
+DEFAULT_LATENCY_BUDGET = 0  # seconds for all station details of a refresh, 0 = wait for all
 DEFAULT_PRICE_DROP_THRESHOLD = 0.03  # EUR
 DEFAULT_PRICE_INCREASE_THRESHOLD = 0.03  # EUR
 DEFAULT_DAILY_TIME = "08:00:00"  # Morning notification
 DEFAULT_DAILY_DAYS = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]  # Every day
 DEFAULT_SCHEDULED_UPDATE_TIMES = ["06:00:00", "12:00:00", "18:00:00"]  # 6 AM, 12 PM, 6 PM
+DEFAULT_SCHEDULED_MAX_AGE = 15  # minutes, scheduled updates skip data younger than this
+
+# Scheduled refresh load spreading
+SCHEDULED_UPDATE_MAX_JITTER = 600  # seconds, fixed per installation
+SCHEDULED_COALESCE_WINDOW = 120  # seconds, due refreshes within this window share one fetch
 
 # Attributes
 ATTR_STATION_NAME = "station_name"
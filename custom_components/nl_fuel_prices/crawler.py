@@ -0,0 +1,323 @@
+"""Background crawler that keeps station prices fresh across the whole catalogue."""
+from __future__ import annotations
+
+import asyncio
+import heapq
+import logging
+from dataclasses import dataclass
+from time import monotonic
+from typing import Any
+
+from .api import FuelPriceAPI, FuelPriceAPIError
+from .cache import TTLCache
+from .catalogue import StationCatalogue
+from .const import DEFAULT_CRAWLER_BUDGET
+from .rate_limiter import PRIORITY_BACKGROUND, TokenBucket
+
+_LOGGER = logging.getLogger(__name__)
+
+# Refresh interval of a station inside an entry's radius with stable prices
+CRAWL_BASE_INTERVAL = 3600  # seconds
+CRAWL_MIN_INTERVAL = 900  # seconds, most volatile stations near an entry
+CRAWL_MAX_INTERVAL = 24 * 3600  # seconds, stations far from every entry
+
+# Stations up to this far outside an entry's radius are crawled with an
+# interval growing with the distance; all others at CRAWL_MAX_INTERVAL
+CRAWL_NEAR_MARGIN = 25  # km
+CRAWL_DISTANCE_SCALE = 10  # km outside the radius that doubles the interval
+
+# Up to 1 + CRAWL_VOLATILITY_WEIGHT times faster for stations whose price
+# changed at every previous crawl
+CRAWL_VOLATILITY_WEIGHT = 3
+VOLATILITY_SMOOTHING = 0.3
+
+# Crawled details are served (to callers that accept them) up to this age
+CRAWL_SERVE_MAX_AGE = 2 * CRAWL_BASE_INTERVAL  # seconds
+CRAWL_STORE_SIZE = 10000
+
+# When the budget is short, stations inside an entry's radius get the budget
+# first, but at most this share of it, the rest goes to the stations outside
+CRAWL_INSIDE_SHARE = 0.75
+
+CRAWL_CATALOGUE_REFRESH = 6 * 3600  # seconds
+CRAWL_ERROR_BACKOFF = 60  # seconds
+CRAWL_IDLE_SLEEP = 300  # seconds, upper bound on a single sleep
+
+
+@dataclass(slots=True)
+class CrawlState:
+    """Crawl bookkeeping of one station."""
+
+    interval: float
+    excess_km: float | None = None
+    last_crawled: float | None = None
+    volatility: float = 0.0
+    prices: tuple[float | None, ...] = ()
+
+
+def crawl_interval(excess_km: float | None, volatility: float) -> float:
+    """Return the refresh interval of a station in seconds.
+
+    `excess_km` is how far the station lies outside the nearest entry's
+    radius (0 inside it, None when far from every entry).
+    """
+    if excess_km is None:
+        return CRAWL_MAX_INTERVAL
+    interval = CRAWL_BASE_INTERVAL * (1 + excess_km / CRAWL_DISTANCE_SCALE)
+    interval /= 1 + CRAWL_VOLATILITY_WEIGHT * volatility
+    return min(CRAWL_MAX_INTERVAL, max(CRAWL_MIN_INTERVAL, interval))
+
+
+class StationCrawler:
+    """Keep the detail document of every station fresh in the background.
+
+    Stations wait in a heap ordered by their next due time: last crawl plus
+    an interval that shrinks with the proximity to a configured location and
+    with how often the station's price changed before. Overdue stations are
+    therefore crawled oldest-due first. Requests are paced by the crawler's
+    own hourly budget and go through the shared limiter at background
+    priority, so coordinator refreshes are always served first. When the
+    schedule needs more requests per hour than the budget allows, intervals
+    are stretched so it stays feasible instead of falling ever further
+    behind: stations inside an entry's radius keep their intervals as long
+    as they fit in CRAWL_INSIDE_SHARE of the budget, the stations outside
+    share the rest.
+
+    Every crawl feeds the API's price book, which tells the planner which
+    stations are worth fetching. Crawled details are shared through
+    `api.crawled_details`; coordinators use the ones fetched within their
+    update interval instead of requesting them again.
+    """
+
+    def __init__(self, api: FuelPriceAPI, budget: int = DEFAULT_CRAWLER_BUDGET) -> None:
+        """Initialize the crawler (budget in requests per hour)."""
+        self.api = api
+        self.limiter = TokenBucket(budget, 1)
+        self.store = TTLCache(CRAWL_SERVE_MAX_AGE, maxsize=CRAWL_STORE_SIZE)
+        self._locations: list[tuple[float, float, float]] = []
+        self._catalogue: StationCatalogue | None = None
+        self._catalogue_loaded: float | None = None
+        self._states: dict[int, CrawlState] = {}
+        self._queue: list[tuple[float, float, int]] = []  # (due, interval, station id)
+        self._dirty = True
+        self._wake = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self.demand = 0.0  # requests per hour the unstretched schedule needs
+        self.stretch_inside = 1.0
+        self.stretch_outside = 1.0
+        self.crawled = 0
+        self.changed = 0
+        self.errors = 0
+
+    @property
+    def running(self) -> bool:
+        """Return whether the crawl loop is running."""
+        return self._task is not None and not self._task.done()
+
+    def set_budget(self, budget: int) -> None:
+        """Change the crawler's hourly request budget and re-fit the schedule."""
+        if budget != self.limiter.budget:
+            self.limiter.set_budget(budget, 1)
+            self._dirty = True
+            self._wake.set()
+
+    def set_locations(self, locations: list[tuple[float, float, float]]) -> None:
+        """Set the (latitude, longitude, radius) of all entries and re-prioritize."""
+        if locations != self._locations:
+            self._locations = list(locations)
+            self._dirty = True
+            self._wake.set()
+
+    def start(self, create_task: Any) -> None:
+        """Start the crawl loop with `create_task(coro, name)` and share the store."""
+        if self.running:
+            return
+        self.api.crawled_details = self.store
+        self._task = create_task(self._async_run(), "nl_fuel_prices station crawler")
+
+    async def async_stop(self) -> None:
+        """Stop the crawl loop and stop serving crawled details."""
+        if self.api.crawled_details is self.store:
+            self.api.crawled_details = None
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _async_run(self) -> None:
+        """Crawl due stations forever."""
+        while True:
+            try:
+                await self._async_load_catalogue()
+            except FuelPriceAPIError as err:
+                _LOGGER.debug(f"Crawler could not load the places list: {err}")
+                await self._async_sleep(CRAWL_ERROR_BACKOFF)
+                continue
+
+            if self._dirty:
+                self._rebuild_queue()
+            if not self._queue:
+                await self._async_sleep(CRAWL_IDLE_SLEEP)
+                continue
+
+            due = self._queue[0][0]
+            delay = due - monotonic()
+            if delay > 0:
+                await self._async_sleep(min(delay, CRAWL_IDLE_SLEEP))
+                continue
+
+            await self.limiter.acquire(PRIORITY_BACKGROUND)
+            _, _, station_id = heapq.heappop(self._queue)
+            if not await self._async_crawl(station_id):
+                await self._async_sleep(CRAWL_ERROR_BACKOFF)
+
+    async def _async_sleep(self, seconds: float) -> None:
+        """Sleep, waking up early when the locations change."""
+        self._wake.clear()
+        try:
+            await asyncio.wait_for(self._wake.wait(), seconds)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _async_load_catalogue(self) -> None:
+        """(Re)load the catalogue when missing or older than the refresh period."""
+        if (
+            self._catalogue is not None
+            and monotonic() - self._catalogue_loaded < CRAWL_CATALOGUE_REFRESH
+        ):
+            return
+        catalogue = await self.api.async_get_places()
+        if catalogue is not self._catalogue:
+            self._catalogue = catalogue
+            self._dirty = True
+        self._catalogue_loaded = monotonic()
+
+    def _excess_distances(self) -> dict[int, float]:
+        """Return how far each station near an entry lies outside its radius."""
+        excess: dict[int, float] = {}
+        catalogue = self._catalogue
+        for latitude, longitude, radius in self._locations:
+            for distance, row in catalogue.iter_radius(
+                latitude, longitude, radius + CRAWL_NEAR_MARGIN
+            ):
+                station_id = catalogue.ids[row]
+                outside = max(0.0, distance - radius)
+                if outside < excess.get(station_id, CRAWL_NEAR_MARGIN + 1):
+                    excess[station_id] = outside
+        return excess
+
+    def _rebuild_queue(self) -> None:
+        """Recompute every station's interval and due time."""
+        self._dirty = False
+        if self._catalogue is None:
+            return
+        now = monotonic()
+        excess = self._excess_distances()
+        states: dict[int, CrawlState] = {}
+        for station_id in self._catalogue.ids:
+            state = self._states.get(station_id) or CrawlState(CRAWL_MAX_INTERVAL)
+            state.excess_km = excess.get(station_id)
+            states[station_id] = state
+
+        self._fit_schedule(states.values())
+
+        queue = []
+        for station_id, state in states.items():
+            state.interval = self._interval(state)
+            if state.last_crawled is None:
+                # Never crawled: near stations now, far ones spread out later
+                due = now + state.interval - min(
+                    state.interval, CRAWL_BASE_INTERVAL * self.stretch_inside
+                )
+            else:
+                due = state.last_crawled + state.interval
+            queue.append((due, state.interval, station_id))
+        heapq.heapify(queue)
+        self._states = states
+        self._queue = queue
+        _LOGGER.debug(
+            f"Crawler queue rebuilt: {len(queue)} stations, "
+            f"{len(excess)} near {len(self._locations)} location(s)"
+        )
+
+    def _fit_schedule(self, states: Any) -> None:
+        """Set the interval stretch factors that fit the schedule in the budget."""
+        inside = outside = 0.0
+        for state in states:
+            rate = 3600 / crawl_interval(state.excess_km, state.volatility)
+            if state.excess_km == 0:
+                inside += rate
+            else:
+                outside += rate
+        budget = self.limiter.budget
+        self.demand = inside + outside
+        if self.demand <= budget:
+            self.stretch_inside = self.stretch_outside = 1.0
+            return
+        inside_budget = min(inside, max(budget * CRAWL_INSIDE_SHARE, budget - outside))
+        self.stretch_inside = max(1.0, inside / inside_budget) if inside else 1.0
+        self.stretch_outside = max(1.0, outside / (budget - inside_budget)) if outside else 1.0
+        _LOGGER.info(
+            f"Crawler schedule needs {self.demand:.0f} requests/hour, budget is {budget}; "
+            f"intervals stretched {self.stretch_inside:.1f}x inside the entries' radius "
+            f"and {self.stretch_outside:.1f}x outside"
+        )
+
+    def _interval(self, state: CrawlState) -> float:
+        """Return a station's interval, stretched to fit the budget."""
+        stretch = self.stretch_inside if state.excess_km == 0 else self.stretch_outside
+        return crawl_interval(state.excess_km, state.volatility) * stretch
+
+    async def _async_crawl(self, station_id: int) -> bool:
+        """Fetch one station, update its volatility and schedule it again."""
+        state = self._states[station_id]
+        try:
+            detail = await self.api.async_get_station_detail(station_id, PRIORITY_BACKGROUND)
+        except FuelPriceAPIError as err:
+            self.errors += 1
+            _LOGGER.debug(f"Crawler failed to fetch station {station_id}: {err}")
+            heapq.heappush(
+                self._queue, (monotonic() + CRAWL_ERROR_BACKOFF, state.interval, station_id)
+            )
+            return False
+
+        now = monotonic()
+        self.crawled += 1
+        prices = self.api.station_prices(detail) if detail is not None else ()
+        if state.last_crawled is not None:
+            changed = prices != state.prices
+            self.changed += changed
+            state.volatility += VOLATILITY_SMOOTHING * (changed - state.volatility)
+        state.prices = prices
+        state.last_crawled = now
+        state.interval = self._interval(state)
+        heapq.heappush(self._queue, (now + state.interval, state.interval, station_id))
+        return True
+
+    def stats(self) -> dict[str, Any]:
+        """Return crawler statistics."""
+        now = monotonic()
+        fresh = sum(
+            1 for state in self._states.values()
+            if state.last_crawled is not None and now - state.last_crawled <= state.interval
+        )
+        return {
+            "running": self.running,
+            "budget": self.limiter.budget,
+            "demand_per_hour": round(self.demand, 1),
+            "stretch_inside": round(self.stretch_inside, 2),
+            "stretch_outside": round(self.stretch_outside, 2),
+            "stations": len(self._states),
+            "fresh": fresh,
+            "coverage": round(fresh / len(self._states), 3) if self._states else None,
+            "queued": len(self._queue),
+            "overdue": sum(1 for due, _, _ in self._queue if due <= now),
+            "crawled": self.crawled,
+            "price_changes": self.changed,
+            "errors": self.errors,
+            "store": self.store.stats(),
+        }
@@ -6,7 +6,7 @@ from datetime import datetime, timedelta, time as dt_time
 from typing import Any
 
 from homeassistant.core import HomeAssistant, callback
-from homeassistant.helpers.event import async_track_time_change
+from homeassistant.helpers.storage import Store
 from homeassistant.util import dt as dt_util
 
 from .const import (
@@ -19,41 +19,88 @@ from .const import (
     DEFAULT_DAILY_TIME,
     DEFAULT_DAILY_DAYS,
 )
+from .delivery_stats import DeliveryStats
+from .models import StationPrice
+from .scheduler import FuelPriceScheduler, JOB_DAILY_REPORT, parse_time_of_day
 
 _LOGGER = logging.getLogger(__name__)
 
+# Price history survives restarts so adaptive polling and the week-ago
+# comparison don't start from scratch
+STORAGE_VERSION = 1
+STORAGE_KEY = f"{DOMAIN}.price_history"
+STORAGE_SAVE_DELAY = 60  # seconds
+HISTORY_DAYS = 30
+
 
 class DailyNotificationManager:
     """Manage daily fuel price notifications."""
 
-    def __init__(self, hass: HomeAssistant) -> None:
+    def __init__(self, hass: HomeAssistant, scheduler: FuelPriceScheduler) -> None:
         """Initialize notification manager."""
         self.hass = hass
+        self._scheduler = scheduler
         self._price_history: dict[str, list[dict[str, Any]]] = {}
-        self._cancel_trackers: dict[str, Any] = {}  # Track cancellers per entry
+        self._store: Store = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self.delivery = DeliveryStats()
+
+    async def async_load(self) -> None:
+        """Load the price history stored before the last restart."""
+        stored = await self._store.async_load() or {}
+        cutoff = dt_util.now() - timedelta(days=HISTORY_DAYS)
+        for entry_id, samples in stored.items():
+            history = []
+            for sample in samples:
+                timestamp = dt_util.parse_datetime(sample.get("timestamp") or "")
+                if timestamp is None or timestamp <= cutoff:
+                    continue
+                history.append({**sample, "timestamp": timestamp})
+            if history:
+                self._price_history[entry_id] = history
+        _LOGGER.debug(
+            f"Loaded price history of {len(self._price_history)} entr(y/ies) from storage"
+        )
+
+    @callback
+    def _data_to_save(self) -> dict[str, list[dict[str, Any]]]:
+        """Return the price history in its stored form."""
+        return {
+            entry_id: [
+                {**sample, "timestamp": sample["timestamp"].isoformat()}
+                for sample in history
+            ]
+            for entry_id, history in self._price_history.items()
+        }
+
+    def _append_sample(self, entry_id: str, sample: dict[str, Any]) -> list[dict[str, Any]]:
+        """Add a sample, drop samples older than the history window and save."""
+        cutoff = sample["timestamp"] - timedelta(days=HISTORY_DAYS)
+        history = [
+            h for h in self._price_history.get(entry_id, []) if h["timestamp"] > cutoff
+        ]
+        history.append(sample)
+        self._price_history[entry_id] = history
+        self._store.async_delay_save(self._data_to_save, STORAGE_SAVE_DELAY)
+        return history
 
     async def setup(self, config_entry) -> None:
         """Set up daily notifications."""
         entry_id = config_entry.entry_id
         
+        # Drop any existing job for this entry (for reload scenarios)
+        self.unload(entry_id)
+
         if not config_entry.data.get(CONF_DAILY_NOTIFICATION, False):
             _LOGGER.info(f"Daily notifications disabled for entry {entry_id}")
             return
 
-        # Cancel existing tracker for this entry if it exists (for reload scenarios)
-        if entry_id in self._cancel_trackers:
-            _LOGGER.info(f"Cancelling existing notification tracker for entry {entry_id}")
-            self._cancel_trackers[entry_id]()
-            del self._cancel_trackers[entry_id]
-
         notification_time = config_entry.data.get(
             CONF_DAILY_NOTIFICATION_TIME, DEFAULT_DAILY_TIME
         )
         
         # Parse time string (HH:MM:SS)
-        try:
-            hour, minute, second = map(int, notification_time.split(":"))
-        except ValueError:
+        at = parse_time_of_day(notification_time)
+        if at is None:
             _LOGGER.error(f"Invalid notification time: {notification_time}")
             return
 
@@ -62,22 +109,24 @@ class DailyNotificationManager:
             """Callback that sends notification for specific entry."""
             await self._send_entry_notification(now, entry_id)
 
-        cancel_tracker = async_track_time_change(
-            self.hass,
+        self._scheduler.async_add_job(
+            f"{entry_id}_daily",
+            JOB_DAILY_REPORT,
+            entry_id,
+            at,
             entry_notification_callback,
-            hour=hour,
-            minute=minute,
-            second=second,
         )
 
-        self._cancel_trackers[entry_id] = cancel_tracker
-
         _LOGGER.info(f"Daily fuel price notification scheduled for {notification_time} (entry: {entry_id})")
 
+    def unload(self, entry_id: str) -> None:
+        """Cancel the daily notification job for an entry."""
+        self._scheduler.async_remove_entry_jobs(entry_id, JOB_DAILY_REPORT)
+
     async def _send_entry_notification(self, now: datetime, entry_id: str) -> None:
         """Send daily fuel price report for a specific entry.
 
-        This method is called by the entry-specific time tracker callback.
+        This method is called by the entry-specific scheduler job.
         It only processes the single entry that triggered the callback,
         preventing duplicate notifications when multiple entries have the same time.
         """
@@ -241,9 +290,9 @@ class DailyNotificationManager:
 
     async def _build_daily_message(
         self,
-        cheapest: dict[str, Any],
+        cheapest: StationPrice,
         price_week_ago: float | None,
-        all_stations: list[dict[str, Any]],
+        all_stations: list[StationPrice],
         config_entry,
     ) -> str:
         """Build daily notification message."""
@@ -256,13 +305,13 @@ class DailyNotificationManager:
         
         # Cheapest station
         message += f"🏆 Cheapest Station:\n"
-        message += f"{cheapest.get('name')} - €{cheapest.get('price'):.3f}/L\n"
-        message += f"📍 {cheapest.get('distance')}km away\n"
-        message += f"📮 {cheapest.get('address', 'N/A')}\n"
+        message += f"{cheapest.name} - €{cheapest.price:.3f}/L\n"
+        message += f"📍 {cheapest.distance}km away\n"
+        message += f"📮 {cheapest.address or 'N/A'}\n"
         
         # Station type and services
-        is_unmanned = cheapest.get('is_unmanned', False)
-        has_shop = cheapest.get('has_shop', False)
+        is_unmanned = cheapest.is_unmanned
+        has_shop = cheapest.has_shop
         
         if is_unmanned:
             message += f"🤖 Unmanned station\n"
@@ -271,7 +320,7 @@ class DailyNotificationManager:
         
         if has_shop:
             message += f"🏪 Shop available\n"
-            shop_hours = cheapest.get('shop_hours')
+            shop_hours = cheapest.shop_hours
             if shop_hours:
                 # Show today's shop hours
                 from datetime import datetime
@@ -287,7 +336,7 @@ class DailyNotificationManager:
         
         # Week comparison
         if price_week_ago is not None:
-            price_change = cheapest.get('price') - price_week_ago
+            price_change = cheapest.price - price_week_ago
             if abs(price_change) < 0.001:
                 change_text = "No change"
                 emoji = "➡️"
@@ -305,11 +354,11 @@ class DailyNotificationManager:
         if len(all_stations) > 1:
             message += "💰 Top 3 Cheapest:\n\n"
             for idx, station in enumerate(all_stations[:3], 1):
-                message += f"{idx}. {station.get('name')} - €{station.get('price'):.3f} ({station.get('distance')}km)\n"
+                message += f"{idx}. {station.name} - €{station.price:.3f} ({station.distance}km)\n"
                 
                 # Add station type and services
-                is_unmanned = station.get('is_unmanned', False)
-                has_shop = station.get('has_shop', False)
+                is_unmanned = station.is_unmanned
+                has_shop = station.has_shop
                 
                 if is_unmanned:
                     message += f"   🤖 Unmanned"
@@ -318,7 +367,7 @@ class DailyNotificationManager:
                 
                 if has_shop:
                     message += f" | 🏪 Shop"
-                    shop_hours = station.get('shop_hours')
+                    shop_hours = station.shop_hours
                     if shop_hours:
                         from datetime import datetime
                         day_names = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
@@ -335,36 +384,24 @@ class DailyNotificationManager:
         
         # Price range
         if len(all_stations) > 1:
-            most_expensive = max(all_stations, key=lambda x: x.get('price', 0))
-            price_diff = most_expensive.get('price') - cheapest.get('price')
+            most_expensive = max(all_stations, key=lambda x: x.price)
+            price_diff = most_expensive.price - cheapest.price
             message += f"💸 Price Range: €{price_diff:.3f} difference\n"
-            message += f"   Cheapest: €{cheapest.get('price'):.3f}\n"
-            message += f"   Most expensive: €{most_expensive.get('price'):.3f}\n"
+            message += f"   Cheapest: €{cheapest.price:.3f}\n"
+            message += f"   Most expensive: €{most_expensive.price:.3f}\n"
         
         return message
 
-    async def _get_price_week_ago(self, entry_id: str, current_station: dict[str, Any]) -> float | None:
+    async def _get_price_week_ago(self, entry_id: str, current_station: StationPrice) -> float | None:
         """Get price from a week ago for comparison."""
-        # Initialize history if needed
-        if entry_id not in self._price_history:
-            self._price_history[entry_id] = []
-        
-        history = self._price_history[entry_id]
-        
-        # Add current price to history
+        # Add current price to history, keeping only the last 30 days
         now = dt_util.now()
-        history.append({
+        history = self._append_sample(entry_id, {
             "timestamp": now,
-            "price": current_station.get("price"),
-            "station_id": current_station.get("id"),
+            "price": current_station.price,
+            "station_id": current_station.id,
         })
         
-        # Keep only last 30 days of history
-        cutoff = now - timedelta(days=30)
-        self._price_history[entry_id] = [
-            h for h in history if h["timestamp"] > cutoff
-        ]
-        
         # Find price from approximately a week ago
         week_ago = now - timedelta(days=7)
         
@@ -388,8 +425,8 @@ class DailyNotificationManager:
         services: list[str],
         title: str,
         message: str,
-        cheapest_station: dict[str, Any] | None = None,
-        top_stations: list[dict[str, Any]] | None = None,
+        cheapest_station: StationPrice | None = None,
+        top_stations: list[StationPrice] | None = None,
     ) -> None:
         """Send notification to all configured services with Telegram enhancements."""
         for service in services:
@@ -426,15 +463,17 @@ class DailyNotificationManager:
                         notification_data,
                     )
                     _LOGGER.info(f"Sent daily report via {service}")
+                self.delivery.record(service)
             except Exception as err:
+                self.delivery.record(service, err)
                 _LOGGER.error(f"Failed to send notification via {service}: {err}")
     
     async def _send_telegram_bot_notification(
         self,
         title: str,
         message: str,
-        cheapest_station: dict[str, Any] | None = None,
-        top_stations: list[dict[str, Any]] | None = None,
+        cheapest_station: StationPrice | None = None,
+        top_stations: list[StationPrice] | None = None,
     ) -> None:
         """Send notification using telegram_bot.send_message service."""
         # Format message with HTML
@@ -447,8 +486,8 @@ class DailyNotificationManager:
         # Build inline keyboard
         inline_keyboard = None
         if cheapest_station:
-            lat = cheapest_station.get("latitude")
-            lon = cheapest_station.get("longitude")
+            lat = cheapest_station.latitude
+            lon = cheapest_station.longitude
             if lat and lon:
                 inline_keyboard = [
                     [["🗺️ Open in Google Maps", f"https://www.google.com/maps/search/?api=1&query={lat},{lon}"]],
@@ -474,8 +513,8 @@ class DailyNotificationManager:
         
         # Send location separately for better map display
         if cheapest_station:
-            lat = cheapest_station.get("latitude")
-            lon = cheapest_station.get("longitude")
+            lat = cheapest_station.latitude
+            lon = cheapest_station.longitude
             if lat and lon:
                 await self.hass.services.async_call(
                     "telegram_bot",
@@ -494,8 +533,8 @@ class DailyNotificationManager:
         service: str,
         title: str,
         message: str,
-        cheapest_station: dict[str, Any] | None = None,
-        top_stations: list[dict[str, Any]] | None = None,
+        cheapest_station: StationPrice | None = None,
+        top_stations: list[StationPrice] | None = None,
     ) -> None:
         """Send notification using notify.telegram service."""
         notification_data = {
@@ -515,8 +554,8 @@ class DailyNotificationManager:
         
         # Add location and inline keyboard if available
         if cheapest_station:
-            lat = cheapest_station.get("latitude")
-            lon = cheapest_station.get("longitude")
+            lat = cheapest_station.latitude
+            lon = cheapest_station.longitude
             if lat and lon:
                 # Send location as separate message
                 await self.hass.services.async_call(
@@ -567,8 +606,8 @@ class DailyNotificationManager:
     def _format_html_daily_message(
         self,
         message: str,
-        cheapest_station: dict[str, Any],
-        top_stations: list[dict[str, Any]] | None,
+        cheapest_station: StationPrice,
+        top_stations: list[StationPrice] | None,
     ) -> str:
         """Format daily message with HTML for Telegram."""
         lines = message.split('\n')
@@ -597,7 +636,7 @@ class DailyNotificationManager:
 
     async def _fire_daily_report_event(
         self,
-        cheapest: dict[str, Any],
+        cheapest: StationPrice,
         price_week_ago: float | None,
         data: dict[str, Any],
         config_entry,
@@ -606,24 +645,24 @@ class DailyNotificationManager:
         event_data = {
             "fuel_type": config_entry.data.get("fuel_type"),
             "location": config_entry.data.get("location_name"),
-            "cheapest_station": cheapest.get("name"),
-            "cheapest_price": cheapest.get("price"),
-            "cheapest_distance": cheapest.get("distance"),
+            "cheapest_station": cheapest.name,
+            "cheapest_price": cheapest.price,
+            "cheapest_distance": cheapest.distance,
             "total_stations": data.get("total_stations", 0),
         }
         
         if price_week_ago is not None:
             event_data["price_week_ago"] = price_week_ago
-            event_data["price_change_week"] = cheapest.get("price") - price_week_ago
+            event_data["price_change_week"] = cheapest.price - price_week_ago
         
         # Add top 3 stations
         stations = data.get("stations", [])
         if stations:
             event_data["top_3"] = [
                 {
-                    "name": s.get("name"),
-                    "price": s.get("price"),
-                    "distance": s.get("distance"),
+                    "name": s.name,
+                    "price": s.price,
+                    "distance": s.distance,
                 }
                 for s in stations[:3]
             ]
@@ -641,14 +680,11 @@ class DailyNotificationManager:
         minutes = time_int % 100
         return f"{hours:02d}:{minutes:02d}"
 
-    async def store_current_price(self, entry_id: str, station: dict[str, Any]) -> None:
+    async def store_current_price(self, entry_id: str, station: StationPrice) -> None:
         """Store current price for historical tracking."""
-        if entry_id not in self._price_history:
-            self._price_history[entry_id] = []
-        
         # Don't duplicate if we just added this
         now = dt_util.now()
-        history = self._price_history[entry_id]
+        history = self._price_history.get(entry_id)
         
         # Only add if last entry was more than 1 hour ago
         if history:
@@ -656,14 +692,18 @@ class DailyNotificationManager:
             if (now - last_entry["timestamp"]).total_seconds() < 3600:
                 return
         
-        history.append({
+        self._append_sample(entry_id, {
             "timestamp": now,
-            "price": station.get("price"),
-            "station_id": station.get("id"),
+            "price": station.price,
+            "station_id": station.id,
         })
 
+    def get_price_history(self, entry_id: str) -> list[dict[str, Any]]:
+        """Return stored price history for an entry (oldest first)."""
+        return list(self._price_history.get(entry_id, []))
+
     def shutdown(self) -> None:
         """Clean up resources."""
-        for entry_id, cancel_tracker in self._cancel_trackers.items():
-            cancel_tracker()
-        self._cancel_trackers.clear()
+        for job in self._scheduler.get_jobs():
+            if job.kind == JOB_DAILY_REPORT:
+                self._scheduler.async_remove_job(job.job_id)
@@ -0,0 +1,43 @@
+"""Delivery statistics of the notification managers."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.util import dt as dt_util
+
+
+class DeliveryStats:
+    """Count queued and failed notifications per notify service.
+
+    Notifications are sent with non-blocking service calls, so a call that
+    returns only means the notification was queued; delivery failures inside
+    the notify service are not seen here. Failures are calls that raised
+    (unknown service, invalid data).
+    """
+
+    def __init__(self) -> None:
+        """Initialize empty counters."""
+        self._services: dict[str, dict[str, Any]] = {}
+
+    def record(self, service: str, error: Exception | None = None) -> None:
+        """Record one notification queued for `service`, or its failure."""
+        stats = self._services.setdefault(
+            service,
+            {"queued": 0, "failed": 0, "last_queued": None, "last_failure": None, "last_error": None},
+        )
+        now = dt_util.utcnow().isoformat()
+        if error is None:
+            stats["queued"] += 1
+            stats["last_queued"] = now
+        else:
+            stats["failed"] += 1
+            stats["last_failure"] = now
+            stats["last_error"] = str(error)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the totals and the counters per service."""
+        return {
+            "queued": sum(stats["queued"] for stats in self._services.values()),
+            "failed": sum(stats["failed"] for stats in self._services.values()),
+            "services": {service: dict(stats) for service, stats in self._services.items()},
+        }
@@ -0,0 +1,101 @@
+"""Diagnostics support for Dutch Fuel Prices."""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import CONF_LOCATION_LAT, CONF_LOCATION_LON, DOMAIN
+from .scheduler import ScheduledJob
+
+if TYPE_CHECKING:
+    from . import FuelPriceCoordinator
+
+# Everything that pinpoints the configured location
+TO_REDACT = {CONF_LOCATION_LAT, CONF_LOCATION_LON, "postcode"}
+
+
+def _coordinator_as_dict(coordinator: FuelPriceCoordinator | None) -> dict[str, Any] | None:
+    """Return the state of an entry's coordinator, or None when it is not loaded."""
+    if coordinator is None:
+        return None
+    data = coordinator.data or {}
+    return {
+        "last_update_success": coordinator.last_update_success,
+        "last_refresh": coordinator.last_refresh.isoformat() if coordinator.last_refresh else None,
+        "update_interval": (
+            coordinator.update_interval.total_seconds() if coordinator.update_interval else None
+        ),
+        "total_stations": data.get("total_stations"),
+        "last_refresh_requests": data.get("requests"),
+        "full_sweep": data.get("full_sweep"),
+        "stale": data.get("stale"),
+        "stale_since": data.get("stale_since"),
+        "stage_timings_ms": coordinator.stage_timings.stats(),
+    }
+
+
+def _job_as_dict(job: ScheduledJob) -> dict[str, Any]:
+    """Return a scheduled job without its callback."""
+    return {
+        "job_id": job.job_id,
+        "kind": job.kind,
+        "entry_id": job.entry_id,
+        "at": job.at.isoformat(),
+        "offset": job.offset.total_seconds(),
+        "next_run": job.next_run.isoformat() if job.next_run else None,
+    }
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry.
+
+    An entry that failed to load or is unloaded has no coordinator; its
+    payload then holds the entry and whatever shared services exist.
+    """
+    shared = hass.data.get(DOMAIN, {})
+    coordinator: FuelPriceCoordinator | None = shared.get(entry.entry_id)
+    api = shared.get("api")
+
+    scheduler = shared.get("scheduler")
+    crawler = shared.get("crawler")
+    daily_manager = shared.get("daily_manager")
+    price_change_manager = shared.get("price_change_manager")
+
+    return {
+        "entry": {
+            "title": entry.title,
+            "data": async_redact_data(dict(entry.data), TO_REDACT),
+            "options": async_redact_data(dict(entry.options), TO_REDACT),
+        },
+        "coordinator": _coordinator_as_dict(coordinator),
+        "api": {
+            "base_url": api.base_url,
+            "catalogue": api.catalogue_stats(),
+            "cache": api.cache_stats(),
+            "requests": dict(api.request_counts),
+            "latency_histograms": api.transport.latency_histograms(),
+            "transport": api.transport.stats(),
+            "decoding": api.decode_stats(),
+            "hedged_requests": api.hedged_requests,
+            "hedge_wins": api.hedge_wins,
+            "coalesced_requests": api.coalesced_requests,
+            "price_book_stations": len(api.price_book),
+        } if api else None,
+        "rate_limiter": api.limiter.stats() if api else None,
+        "circuit_breaker": api.breaker.stats() if api else None,
+        "scheduler": {
+            **scheduler.as_dict(),
+            "queue": [_job_as_dict(job) for job in scheduler.get_jobs()],
+        } if scheduler else None,
+        "scheduled_wave": shared.get("scheduled_wave"),
+        "crawler": crawler.stats() if crawler else None,
+        "notifications": {
+            "daily_report": daily_manager.delivery.as_dict() if daily_manager else None,
+            "price_change": price_change_manager.delivery.as_dict() if price_change_manager else None,
+        },
+    }
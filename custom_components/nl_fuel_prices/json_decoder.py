@@ -0,0 +1,34 @@
+"""JSON decoder selection for DirectLease payloads."""
+from __future__ import annotations
+
+import json
+import logging
+from typing import Any, Callable
+
+_LOGGER = logging.getLogger(__name__)
+
+# Payloads at least this large are decoded in the executor when one is given
+DECODE_OFFLOAD_THRESHOLD = 256 * 1024  # bytes
+
+
+def _select_decoder() -> tuple[str, Callable[[bytes], Any]]:
+    """Return the fastest available JSON decoder (orjson, ujson, stdlib json)."""
+    try:
+        import orjson
+    except ImportError:
+        pass
+    else:
+        return "orjson", orjson.loads
+
+    try:
+        import ujson
+    except ImportError:
+        pass
+    else:
+        return "ujson", ujson.loads
+
+    return "json", json.loads
+
+
+JSON_DECODER, json_loads = _select_decoder()
+_LOGGER.debug(f"Using {JSON_DECODER} to decode DirectLease responses")
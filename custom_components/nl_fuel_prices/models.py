@@ -0,0 +1,59 @@
+"""Station records for Dutch Fuel Prices."""
+from __future__ import annotations
+
+from dataclasses import dataclass, field, fields
+from typing import Any
+
+from .const import DEFAULT_MAX_STATIONS
+
+
+@dataclass(slots=True, frozen=True)
+class FuelPriceQuery:
+    """One location and fuel type of a bulk price query."""
+
+    latitude: float
+    longitude: float
+    radius: float
+    fuel_type: str
+    max_stations: int = DEFAULT_MAX_STATIONS
+
+
+@dataclass(slots=True)
+class Station:
+    """A station from the national places list, with its distance to a location."""
+
+    id: Any
+    latitude: float
+    longitude: float
+    distance: float
+    brand: str = "Unknown"
+    city: str = ""
+
+
+@dataclass(slots=True)
+class StationPrice:
+    """A station with its current price for one fuel type."""
+
+    id: str
+    name: str
+    brand: str
+    address: str
+    latitude: float
+    longitude: float
+    fuel_type: str
+    price: float
+    opening_hours: str
+    last_updated: str
+    distance: float
+    services: list[str] = field(default_factory=list)
+    is_unmanned: bool = False
+    has_shop: bool = False
+    shop_hours: dict[str, Any] | None = None
+    rank: int = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the station as a plain dict (for state attributes and events)."""
+        return {name: getattr(self, name) for name in _STATION_PRICE_FIELDS}
+
+
+_STATION_PRICE_FIELDS = tuple(item.name for item in fields(StationPrice))
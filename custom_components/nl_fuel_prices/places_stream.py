@@ -0,0 +1,124 @@
+"""Incremental parser for the DirectLease national places list."""
+from __future__ import annotations
+
+import codecs
+import json
+from typing import Any, Callable
+
+# Fields of a place kept for the radius search; everything else is dropped
+PLACE_FIELDS = ("id", "lat", "lng", "brand", "city")
+
+DEFAULT_CHUNK_SIZE = 65536
+
+_WHITESPACE = " \t\n\r"
+
+
+class PlacesStreamParser:
+    """Decode a JSON array of place objects chunk by chunk.
+
+    Only the current chunk and at most one incomplete object are buffered;
+    every complete object is decoded with `json.JSONDecoder.raw_decode`,
+    reduced to PLACE_FIELDS and the full object is released right away. This
+    avoids holding the raw body, the decoded text and the full list of
+    complete objects in memory at the same time.
+
+    With a `sink`, each decoded place is handed to it instead of being
+    collected in `places`.
+    """
+
+    def __init__(
+        self,
+        fields: tuple[str, ...] = PLACE_FIELDS,
+        sink: Callable[[dict[str, Any]], None] | None = None,
+    ) -> None:
+        """Initialize the parser."""
+        self.fields = fields
+        self.sink = sink
+        self.places: list[dict[str, Any]] = []
+        self.skipped = 0
+        self._decoder = json.JSONDecoder()
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._started = False
+        self._finished = False
+
+    def feed(self, chunk: bytes) -> None:
+        """Consume a chunk of the response body."""
+        self._buffer += self._text.decode(chunk)
+        self._parse(final=False)
+
+    def close(self) -> list[dict[str, Any]]:
+        """Finish parsing and return the trimmed places.
+
+        Raises ValueError when the body is not a complete JSON array.
+        """
+        self._buffer += self._text.decode(b"", final=True)
+        self._parse(final=True)
+        if not self._finished:
+            raise ValueError("incomplete places list")
+        if self._buffer.strip(_WHITESPACE):
+            raise ValueError("unexpected data after places list")
+        return self.places
+
+    def _parse(self, final: bool) -> None:
+        """Decode every complete value currently in the buffer.
+
+        Before the final chunk a decode error means the value is cut off at
+        the end of the buffer; decoding is retried once more data arrived.
+        """
+        buffer = self._buffer
+        pos = _skip_whitespace(buffer, 0)
+
+        if not self._started:
+            if pos >= len(buffer):
+                self._buffer = ""
+                return
+            if buffer[pos] != "[":
+                raise ValueError("places list is not a JSON array")
+            self._started = True
+            pos += 1
+
+        while not self._finished:
+            pos = _skip_whitespace(buffer, pos)
+            if pos >= len(buffer):
+                break
+            char = buffer[pos]
+            if char == "]":
+                self._finished = True
+                pos += 1
+                break
+            if char == ",":
+                pos += 1
+                continue
+            try:
+                item, end = self._decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError as err:
+                if not final:
+                    break
+                raise ValueError(f"invalid places list: {err}") from err
+            if end == len(buffer) and not final and not isinstance(item, (dict, list)):
+                # A scalar may continue in the next chunk
+                break
+            pos = end
+            self._add(item)
+
+        self._buffer = buffer[pos:]
+
+    def _add(self, item: Any) -> None:
+        """Keep the indexed fields of one place."""
+        if not isinstance(item, dict):
+            self.skipped += 1
+            return
+        if self.sink is not None:
+            self.sink(item)
+            return
+        self.places.append({key: item[key] for key in self.fields if key in item})
+
+
+def _skip_whitespace(buffer: str, pos: int) -> int:
+    """Return the first non-whitespace position at or after `pos`."""
+    length = len(buffer)
+    while pos < length and buffer[pos] in _WHITESPACE:
+        pos += 1
+    return pos
+
@@ -0,0 +1,101 @@
+"""Choose which stations get a detail request during a refresh."""
+from __future__ import annotations
+
+import heapq
+import math
+from time import time
+
+from .catalogue import StationCatalogue
+
+# Share of the detail requests spent on stations without a (recent) known price
+EXPLORATION_SHARE = 0.4
+
+# Known prices older than this are treated as unknown
+PRICE_MAX_AGE = 24 * 3600  # seconds
+
+
+class PriceBook:
+    """Last observed price per fuel type and station, from any detail document."""
+
+    def __init__(self, max_age: float = PRICE_MAX_AGE) -> None:
+        """Initialize an empty price book."""
+        self.max_age = max_age
+        self._prices: dict[str, dict[int, tuple[float, float]]] = {}
+
+    def record(self, fuel_type: str, station_id: int, price: float, observed: float | None = None) -> None:
+        """Store the price of a station for a fuel type."""
+        self._prices.setdefault(fuel_type, {})[station_id] = (
+            price,
+            time() if observed is None else observed,
+        )
+
+    def get(self, fuel_type: str, station_id: int) -> tuple[float, float] | None:
+        """Return (price, observed timestamp) if known and not too old."""
+        entry = self._prices.get(fuel_type, {}).get(station_id)
+        if entry is None or time() - entry[1] > self.max_age:
+            return None
+        return entry
+
+    def known(self, fuel_type: str) -> dict[int, tuple[float, float]]:
+        """Return all recorded prices for a fuel type (including expired ones)."""
+        return self._prices.get(fuel_type, {})
+
+    def __len__(self) -> int:
+        """Return the number of recorded (fuel type, station) prices."""
+        return sum(len(prices) for prices in self._prices.values())
+
+
+def exploration_slots(count: int, share: float = EXPLORATION_SHARE) -> int:
+    """Return how many of `count` requests go to exploration (at least one exploits)."""
+    if count <= 1:
+        return 0
+    return min(count - 1, max(1, math.floor(count * share + 0.5)))
+
+
+def plan_candidates(
+    catalogue: StationCatalogue,
+    matches: list[tuple[float, int]],
+    prices: PriceBook,
+    fuel_type: str,
+    count: int,
+    share: float = EXPLORATION_SHARE,
+) -> list[tuple[float, int]]:
+    """Return (distance, row) of the stations to fetch details for.
+
+    Stations with a recent known price are ranked by that price (then
+    distance); they fill all but the exploration slots. Exploration slots go
+    to the nearest stations without a known price and, once every station in
+    the radius has been seen, to the stations with the oldest price. Without
+    any known price this is exactly the `count` nearest stations.
+    """
+    known: list[tuple[float, float, int, float]] = []
+    unknown: list[tuple[float, int]] = []
+    for distance, row in matches:
+        entry = prices.get(fuel_type, catalogue.ids[row])
+        if entry is None:
+            unknown.append((distance, row))
+        else:
+            known.append((entry[0], distance, row, entry[1]))
+
+    if not known:
+        return heapq.nsmallest(count, unknown)
+
+    exploit = heapq.nsmallest(count - exploration_slots(count, share), known)
+    chosen = [(distance, row) for _, distance, row, _ in exploit]
+
+    # Remaining slots: nearest unseen stations first, then the stalest prices
+    remaining = count - len(chosen)
+    explore = heapq.nsmallest(remaining, unknown)
+    if len(explore) < remaining:
+        exploited = {row for _, row in chosen}
+        stale = heapq.nsmallest(
+            remaining - len(explore),
+            (
+                (observed, distance, row)
+                for _, distance, row, observed in known
+                if row not in exploited
+            ),
+        )
+        explore.extend((distance, row) for _, distance, row in stale)
+
+    return chosen + explore
@@ -2,7 +2,6 @@
 from __future__ import annotations
 
 import logging
-from typing import Any
 
 from homeassistant.core import HomeAssistant
 from homeassistant.config_entries import ConfigEntry
@@ -15,6 +14,8 @@ from .const import (
     CONF_PRICE_INCREASE_THRESHOLD,
     FUEL_TYPES,
 )
+from .delivery_stats import DeliveryStats
+from .models import StationPrice
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -26,12 +27,13 @@ class PriceChangeNotificationManager:
         """Initialize the price change notification manager."""
         self.hass = hass
         self._previous_prices: dict[str, float] = {}
+        self.delivery = DeliveryStats()
 
     async def check_and_notify(
         self,
         entry: ConfigEntry,
         current_price: float,
-        station_data: dict[str, Any],
+        station_data: StationPrice,
     ) -> None:
         """Check for price changes and send notifications if thresholds are exceeded."""
         if not entry.data.get(CONF_NOTIFY_ON_CHANGE, False):
@@ -56,7 +58,7 @@ class PriceChangeNotificationManager:
         fuel_type = entry.data.get("fuel_type", "euro95")
         fuel_name = FUEL_TYPES.get(fuel_type, fuel_type)
         location_name = entry.data.get("location_name", "Unknown")
-        station_name = station_data.get("name", "Unknown")
+        station_name = station_data.name
 
         if price_change <= -drop_threshold:
             await self._send_notification(
@@ -97,7 +99,7 @@ class PriceChangeNotificationManager:
         services: list[str],
         title: str,
         message: str,
-        station_data: dict[str, Any] | None = None,
+        station_data: StationPrice | None = None,
     ) -> None:
         """Send notification to all configured services with Telegram enhancements."""
         for service in services:
@@ -130,14 +132,16 @@ class PriceChangeNotificationManager:
                         notification_data,
                         blocking=False,
                     )
+                self.delivery.record(service)
             except Exception as err:
+                self.delivery.record(service, err)
                 _LOGGER.error("Failed to send notification to %s: %s", service, err)
     
     async def _send_telegram_bot_notification(
         self,
         title: str,
         message: str,
-        station_data: dict[str, Any] | None = None,
+        station_data: StationPrice | None = None,
     ) -> None:
         """Send notification using telegram_bot.send_message service."""
         # Format message with HTML
@@ -146,8 +150,8 @@ class PriceChangeNotificationManager:
         # Build inline keyboard
         inline_keyboard = None
         if station_data:
-            lat = station_data.get("latitude")
-            lon = station_data.get("longitude")
+            lat = station_data.latitude
+            lon = station_data.longitude
             if lat and lon:
                 inline_keyboard = [
                     [["🗺️ Open in Google Maps", f"https://www.google.com/maps/search/?api=1&query={lat},{lon}"]],
@@ -172,8 +176,8 @@ class PriceChangeNotificationManager:
         
         # Send location separately for better map display
         if station_data:
-            lat = station_data.get("latitude")
-            lon = station_data.get("longitude")
+            lat = station_data.latitude
+            lon = station_data.longitude
             if lat and lon:
                 await self.hass.services.async_call(
                     "telegram_bot",
@@ -190,7 +194,7 @@ class PriceChangeNotificationManager:
         service: str,
         title: str,
         message: str,
-        station_data: dict[str, Any] | None = None,
+        station_data: StationPrice | None = None,
     ) -> None:
         """Send notification using notify.telegram service."""
         notification_data = {
@@ -203,8 +207,8 @@ class PriceChangeNotificationManager:
         
         # Add location and inline keyboard if available
         if station_data:
-            lat = station_data.get("latitude")
-            lon = station_data.get("longitude")
+            lat = station_data.latitude
+            lon = station_data.longitude
             if lat and lon:
                 # Send location separately for better map display
                 await self.hass.services.async_call(
@@ -245,15 +249,15 @@ class PriceChangeNotificationManager:
             blocking=False,
         )
 
-    def _format_html_message(self, message: str, station_data: dict[str, Any] | None) -> str:
+    def _format_html_message(self, message: str, station_data: StationPrice | None) -> str:
         """Format message with HTML for Telegram."""
         if not station_data:
             return message
         
-        station_name = station_data.get("name", "Unknown")
-        price = station_data.get("price", 0)
-        distance = station_data.get("distance", 0)
-        address = station_data.get("address", "")
+        station_name = station_data.name
+        price = station_data.price
+        distance = station_data.distance
+        address = station_data.address
         
         # HTML formatted message
         html_msg = f"<b>{message.split('at')[0]}</b>\n\n"
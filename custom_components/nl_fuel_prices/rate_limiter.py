@@ -0,0 +1,176 @@
+"""Integration-wide request rate limiting for the DirectLease API."""
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+from collections import deque
+from dataclasses import dataclass
+from time import monotonic
+from typing import Any
+
+_LOGGER = logging.getLogger(__name__)
+
+# Request priorities, lower is served first
+PRIORITY_CHEAPEST = 0  # re-checking the current cheapest stations
+PRIORITY_CATALOGUE = 1  # national places list
+PRIORITY_DETAIL = 2  # station details of a full sweep
+PRIORITY_BACKGROUND = 3  # background work that may wait
+
+BUDGET_WINDOW = 3600  # seconds
+
+
+@dataclass
+class WaitTicket:
+    """Priority of an acquire that may still be raised while it waits."""
+
+    priority: int
+    future: asyncio.Future | None = None
+
+
+class TokenBucket:
+    """Token bucket with an hourly request budget and prioritized waiters.
+
+    Tokens refill continuously at `budget / hour` up to `burst`. When no token
+    is available, callers wait in a priority queue so cheapest-station checks
+    go before bulk detail requests.
+    """
+
+    def __init__(self, budget: int, burst: int) -> None:
+        """Initialize the bucket (budget in requests per hour)."""
+        self.budget = budget
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = monotonic()
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._counter = itertools.count()
+        self._wakeup: asyncio.TimerHandle | None = None
+        self._granted: deque[float] = deque()
+        self.total_granted = 0
+        self.total_waited = 0
+        self.total_wait_time = 0.0
+
+    @property
+    def rate(self) -> float:
+        """Return the refill rate in tokens per second."""
+        return self.budget / BUDGET_WINDOW
+
+    def set_budget(self, budget: int, burst: int | None = None) -> None:
+        """Change the hourly budget (and optionally the burst size)."""
+        self._refill()
+        self.budget = max(1, budget)
+        if burst is not None:
+            self.burst = max(1, burst)
+        self._tokens = min(self._tokens, float(self.burst))
+        _LOGGER.debug(f"Request budget set to {self.budget}/hour (burst {self.burst})")
+        if self._wakeup is not None:
+            # The pending wakeup was timed for the old refill rate
+            self._wakeup.cancel()
+            self._release()
+
+    def _refill(self) -> None:
+        """Add tokens for the time elapsed since the last refill."""
+        now = monotonic()
+        self._tokens = min(float(self.burst), self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _grant(self) -> None:
+        """Consume a token and record it in the budget window."""
+        self._tokens -= 1
+        now = monotonic()
+        self._granted.append(now)
+        self.total_granted += 1
+        while self._granted and now - self._granted[0] > BUDGET_WINDOW:
+            self._granted.popleft()
+
+    async def acquire(
+        self, priority: int = PRIORITY_DETAIL, ticket: WaitTicket | None = None
+    ) -> None:
+        """Wait until a request may be sent.
+
+        With a `ticket`, its priority applies and `promote` can raise it
+        while the caller waits.
+        """
+        if ticket is not None:
+            priority = ticket.priority
+        self._refill()
+        if not self._waiters and self._tokens >= 1:
+            self._grant()
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        if ticket is not None:
+            ticket.future = future
+        heapq.heappush(self._waiters, (priority, next(self._counter), future))
+        self._schedule_wakeup()
+
+        started = monotonic()
+        self.total_waited += 1
+        try:
+            await future
+        finally:
+            self.total_wait_time += monotonic() - started
+
+    def promote(self, ticket: WaitTicket, priority: int) -> None:
+        """Raise a ticket's priority, moving it up the queue if it is waiting.
+
+        The waiter is queued again at the new priority; whichever of its
+        entries comes first is served and the other one is skipped.
+        """
+        if priority >= ticket.priority:
+            return
+        ticket.priority = priority
+        if ticket.future is not None and not ticket.future.done():
+            heapq.heappush(self._waiters, (priority, next(self._counter), ticket.future))
+
+    def try_acquire(self) -> bool:
+        """Take a token only if one is available right now (never waits)."""
+        self._refill()
+        if self._waiters or self._tokens < 1:
+            return False
+        self._grant()
+        return True
+
+    def _schedule_wakeup(self) -> None:
+        """Wake up when the next token becomes available."""
+        if self._wakeup is not None or not self._waiters:
+            return
+        delay = max(0.0, (1 - self._tokens) / self.rate)
+        self._wakeup = asyncio.get_running_loop().call_later(delay, self._release)
+
+    def _release(self) -> None:
+        """Hand out available tokens to the highest-priority waiters."""
+        self._wakeup = None
+        self._refill()
+        while self._waiters and self._tokens >= 1:
+            _, _, future = heapq.heappop(self._waiters)
+            if future.done():
+                continue
+            self._grant()
+            future.set_result(None)
+        # Drop cancelled waiters at the head so they do not keep the timer alive
+        while self._waiters and self._waiters[0][2].done():
+            heapq.heappop(self._waiters)
+        self._schedule_wakeup()
+
+    def used_in_window(self) -> int:
+        """Return the number of requests granted during the last hour."""
+        now = monotonic()
+        while self._granted and now - self._granted[0] > BUDGET_WINDOW:
+            self._granted.popleft()
+        return len(self._granted)
+
+    def stats(self) -> dict[str, Any]:
+        """Return limiter statistics."""
+        self._refill()
+        return {
+            "budget_per_hour": self.budget,
+            "burst": self.burst,
+            "used_last_hour": self.used_in_window(),
+            "tokens_available": round(self._tokens, 2),
+            "waiting": len({future for _, _, future in self._waiters if not future.done()}),
+            "total_granted": self.total_granted,
+            "total_waited": self.total_waited,
+            "total_wait_time": round(self.total_wait_time, 3),
+        }
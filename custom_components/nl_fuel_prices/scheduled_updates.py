@@ -1,23 +1,104 @@
 """Scheduled updates for Dutch Fuel Prices integration."""
 from __future__ import annotations
 
-import asyncio
-from datetime import datetime, time, timedelta
+from datetime import datetime, timedelta
+import hashlib
 import logging
 
-from homeassistant.core import HomeAssistant, callback
-from homeassistant.helpers.event import async_track_time_change
+from homeassistant.core import HomeAssistant
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.helpers import instance_id
 
+from .api import FuelPriceAPIError, count_requests, use_prefetched
 from .const import (
+    DOMAIN,
     CONF_SCHEDULED_UPDATES,
     CONF_SCHEDULED_UPDATE_TIMES,
     DEFAULT_SCHEDULED_UPDATE_TIMES,
+    SCHEDULED_UPDATE_MAX_JITTER,
 )
+from .scheduler import FuelPriceScheduler, ScheduledJob, JOB_SCHEDULED_UPDATE, parse_time_of_day
 
 _LOGGER = logging.getLogger(__name__)
 
 
+async def async_get_installation_jitter(hass: HomeAssistant) -> timedelta:
+    """Return a deterministic per-installation offset for scheduled updates.
+
+    Every installation configured for 06:00 would otherwise hit DirectLease in
+    the same second; hashing the instance id spreads them over the jitter range
+    while keeping all entries of one installation in the same wave.
+    """
+    if "scheduled_jitter" not in hass.data[DOMAIN]:
+        installation = await instance_id.async_get(hass)
+        digest = hashlib.sha256(installation.encode("utf-8")).hexdigest()
+        seconds = int(digest, 16) % SCHEDULED_UPDATE_MAX_JITTER
+        hass.data[DOMAIN]["scheduled_jitter"] = timedelta(seconds=seconds)
+        _LOGGER.debug("Scheduled update jitter for this installation: %ss", seconds)
+    return hass.data[DOMAIN]["scheduled_jitter"]
+
+
+async def async_run_scheduled_batch(
+    hass: HomeAssistant,
+    jobs: list[tuple[datetime, ScheduledJob]],
+) -> None:
+    """Run a coalesced wave of scheduled updates against one shared fetch.
+
+    The catalogue is fetched once, then the stations every due entry is
+    going to need are collected, deduplicated and fetched once with bounded
+    concurrency. The entries' refreshes run afterwards and read those
+    details instead of requesting them again.
+    """
+    _LOGGER.info("Running %d coalesced scheduled update(s)", len(jobs))
+
+    # Skip the prefetch when every due entry still has fresh data
+    due = [
+        coordinator
+        for _, job in jobs
+        if (coordinator := hass.data[DOMAIN].get(job.entry_id)) is not None
+        and not coordinator.is_fresh()
+    ]
+    api = hass.data[DOMAIN].get("api")
+    details: dict[str, dict] = {}
+    wave: dict[str, int] | None = None
+    with count_requests() as requests:
+        if api is not None and due:
+            try:
+                catalogue = await api.async_get_places()
+            except FuelPriceAPIError as err:
+                # Each entry's refresh falls back to its last good data
+                _LOGGER.warning("Could not prefetch station list for scheduled updates: %s", err)
+            else:
+                planned = [coordinator.plan_detail_requests(catalogue) for coordinator in due]
+                union = {station_id for station_ids in planned for station_id in station_ids}
+                details = await api.async_prefetch_details(
+                    list(union),
+                    crawled_max_age=min(coordinator.crawled_max_age for coordinator in due),
+                )
+                wave = {
+                    "entries": len(due),
+                    "detail_requests_per_entry": sum(len(station_ids) for station_ids in planned),
+                    "unique_stations": len(union),
+                    "prefetched": len(details),
+                }
+
+        with use_prefetched(details):
+            for scheduled_for, job in jobs:
+                await job.action(scheduled_for)
+
+    if wave is not None:
+        wave["detail_requests"] = requests["detail"]
+        hass.data[DOMAIN]["scheduled_wave"] = wave
+        _LOGGER.info(
+            "Scheduled wave for %d entries: %d detail request(s) when fetched per entry, "
+            "%d unique station(s), %d detail request(s) sent",
+            wave["entries"],
+            wave["detail_requests_per_entry"],
+            wave["unique_stations"],
+            wave["detail_requests"],
+        )
+
+
 class ScheduledUpdates:
     """Handle scheduled price updates."""
 
@@ -26,12 +107,13 @@ class ScheduledUpdates:
         hass: HomeAssistant,
         entry: ConfigEntry,
         update_callback,
+        scheduler: FuelPriceScheduler,
     ) -> None:
         """Initialize scheduled updates."""
         self.hass = hass
         self.entry = entry
         self._update_callback = update_callback
-        self._unsub_trackers = []
+        self._scheduler = scheduler
 
     async def async_setup(self) -> None:
         """Set up scheduled updates."""
@@ -49,30 +131,29 @@ class ScheduledUpdates:
 
         _LOGGER.info("Setting up scheduled updates at: %s", update_times)
 
+        jitter = await async_get_installation_jitter(self.hass)
+
         for time_str in update_times:
-            try:
-                # Parse time string (HH:MM:SS)
-                hour, minute, second = map(int, time_str.split(":"))
-                
-                # Schedule update at this time
-                unsub = async_track_time_change(
-                    self.hass,
-                    self._async_scheduled_update,
-                    hour=hour,
-                    minute=minute,
-                    second=second,
-                )
-                self._unsub_trackers.append(unsub)
-                
-                _LOGGER.debug(
-                    "Scheduled update at %02d:%02d:%02d",
-                    hour, minute, second
-                )
-                
-            except (ValueError, TypeError) as err:
-                _LOGGER.error("Invalid time format '%s': %s", time_str, err)
+            at = parse_time_of_day(time_str)
+            if at is None:
+                _LOGGER.error("Invalid time format '%s'", time_str)
+                continue
+
+            # Register with the shared scheduler instead of a per-entry time matcher
+            self._scheduler.async_add_job(
+                f"{self.entry.entry_id}_update_{time_str}",
+                JOB_SCHEDULED_UPDATE,
+                self.entry.entry_id,
+                at,
+                self._async_scheduled_update,
+                offset=jitter,
+            )
+
+            _LOGGER.debug(
+                "Scheduled update at %02d:%02d:%02d",
+                at.hour, at.minute, at.second
+            )
 
-    @callback
     async def _async_scheduled_update(self, now: datetime) -> None:
         """Execute scheduled update."""
         _LOGGER.info("Running scheduled fuel price update at %s", now.strftime("%H:%M:%S"))
@@ -87,7 +168,7 @@ class ScheduledUpdates:
 
     async def async_unload(self) -> None:
         """Unload scheduled updates."""
-        for unsub in self._unsub_trackers:
-            unsub()
-        self._unsub_trackers.clear()
+        self._scheduler.async_remove_entry_jobs(
+            self.entry.entry_id, JOB_SCHEDULED_UPDATE
+        )
         _LOGGER.debug("Scheduled updates unloaded")
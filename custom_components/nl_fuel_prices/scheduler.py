@@ -0,0 +1,260 @@
+"""Central time-of-day scheduler for Dutch Fuel Prices."""
+from __future__ import annotations
+
+import heapq
+import itertools
+import logging
+from dataclasses import dataclass
+from datetime import datetime, time, timedelta
+from typing import Any, Awaitable, Callable
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_time
+from homeassistant.util import dt as dt_util
+
+_LOGGER = logging.getLogger(__name__)
+
+# Job kinds
+JOB_DAILY_REPORT = "daily_report"
+JOB_SCHEDULED_UPDATE = "scheduled_update"
+
+
+@dataclass
+class ScheduledJob:
+    """A job that runs every day at a fixed local time."""
+
+    job_id: str
+    kind: str
+    entry_id: str
+    at: time
+    action: Callable[[datetime], Awaitable[None]]
+    offset: timedelta = timedelta(0)
+    next_run: datetime | None = None
+    seq: int = 0
+
+    def next_run_after(self, after: datetime) -> datetime:
+        """Return the next run strictly after `after`, including the offset."""
+        return next_run_after(self.at, after - self.offset) + self.offset
+
+
+def parse_time_of_day(time_str: str) -> time | None:
+    """Parse a HH:MM:SS (or HH:MM) string into a time object."""
+    try:
+        parts = [int(part) for part in time_str.split(":")]
+        while len(parts) < 3:
+            parts.append(0)
+        hour, minute, second = parts[:3]
+        return time(hour, minute, second)
+    except (AttributeError, ValueError, TypeError):
+        return None
+
+
+def next_run_after(at: time, after: datetime) -> datetime:
+    """Return the first local datetime at time-of-day `at` strictly after `after`."""
+    local = dt_util.as_local(after)
+    candidate = local.replace(
+        hour=at.hour, minute=at.minute, second=at.second, microsecond=0
+    )
+    if candidate <= local:
+        candidate = (local + timedelta(days=1)).replace(
+            hour=at.hour, minute=at.minute, second=at.second, microsecond=0
+        )
+    return candidate
+
+
+class FuelPriceScheduler:
+    """Integration-wide scheduler for all daily timed jobs.
+
+    All jobs of all config entries live in a single heap ordered by their next
+    fire time, and only one `async_track_point_in_time` timer is armed for the
+    earliest job. Adding a job is O(log n); removing one is O(1) with lazy
+    deletion from the heap, which is compacted once stale entries dominate.
+
+    Kinds with a batch handler receive all their jobs falling due within
+    `coalesce_window` of each other in one call; jobs of other kinds fire
+    individually at their own time.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coalesce_window: timedelta = timedelta(0),
+    ) -> None:
+        """Initialize the scheduler."""
+        self.hass = hass
+        self.coalesce_window = coalesce_window
+        self._batch_handlers: dict[
+            str, Callable[[list[tuple[datetime, ScheduledJob]]], Awaitable[None]]
+        ] = {}
+        self._jobs: dict[str, ScheduledJob] = {}
+        self._heap: list[tuple[datetime, int, str]] = []
+        self._counter = itertools.count()
+        self._unsub_timer: CALLBACK_TYPE | None = None
+        self._armed_for: datetime | None = None
+
+    @callback
+    def async_add_job(
+        self,
+        job_id: str,
+        kind: str,
+        entry_id: str,
+        at: time,
+        action: Callable[[datetime], Awaitable[None]],
+        offset: timedelta = timedelta(0),
+    ) -> ScheduledJob:
+        """Add (or replace) a daily job and re-arm the timer if needed."""
+        self._jobs.pop(job_id, None)
+        job = ScheduledJob(job_id, kind, entry_id, at, action, offset)
+        self._jobs[job_id] = job
+        self._push(job, job.next_run_after(dt_util.now()))
+        _LOGGER.debug(f"Scheduled {kind} job {job_id} at {job.next_run}")
+        self._async_arm()
+        return job
+
+    @callback
+    def async_set_batch_handler(
+        self,
+        kind: str,
+        handler: Callable[[list[tuple[datetime, ScheduledJob]]], Awaitable[None]],
+    ) -> None:
+        """Dispatch all due jobs of a kind through one handler call."""
+        self._batch_handlers[kind] = handler
+
+    @callback
+    def async_remove_job(self, job_id: str) -> None:
+        """Remove a job; its heap slot is discarded lazily."""
+        if self._jobs.pop(job_id, None) is None:
+            return
+        self._maybe_compact()
+        self._async_arm()
+
+    @callback
+    def async_remove_entry_jobs(self, entry_id: str, kind: str | None = None) -> None:
+        """Remove all jobs (optionally of one kind) belonging to a config entry."""
+        for job_id in [
+            job.job_id
+            for job in self._jobs.values()
+            if job.entry_id == entry_id and (kind is None or job.kind == kind)
+        ]:
+            del self._jobs[job_id]
+        self._maybe_compact()
+        self._async_arm()
+
+    def get_jobs(self, entry_id: str | None = None) -> list[ScheduledJob]:
+        """Return registered jobs sorted by next run."""
+        jobs = [
+            job for job in self._jobs.values()
+            if entry_id is None or job.entry_id == entry_id
+        ]
+        return sorted(jobs, key=lambda job: job.next_run)
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Cancel the timer and drop all jobs."""
+        if self._unsub_timer:
+            self._unsub_timer()
+        self._unsub_timer = None
+        self._armed_for = None
+        self._jobs.clear()
+        self._heap.clear()
+
+    def _push(self, job: ScheduledJob, when: datetime) -> None:
+        """Push a job's next run onto the heap."""
+        job.seq = next(self._counter)
+        job.next_run = when
+        heapq.heappush(self._heap, (when, job.seq, job.job_id))
+
+    def _is_live(self, item: tuple[datetime, int, str]) -> bool:
+        """Return whether a heap item still refers to a registered job."""
+        job = self._jobs.get(item[2])
+        return job is not None and job.seq == item[1]
+
+    def _maybe_compact(self) -> None:
+        """Rebuild the heap when most of it is stale entries."""
+        if len(self._heap) > 2 * len(self._jobs) + 16:
+            self._heap = [item for item in self._heap if self._is_live(item)]
+            heapq.heapify(self._heap)
+
+    @callback
+    def _async_arm(self) -> None:
+        """Arm a single timer for the earliest live job."""
+        while self._heap and not self._is_live(self._heap[0]):
+            heapq.heappop(self._heap)
+
+        earliest = self._heap[0][0] if self._heap else None
+        if earliest == self._armed_for:
+            return
+
+        if self._unsub_timer:
+            self._unsub_timer()
+            self._unsub_timer = None
+        self._armed_for = earliest
+
+        if earliest is not None:
+            self._unsub_timer = async_track_point_in_time(
+                self.hass, self._async_fire, earliest
+            )
+
+    @callback
+    def _async_fire(self, now: datetime) -> None:
+        """Run every job that is due and reschedule it for the next day."""
+        self._unsub_timer = None
+        self._armed_for = None
+
+        # Jobs of batched kinds due within the coalescing window run together
+        # with this wave; all other jobs only once their own time has come
+        horizon = now + self.coalesce_window
+        due: dict[str, list[tuple[datetime, ScheduledJob]]] = {}
+        not_due: list[tuple[datetime, int, str]] = []
+        while self._heap and self._heap[0][0] <= horizon:
+            item = heapq.heappop(self._heap)
+            if not self._is_live(item):
+                continue
+            job = self._jobs[item[2]]
+            if item[0] > now and job.kind not in self._batch_handlers:
+                not_due.append(item)
+                continue
+            due.setdefault(job.kind, []).append((item[0], job))
+            self._push(job, job.next_run_after(max(now, item[0])))
+        for item in not_due:
+            heapq.heappush(self._heap, item)
+
+        for kind, jobs in due.items():
+            if handler := self._batch_handlers.get(kind):
+                _LOGGER.debug(f"Running {len(jobs)} coalesced {kind} job(s)")
+                self.hass.async_create_task(self._async_run_batch(kind, handler, jobs))
+                continue
+            for scheduled_for, job in jobs:
+                _LOGGER.debug(f"Running {job.kind} job {job.job_id} scheduled for {scheduled_for}")
+                self.hass.async_create_task(
+                    self._async_run_job(job, scheduled_for)
+                )
+
+        self._async_arm()
+
+    async def _async_run_job(self, job: ScheduledJob, scheduled_for: datetime) -> None:
+        """Run a single job, logging failures instead of raising."""
+        try:
+            await job.action(scheduled_for)
+        except Exception as err:
+            _LOGGER.error(f"Scheduled {job.kind} job {job.job_id} failed: {err}")
+
+    async def _async_run_batch(
+        self,
+        kind: str,
+        handler: Callable[[list[tuple[datetime, ScheduledJob]]], Awaitable[None]],
+        jobs: list[tuple[datetime, ScheduledJob]],
+    ) -> None:
+        """Run a batch handler, logging failures instead of raising."""
+        try:
+            await handler(jobs)
+        except Exception as err:
+            _LOGGER.error(f"Coalesced {kind} batch of {len(jobs)} job(s) failed: {err}")
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a summary of the scheduler state."""
+        return {
+            "jobs": len(self._jobs),
+            "heap_size": len(self._heap),
+            "armed_for": self._armed_for.isoformat() if self._armed_for else None,
+        }
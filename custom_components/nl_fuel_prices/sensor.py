@@ -7,7 +7,7 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.helpers.device_registry import DeviceInfo
-from homeassistant.const import CURRENCY_EURO
+from homeassistant.const import CURRENCY_EURO, EntityCategory, UnitOfTime
 
 from . import FuelPriceCoordinator
 from .const import (
@@ -24,7 +24,10 @@ from .const import (
     ATTR_RANK,
     ATTR_TOTAL_STATIONS,
     ATTR_STATION_ID,
+    CONF_MAX_STATIONS,
+    DEFAULT_MAX_STATIONS,
 )
+from .timing import STAGES
 
 
 async def async_setup_entry(
@@ -43,9 +46,9 @@ async def async_setup_entry(
         FuelPriceSensor(coordinator, fuel_type, location_name, postcode, is_main=True)
     ]
     
-    # Dynamically add sensors based on actual stations found (up to max 5 total)
+    # Dynamically add sensors based on actual stations found (up to the configured maximum)
     stations = coordinator.data.get("stations", [])
-    num_stations = min(len(stations), 5)  # Max 5 stations total
+    num_stations = min(len(stations), entry.data.get(CONF_MAX_STATIONS, DEFAULT_MAX_STATIONS))
     
     # Add sensors for alternative stations (stations 1 onwards, as station 0 is the main/cheapest)
     for i in range(1, num_stations):
@@ -53,6 +56,17 @@ async def async_setup_entry(
             FuelStationSensor(coordinator, fuel_type, location_name, postcode, i)
         )
     
+    # Integration-wide API request budget usage: a single sensor, added by
+    # the first location that sets up
+    if hass.data[DOMAIN].setdefault("request_budget_entry", entry.entry_id) == entry.entry_id:
+        sensors.append(RequestBudgetSensor(coordinator))
+    
+    # Per-stage refresh timings, disabled unless needed to chase a slow refresh
+    for stage in STAGES:
+        sensors.append(
+            RefreshStageSensor(coordinator, fuel_type, location_name, postcode, stage)
+        )
+    
     async_add_entities(sensors)
 
 
@@ -93,7 +107,7 @@ class FuelPriceSensor(CoordinatorEntity, SensorEntity):
         """Return the state of the sensor (cheapest price)."""
         cheapest = self.coordinator.data.get("cheapest")
         if cheapest:
-            return cheapest.get("price")
+            return cheapest.price
         return None
     
     @property
@@ -101,8 +115,8 @@ class FuelPriceSensor(CoordinatorEntity, SensorEntity):
         """Return the name with station name and distance if available."""
         cheapest = self.coordinator.data.get("cheapest")
         if cheapest and self._is_main:
-            station_name = cheapest.get("name", "Unknown")
-            distance = cheapest.get("distance")
+            station_name = cheapest.name
+            distance = cheapest.distance
             if distance is not None:
                 return f"{station_name} ({distance}km) - {FUEL_TYPES.get(self._fuel_type, self._fuel_type)}"
             return f"{station_name} ({FUEL_TYPES.get(self._fuel_type, self._fuel_type)})"
@@ -119,42 +133,49 @@ class FuelPriceSensor(CoordinatorEntity, SensorEntity):
         all_stations = self.coordinator.data.get("stations", [])
         
         attributes = {
-            ATTR_STATION_NAME: cheapest.get("name"),
-            ATTR_STATION_BRAND: cheapest.get("brand"),
-            ATTR_STATION_ADDRESS: cheapest.get("address"),
-            ATTR_DISTANCE: cheapest.get("distance"),
-            ATTR_LATITUDE: cheapest.get("latitude"),
-            ATTR_LONGITUDE: cheapest.get("longitude"),
-            ATTR_OPENING_HOURS: cheapest.get("opening_hours"),
-            ATTR_LAST_UPDATED: cheapest.get("last_updated"),
+            ATTR_STATION_NAME: cheapest.name,
+            ATTR_STATION_BRAND: cheapest.brand,
+            ATTR_STATION_ADDRESS: cheapest.address,
+            ATTR_DISTANCE: cheapest.distance,
+            ATTR_LATITUDE: cheapest.latitude,
+            ATTR_LONGITUDE: cheapest.longitude,
+            ATTR_OPENING_HOURS: cheapest.opening_hours,
+            ATTR_LAST_UPDATED: cheapest.last_updated,
             ATTR_RANK: 1,  # Always 1 as this is the cheapest
             ATTR_TOTAL_STATIONS: self.coordinator.data.get("total_stations", 0),
-            ATTR_STATION_ID: cheapest.get("id"),
+            ATTR_STATION_ID: cheapest.id,
             "fuel_type": FUEL_TYPES.get(self._fuel_type, self._fuel_type),
             "location_postcode": self.coordinator.entry.data.get("town_postcode"),
             "location_province": self.coordinator.entry.data.get("town_province"),
             "radius": self.coordinator.entry.data.get("radius", 10),
             # Services information
-            "is_unmanned": cheapest.get("is_unmanned", False),
-            "has_shop": cheapest.get("has_shop", False),
-            "services": cheapest.get("services", []),
-            "shop_hours": cheapest.get("shop_hours"),
+            "is_unmanned": cheapest.is_unmanned,
+            "has_shop": cheapest.has_shop,
+            "services": cheapest.services,
+            "shop_hours": cheapest.shop_hours,
+            # API usage of the last refresh
+            "last_refresh_requests": self.coordinator.data.get("request_count"),
+            "last_refresh_full_sweep": self.coordinator.data.get("full_sweep"),
+            # Last known prices served while the API is unavailable
+            "stale": self.coordinator.data.get("stale", False),
+            "stale_since": self.coordinator.data.get("stale_since"),
         }
         
-        # Add alternative stations (top 5)
+        # Add the other tracked stations as alternatives
+        max_stations = self.coordinator.entry.data.get(CONF_MAX_STATIONS, DEFAULT_MAX_STATIONS)
         if len(all_stations) > 1:
             alternatives = []
-            for idx, station in enumerate(all_stations[1:6], 2):  # Stations 2-6
+            for idx, station in enumerate(all_stations[1:max_stations], 2):  # Stations 2-N
                 alternatives.append({
                     "rank": idx,
-                    "name": station.get("name"),
-                    "brand": station.get("brand"),
-                    "price": station.get("price"),
-                    "distance": station.get("distance"),
-                    "address": station.get("address"),
-                    "is_unmanned": station.get("is_unmanned", False),
-                    "has_shop": station.get("has_shop", False),
-                    "services": station.get("services", []),
+                    "name": station.name,
+                    "brand": station.brand,
+                    "price": station.price,
+                    "distance": station.distance,
+                    "address": station.address,
+                    "is_unmanned": station.is_unmanned,
+                    "has_shop": station.has_shop,
+                    "services": station.services,
                 })
             attributes["alternatives"] = alternatives
             attributes["alternative_count"] = len(alternatives)
@@ -203,7 +224,7 @@ class FuelStationSensor(CoordinatorEntity, SensorEntity):
         """Return the price of this station."""
         stations = self.coordinator.data.get("stations", [])
         if self._index < len(stations):
-            return stations[self._index].get("price")
+            return stations[self._index].price
         return None
 
     @property
@@ -212,8 +233,8 @@ class FuelStationSensor(CoordinatorEntity, SensorEntity):
         stations = self.coordinator.data.get("stations", [])
         if self._index < len(stations):
             station = stations[self._index]
-            station_name = station.get("name", f"Station {self._index + 1}")
-            distance = station.get("distance")
+            station_name = station.name
+            distance = station.distance
             if distance is not None:
                 return f"{station_name} ({distance}km) - {FUEL_TYPES.get(self._fuel_type, self._fuel_type)}"
             return f"{station_name} ({FUEL_TYPES.get(self._fuel_type, self._fuel_type)})"
@@ -234,25 +255,122 @@ class FuelStationSensor(CoordinatorEntity, SensorEntity):
 
         station = stations[self._index]
         return {
-            ATTR_STATION_NAME: station.get("name"),
-            ATTR_STATION_BRAND: station.get("brand"),
-            ATTR_STATION_ADDRESS: station.get("address"),
-            ATTR_DISTANCE: station.get("distance"),
-            ATTR_LATITUDE: station.get("latitude"),
-            ATTR_LONGITUDE: station.get("longitude"),
-            ATTR_OPENING_HOURS: station.get("opening_hours"),
+            ATTR_STATION_NAME: station.name,
+            ATTR_STATION_BRAND: station.brand,
+            ATTR_STATION_ADDRESS: station.address,
+            ATTR_DISTANCE: station.distance,
+            ATTR_LATITUDE: station.latitude,
+            ATTR_LONGITUDE: station.longitude,
+            ATTR_OPENING_HOURS: station.opening_hours,
             ATTR_RANK: self._index + 1,
+            "stale": self.coordinator.data.get("stale", False),
             "fuel_type": FUEL_TYPES.get(self._fuel_type, self._fuel_type),
             "location_postcode": self.coordinator.entry.data.get("town_postcode"),
             "location_province": self.coordinator.entry.data.get("town_province"),
             # Services information
-            "is_unmanned": station.get("is_unmanned", False),
-            "has_shop": station.get("has_shop", False),
-            "services": station.get("services", []),
-            "shop_hours": station.get("shop_hours"),
+            "is_unmanned": station.is_unmanned,
+            "has_shop": station.has_shop,
+            "services": station.services,
+            "shop_hours": station.shop_hours,
         }
 
     @property
     def icon(self) -> str:
         """Return the icon to use in the frontend."""
         return "mdi:gas-station-outline"
+
+
+class RequestBudgetSensor(CoordinatorEntity, SensorEntity):
+    """Diagnostic sensor showing the shared DirectLease request budget usage.
+
+    The budget is shared by all locations, so there is one sensor on its own
+    service device; it updates with the coordinator of the location that
+    added it.
+    """
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = "requests"
+
+    def __init__(self, coordinator: FuelPriceCoordinator) -> None:
+        """Initialize the budget sensor."""
+        super().__init__(coordinator)
+        self._attr_unique_id = f"{DOMAIN}_request_budget"
+        self._attr_name = "DirectLease API Requests (last hour)"
+        
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, "directlease_api")},
+            name="DirectLease API",
+            manufacturer="DirectLease",
+            model="Fuel Price API",
+            entry_type="service",
+        )
+
+    @property
+    def native_value(self) -> int:
+        """Return the number of API requests sent during the last hour."""
+        return self.coordinator.api.limiter.used_in_window()
+
+    @property
+    def extra_state_attributes(self) -> dict:
+        """Return the limiter and connection statistics."""
+        transport = self.coordinator.api.transport.stats()
+        return {
+            **self.coordinator.api.limiter.stats(),
+            "connections_created": transport["connections_created"],
+            "connections_reused": transport["connections_reused"],
+            "connection_reuse_rate": transport["reuse_rate"],
+            "request_timing_ms": transport["timing_ms"],
+        }
+
+    @property
+    def icon(self) -> str:
+        """Return the icon to use in the frontend."""
+        return "mdi:api"
+
+
+class RefreshStageSensor(CoordinatorEntity, SensorEntity):
+    """Diagnostic sensor with the rolling p95 duration of one refresh stage."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(
+        self,
+        coordinator: FuelPriceCoordinator,
+        fuel_type: str,
+        location_name: str,
+        postcode: str,
+        stage: str,
+    ) -> None:
+        """Initialize the stage timing sensor."""
+        super().__init__(coordinator)
+        self._stage = stage
+        self._attr_unique_id = f"{DOMAIN}_{fuel_type}_{postcode}_stage_{stage}"
+        self._attr_name = f"{location_name} - Refresh {stage} time"
+        
+        # Same device as the price sensors of this location
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, f"{fuel_type}_{postcode}")},
+            name=f"{location_name} - {FUEL_TYPES.get(fuel_type, fuel_type)}",
+            manufacturer="DirectLease",
+            model="Fuel Price Tracker",
+            entry_type="service",
+        )
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the p95 duration of the stage over the recent refreshes."""
+        return self.coordinator.stage_timings.stage_stats(self._stage)["p95"]
+
+    @property
+    def extra_state_attributes(self) -> dict:
+        """Return the p50, p95, maximum and sample count of the stage."""
+        return self.coordinator.stage_timings.stage_stats(self._stage)
+
+    @property
+    def icon(self) -> str:
+        """Return the icon to use in the frontend."""
+        return "mdi:timer-outline"
@@ -0,0 +1,257 @@
+"""Command-line price sweeps across many postcodes.
+
+Reads a CSV with a `postcode` and `fuel_type` column (optionally `radius`,
+`latitude` and `longitude`; missing coordinates are geocoded through PDOK)
+and writes the ranked stations of every row as CSV or JSON Lines while the
+sweep runs. All rows share one FuelPriceAPI: one catalogue snapshot, the
+detail cache and the request budget. Nothing here needs Home Assistant;
+run it through `fuel_price_sweep.py` in the repository root:
+
+    python fuel_price_sweep.py postcodes.csv --format jsonl --output prices.jsonl
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import csv
+import json
+import logging
+import sys
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Any, Iterator, TextIO
+
+import aiohttp
+
+from .api import DIRECTLEASE_API_BASE, PREFETCH_CONCURRENCY, FuelPriceAPI, FuelPriceAPIError
+from .const import DEFAULT_MAX_STATIONS, DEFAULT_RADIUS, DEFAULT_REQUEST_BURST, FUEL_TYPES
+from .geocoding import geocode_postcode, validate_dutch_postcode
+from .models import FuelPriceQuery, StationPrice
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 50  # rows answered per bulk query
+DEFAULT_GEOCODE_CONCURRENCY = 4
+CLI_REQUEST_BUDGET = 600  # requests per hour against the real API
+
+CSV_FIELDS = (
+    "row",
+    "postcode",
+    "fuel_type",
+    "rank",
+    "station_id",
+    "name",
+    "brand",
+    "address",
+    "price",
+    "distance",
+    "latitude",
+    "longitude",
+)
+
+
+@dataclass(slots=True)
+class SweepRow:
+    """One input row: a postcode and fuel type, with coordinates once known."""
+
+    index: int
+    postcode: str
+    fuel_type: str
+    radius: float
+    latitude: float | None = None
+    longitude: float | None = None
+
+
+def read_rows(source: TextIO, radius: float) -> Iterator[SweepRow]:
+    """Yield the valid rows of the input CSV, logging the ones skipped."""
+    for index, record in enumerate(csv.DictReader(source), 1):
+        postcode = (record.get("postcode") or "").strip().upper().replace(" ", "")
+        fuel_type = (record.get("fuel_type") or record.get("fuel") or "").strip().lower()
+        if fuel_type not in FUEL_TYPES:
+            _LOGGER.warning(f"Row {index}: unknown fuel type {fuel_type!r}, skipped")
+            continue
+        try:
+            row_radius = float(record.get("radius") or radius)
+            latitude = float(record["latitude"]) if record.get("latitude") else None
+            longitude = float(record["longitude"]) if record.get("longitude") else None
+        except ValueError as err:
+            _LOGGER.warning(f"Row {index}: {err}, skipped")
+            continue
+        if (latitude is None or longitude is None) and not validate_dutch_postcode(postcode):
+            _LOGGER.warning(f"Row {index}: invalid postcode {postcode!r} and no coordinates, skipped")
+            continue
+        yield SweepRow(index, postcode, fuel_type, row_radius, latitude, longitude)
+
+
+async def async_geocode_rows(
+    session: aiohttp.ClientSession,
+    rows: list[SweepRow],
+    concurrency: int,
+) -> list[SweepRow]:
+    """Fill in missing coordinates (once per postcode) and drop rows that failed."""
+    semaphore = asyncio.Semaphore(concurrency)
+    locations: dict[str, asyncio.Task] = {}
+
+    async def _async_geocode(postcode: str) -> dict[str, Any] | None:
+        async with semaphore:
+            return await geocode_postcode(session, postcode)
+
+    for row in rows:
+        if row.latitude is None or row.longitude is None:
+            if row.postcode not in locations:
+                locations[row.postcode] = asyncio.ensure_future(_async_geocode(row.postcode))
+    if locations:
+        await asyncio.gather(*locations.values())
+
+    located = []
+    for row in rows:
+        if row.latitude is None or row.longitude is None:
+            location = locations[row.postcode].result()
+            if location is None:
+                _LOGGER.warning(f"Row {row.index}: could not geocode {row.postcode}, skipped")
+                continue
+            row.latitude = location["latitude"]
+            row.longitude = location["longitude"]
+        located.append(row)
+    return located
+
+
+class ResultWriter:
+    """Stream sweep results as CSV (one line per station) or JSON Lines (one per row)."""
+
+    def __init__(self, output: TextIO, output_format: str) -> None:
+        """Initialize the writer."""
+        self.output = output
+        self.output_format = output_format
+        self._csv: csv.DictWriter | None = None
+        if output_format == "csv":
+            self._csv = csv.DictWriter(output, CSV_FIELDS)
+            self._csv.writeheader()
+
+    def write(self, row: SweepRow, stations: list[StationPrice]) -> None:
+        """Write the stations found for one input row."""
+        if self._csv is None:
+            self.output.write(json.dumps({
+                "row": row.index,
+                "postcode": row.postcode,
+                "fuel_type": row.fuel_type,
+                "latitude": row.latitude,
+                "longitude": row.longitude,
+                "radius": row.radius,
+                "stations": [station.as_dict() for station in stations],
+            }) + "\n")
+        else:
+            for station in stations:
+                self._csv.writerow({
+                    "row": row.index,
+                    "postcode": row.postcode,
+                    "fuel_type": row.fuel_type,
+                    "rank": station.rank,
+                    "station_id": station.id,
+                    "name": station.name,
+                    "brand": station.brand,
+                    "address": station.address,
+                    "price": station.price,
+                    "distance": station.distance,
+                    "latitude": station.latitude,
+                    "longitude": station.longitude,
+                })
+        self.output.flush()
+
+
+async def async_sweep(args: argparse.Namespace, source: TextIO, output: TextIO) -> dict[str, Any]:
+    """Run the sweep and return the throughput report."""
+    started = perf_counter()
+    rows = list(read_rows(source, args.radius))
+
+    async with aiohttp.ClientSession() as session:
+        rows = await async_geocode_rows(session, rows, args.geocode_concurrency)
+    geocoded = perf_counter()
+
+    api = FuelPriceAPI(base_url=args.base_url)
+    api.limiter.set_budget(args.budget, max(args.concurrency, DEFAULT_REQUEST_BURST))
+    writer = ResultWriter(output, args.format)
+    stations_written = 0
+    failed_rows = 0
+    try:
+        for first in range(0, len(rows), args.batch_size):
+            batch = rows[first:first + args.batch_size]
+            queries = [
+                FuelPriceQuery(row.latitude, row.longitude, row.radius, row.fuel_type, args.max_stations)
+                for row in batch
+            ]
+            try:
+                results = await api.get_fuel_prices_many(
+                    queries, plan_by_price=args.plan_by_price, concurrency=args.concurrency
+                )
+            except FuelPriceAPIError as err:
+                _LOGGER.error(f"Rows {batch[0].index}-{batch[-1].index} failed: {err}")
+                failed_rows += len(batch)
+                continue
+            for row, stations in zip(batch, results):
+                writer.write(row, stations)
+                stations_written += len(stations)
+    finally:
+        await api.async_close()
+
+    elapsed = perf_counter() - started
+    sweep_seconds = perf_counter() - geocoded
+    requests = sum(api.request_counts.values())
+    return {
+        "rows": len(rows),
+        "failed_rows": failed_rows,
+        "stations": stations_written,
+        "requests": dict(api.request_counts),
+        "cache": api.cache_stats(),
+        "geocode_seconds": round(geocoded - started, 3),
+        "sweep_seconds": round(sweep_seconds, 3),
+        "elapsed_seconds": round(elapsed, 3),
+        "rows_per_second": round(len(rows) / sweep_seconds, 1) if sweep_seconds else None,
+        "requests_per_second": round(requests / sweep_seconds, 1) if sweep_seconds else None,
+        "decoding": api.decode_stats(),
+    }
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse the command line."""
+    parser = argparse.ArgumentParser(
+        prog="python fuel_price_sweep.py",
+        description="Look up the cheapest fuel stations for many postcodes.",
+    )
+    parser.add_argument("input", help="CSV with postcode and fuel_type columns ('-' for stdin)")
+    parser.add_argument("-o", "--output", default="-", help="output file ('-' for stdout)")
+    parser.add_argument("-f", "--format", choices=("csv", "jsonl"), default="csv")
+    parser.add_argument("--radius", type=float, default=DEFAULT_RADIUS, help="km, unless the row has one")
+    parser.add_argument("--max-stations", type=int, default=DEFAULT_MAX_STATIONS)
+    parser.add_argument("--plan-by-price", action="store_true", help="prefer stations known to be cheap")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--concurrency", type=int, default=PREFETCH_CONCURRENCY, help="concurrent detail requests")
+    parser.add_argument("--geocode-concurrency", type=int, default=DEFAULT_GEOCODE_CONCURRENCY)
+    parser.add_argument("--budget", type=int, default=CLI_REQUEST_BUDGET, help="API requests per hour")
+    parser.add_argument("--base-url", default=DIRECTLEASE_API_BASE, help="Tank Service base URL")
+    parser.add_argument("-v", "--verbose", action="store_true")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the command line tool."""
+    args = parse_args(argv)
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.WARNING,
+        format="%(levelname)s %(name)s: %(message)s",
+        stream=sys.stderr,
+    )
+
+    source = sys.stdin if args.input == "-" else open(args.input, newline="", encoding="utf-8")
+    output = sys.stdout if args.output == "-" else open(args.output, "w", newline="", encoding="utf-8")
+    try:
+        report = asyncio.run(async_sweep(args, source, output))
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if output is not sys.stdout:
+            output.close()
+
+    print(json.dumps(report, indent=2), file=sys.stderr)
+    return 1 if report["failed_rows"] else 0
+
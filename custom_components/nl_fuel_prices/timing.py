@@ -0,0 +1,106 @@
+"""Timing spans for the stages of a coordinator refresh."""
+from __future__ import annotations
+
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import monotonic
+from typing import Any, Iterator
+
+# Refreshes kept per stage for the rolling percentiles
+STAGE_SAMPLES = 100
+
+# Stages in refresh order; spans nest (decode runs inside places and details,
+# everything inside refresh) and a stage a refresh skipped is not sampled
+STAGES = (
+    "places",
+    "decode",
+    "filter",
+    "details",
+    "build",
+    "sentinels",
+    "history",
+    "notifications",
+    "refresh",
+)
+
+# Span collectors of the refreshes running in the current task context
+_SPANS: ContextVar[tuple[dict[str, float], ...]] = ContextVar(
+    "nl_fuel_prices_spans", default=()
+)
+
+
+@contextmanager
+def collect_spans() -> Iterator[dict[str, float]]:
+    """Sum the seconds per stage spent within this context (and its child tasks)."""
+    spans: dict[str, float] = {}
+    token = _SPANS.set((*_SPANS.get(), spans))
+    try:
+        yield spans
+    finally:
+        _SPANS.reset(token)
+
+
+@contextmanager
+def span(stage: str) -> Iterator[None]:
+    """Time a stage for every enclosing `collect_spans` context."""
+    collectors = _SPANS.get()
+    if not collectors:
+        yield
+        return
+    started = monotonic()
+    try:
+        yield
+    finally:
+        elapsed = monotonic() - started
+        for spans in collectors:
+            spans[stage] = spans.get(stage, 0.0) + elapsed
+
+
+def format_spans(spans: dict[str, float]) -> str:
+    """Return the stage times of one refresh for the log."""
+    return ", ".join(
+        f"{stage} {spans[stage] * 1000:.1f}ms" for stage in STAGES if stage in spans
+    )
+
+
+class StageTimings:
+    """Rolling per-stage durations of the most recent refreshes."""
+
+    def __init__(self, samples: int = STAGE_SAMPLES) -> None:
+        """Initialize empty sample windows."""
+        self._samples: dict[str, deque[float]] = {
+            stage: deque(maxlen=samples) for stage in STAGES
+        }
+
+    def add(self, spans: dict[str, float]) -> None:
+        """Record the stage times of one refresh."""
+        for stage, seconds in spans.items():
+            if stage in self._samples:
+                self._samples[stage].append(seconds)
+
+    def percentile(self, stage: str, share: float) -> float | None:
+        """Return the `share` percentile of a stage in seconds, or None without samples."""
+        samples = self._samples.get(stage)
+        if not samples:
+            return None
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * share))]
+
+    def stage_stats(self, stage: str) -> dict[str, Any]:
+        """Return the sample count and p50/p95/max of a stage in milliseconds."""
+        samples = self._samples.get(stage) or ()
+        if not samples:
+            return {"samples": 0, "p50": None, "p95": None, "max": None}
+        return {
+            "samples": len(samples),
+            "p50": round(self.percentile(stage, 0.5) * 1000, 1),
+            "p95": round(self.percentile(stage, 0.95) * 1000, 1),
+            "max": round(max(samples) * 1000, 1),
+        }
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """Return the statistics of every stage with samples."""
+        return {
+            stage: self.stage_stats(stage) for stage in STAGES if self._samples[stage]
+        }
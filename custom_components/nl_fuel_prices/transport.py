@@ -0,0 +1,308 @@
+"""Dedicated HTTP transport for the DirectLease API with request timing."""
+from __future__ import annotations
+
+import asyncio
+import logging
+from bisect import bisect_left
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from time import monotonic
+from types import SimpleNamespace
+from typing import Any, AsyncIterator, Callable
+
+import aiohttp
+
+_LOGGER = logging.getLogger(__name__)
+
+# Connection pool tuning for the single DirectLease host
+DEFAULT_LIMIT_PER_HOST = 6
+DEFAULT_DNS_CACHE_TTL = 300  # seconds
+DEFAULT_KEEPALIVE_TIMEOUT = 60  # seconds
+
+TIMING_SAMPLES = 200
+TIMING_PHASES = ("queued", "dns", "connect", "ttfb", "body", "total")
+
+# Upper bounds (ms) of the cumulative request latency histogram buckets
+LATENCY_BUCKETS = (50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+REQUEST_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Linux; Android 13; Pixel 7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.6099.230 Mobile Safari/537.36",
+    "Accept": "application/json",
+    "Accept-Encoding": "gzip, deflate",
+}
+
+
+@dataclass
+class RequestTiming:
+    """Phase timings of one request in seconds.
+
+    `queued` is time spent waiting for a free pooled connection, `connect`
+    includes TCP and TLS setup (both stay 0 for a reused connection), `ttfb`
+    runs from sending the request to receiving the response headers.
+    """
+
+    endpoint: str
+    started: float = field(default_factory=monotonic)
+    queued: float = 0.0
+    dns: float = 0.0
+    connect: float = 0.0
+    ttfb: float = 0.0
+    body: float = 0.0
+    total: float = 0.0
+    reused: bool = False
+    dns_cache_hit: bool | None = None
+    status: int | None = None
+    marks: dict[str, float] = field(default_factory=dict)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the timings rounded to milliseconds."""
+        return {
+            "endpoint": self.endpoint,
+            "status": self.status,
+            "reused_connection": self.reused,
+            **{phase: round(getattr(self, phase) * 1000, 1) for phase in TIMING_PHASES},
+        }
+
+
+def _trace_ctx(trace_config_ctx: SimpleNamespace) -> RequestTiming | None:
+    """Return the RequestTiming passed as trace_request_ctx, if any."""
+    timing = trace_config_ctx.trace_request_ctx
+    return timing if isinstance(timing, RequestTiming) else None
+
+
+async def _on_queued_start(session, ctx, params) -> None:
+    if timing := _trace_ctx(ctx):
+        timing.marks["queued"] = monotonic()
+
+
+async def _on_queued_end(session, ctx, params) -> None:
+    if (timing := _trace_ctx(ctx)) and "queued" in timing.marks:
+        timing.queued += monotonic() - timing.marks.pop("queued")
+
+
+async def _on_dns_start(session, ctx, params) -> None:
+    if timing := _trace_ctx(ctx):
+        timing.marks["dns"] = monotonic()
+
+
+async def _on_dns_end(session, ctx, params) -> None:
+    if (timing := _trace_ctx(ctx)) and "dns" in timing.marks:
+        timing.dns += monotonic() - timing.marks.pop("dns")
+
+
+async def _on_dns_cache_hit(session, ctx, params) -> None:
+    if timing := _trace_ctx(ctx):
+        timing.dns_cache_hit = True
+
+
+async def _on_dns_cache_miss(session, ctx, params) -> None:
+    if timing := _trace_ctx(ctx):
+        timing.dns_cache_hit = False
+
+
+async def _on_connect_start(session, ctx, params) -> None:
+    if timing := _trace_ctx(ctx):
+        timing.marks["connect"] = monotonic()
+
+
+async def _on_connect_end(session, ctx, params) -> None:
+    if (timing := _trace_ctx(ctx)) and "connect" in timing.marks:
+        # DNS resolution happens inside connection setup; report it separately
+        elapsed = monotonic() - timing.marks.pop("connect")
+        timing.connect += max(0.0, elapsed - timing.dns)
+
+
+async def _on_connection_reused(session, ctx, params) -> None:
+    if timing := _trace_ctx(ctx):
+        timing.reused = True
+
+
+def _build_trace_config() -> aiohttp.TraceConfig:
+    """Return a TraceConfig feeding connection events into RequestTiming."""
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_connection_queued_start.append(_on_queued_start)
+    trace_config.on_connection_queued_end.append(_on_queued_end)
+    trace_config.on_dns_resolvehost_start.append(_on_dns_start)
+    trace_config.on_dns_resolvehost_end.append(_on_dns_end)
+    trace_config.on_dns_cache_hit.append(_on_dns_cache_hit)
+    trace_config.on_dns_cache_miss.append(_on_dns_cache_miss)
+    trace_config.on_connection_create_start.append(_on_connect_start)
+    trace_config.on_connection_create_end.append(_on_connect_end)
+    trace_config.on_connection_reuseconn.append(_on_connection_reused)
+    return trace_config
+
+
+class DirectLeaseTransport:
+    """HTTP transport dedicated to the DirectLease host.
+
+    Owns an aiohttp session with a keep-alive connection pool limited per
+    host, a DNS cache and compressed responses, so the detail requests of a
+    refresh reuse a handful of warm connections. Every request is timed per
+    phase (queued, DNS, connect, TTFB, body); the last samples and the
+    connection reuse counters are available through `stats()`.
+
+    When an existing session is passed in, it is used as-is (and not closed);
+    only TTFB and body times are measured then. A `session_factory` (such as
+    Home Assistant's `async_create_clientsession` bound to `hass`) creates
+    the owned session instead, with the trace config; it brings its own
+    connector, so the per-host limit is enforced by the transport and the
+    DNS cache and keep-alive follow that connector. Whoever built the
+    session, every request carries REQUEST_HEADERS: Home Assistant replaces
+    a session's default headers with its own User-Agent.
+    """
+
+    def __init__(
+        self,
+        session: aiohttp.ClientSession | None = None,
+        limit_per_host: int = DEFAULT_LIMIT_PER_HOST,
+        dns_cache_ttl: int = DEFAULT_DNS_CACHE_TTL,
+        keepalive_timeout: float = DEFAULT_KEEPALIVE_TIMEOUT,
+        session_factory: Callable[..., aiohttp.ClientSession] | None = None,
+    ) -> None:
+        """Initialize the transport; an owned session is created on first use."""
+        self._session = session
+        self._owns_session = session is None
+        self._session_factory = session_factory
+        self._slots = asyncio.Semaphore(limit_per_host) if session_factory else None
+        self.limit_per_host = limit_per_host
+        self.dns_cache_ttl = dns_cache_ttl
+        self.keepalive_timeout = keepalive_timeout
+        self._timeouts: dict[float, aiohttp.ClientTimeout] = {}
+        self._timings: deque[RequestTiming] = deque(maxlen=TIMING_SAMPLES)
+        self._histograms: dict[str, list[int]] = {}
+        self.total_requests = 0
+        self.connections_created = 0
+        self.connections_reused = 0
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """Return the session, creating the tuned one when needed."""
+        if self._session is None or self._session.closed:
+            if self._session_factory is not None:
+                self._session = self._session_factory(
+                    trace_configs=[_build_trace_config()],
+                )
+                _LOGGER.debug(
+                    f"Created DirectLease session from factory (limit per host "
+                    f"{self.limit_per_host})"
+                )
+            else:
+                connector = aiohttp.TCPConnector(
+                    limit_per_host=self.limit_per_host,
+                    ttl_dns_cache=self.dns_cache_ttl,
+                    keepalive_timeout=self.keepalive_timeout,
+                )
+                self._session = aiohttp.ClientSession(
+                    connector=connector,
+                    trace_configs=[_build_trace_config()],
+                )
+                _LOGGER.debug(
+                    f"Created DirectLease session (limit per host {self.limit_per_host}, "
+                    f"DNS cache {self.dns_cache_ttl}s, keep-alive {self.keepalive_timeout}s)"
+                )
+            self._owns_session = True
+        return self._session
+
+    def _timeout(self, seconds: float) -> aiohttp.ClientTimeout:
+        """Return a reusable ClientTimeout for a total timeout."""
+        timeout = self._timeouts.get(seconds)
+        if timeout is None:
+            timeout = self._timeouts[seconds] = aiohttp.ClientTimeout(total=seconds)
+        return timeout
+
+    @asynccontextmanager
+    async def get(
+        self,
+        url: str,
+        endpoint: str,
+        timeout: float,
+        headers: dict[str, str] | None = None,
+    ) -> AsyncIterator[aiohttp.ClientResponse]:
+        """GET `url` and yield the response; the body must be read inside the block.
+
+        Time spent inside the block counts as body time.
+        """
+        headers = {**REQUEST_HEADERS, **(headers or {})}
+
+        timing = RequestTiming(endpoint)
+        if self._slots is not None:
+            # Waiting for a free slot counts as waiting for a pooled connection
+            await self._slots.acquire()
+            timing.queued = monotonic() - timing.started
+        try:
+            async with self.session.get(
+                url,
+                headers=headers,
+                timeout=self._timeout(timeout),
+                trace_request_ctx=timing,
+            ) as response:
+                timing.ttfb = monotonic() - timing.started - timing.queued - timing.dns - timing.connect
+                timing.status = response.status
+                headers_at = monotonic()
+                yield response
+                timing.body = monotonic() - headers_at
+        finally:
+            if self._slots is not None:
+                self._slots.release()
+            timing.total = monotonic() - timing.started
+            self._record(timing)
+
+    def _record(self, timing: RequestTiming) -> None:
+        """Keep a finished request's timing and update reuse counters."""
+        timing.marks.clear()
+        self.total_requests += 1
+        if timing.reused:
+            self.connections_reused += 1
+        elif timing.connect or timing.dns:
+            self.connections_created += 1
+        self._timings.append(timing)
+        histogram = self._histograms.setdefault(timing.endpoint, [0] * (len(LATENCY_BUCKETS) + 1))
+        histogram[bisect_left(LATENCY_BUCKETS, timing.total * 1000)] += 1
+        _LOGGER.debug(f"DirectLease request timing: {timing.as_dict()}")
+
+    def timing_summary(self, endpoint: str | None = None) -> dict[str, dict[str, float]]:
+        """Return mean and p95 per phase (ms) over the recent samples."""
+        samples = [
+            timing for timing in self._timings
+            if endpoint is None or timing.endpoint == endpoint
+        ]
+        if not samples:
+            return {}
+        summary = {}
+        for phase in TIMING_PHASES:
+            values = sorted(getattr(timing, phase) for timing in samples)
+            summary[phase] = {
+                "mean": round(sum(values) / len(values) * 1000, 1),
+                "p95": round(values[min(len(values) - 1, int(len(values) * 0.95))] * 1000, 1),
+            }
+        return summary
+
+    def latency_histograms(self) -> dict[str, dict[str, int]]:
+        """Return the request count per total-latency bucket and endpoint since start."""
+        labels = [f"<={bound}ms" for bound in LATENCY_BUCKETS] + [f">{LATENCY_BUCKETS[-1]}ms"]
+        return {
+            endpoint: dict(zip(labels, counts))
+            for endpoint, counts in self._histograms.items()
+        }
+
+    def stats(self) -> dict[str, Any]:
+        """Return connection reuse counters and recent timing summaries."""
+        connections = self.connections_created + self.connections_reused
+        return {
+            "dedicated_session": self._owns_session,
+            "limit_per_host": self.limit_per_host,
+            "total_requests": self.total_requests,
+            "connections_created": self.connections_created,
+            "connections_reused": self.connections_reused,
+            "reuse_rate": round(self.connections_reused / connections, 3) if connections else None,
+            "timing_ms": {
+                endpoint: self.timing_summary(endpoint) for endpoint in ("places", "detail")
+            },
+        }
+
+    async def async_close(self) -> None:
+        """Close the session if this transport created it."""
+        if self._owns_session and self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
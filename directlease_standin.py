@@ -0,0 +1,334 @@
+"""Local stand-in for the DirectLease Tank Service API.
+
+Serves `/places` and `/places/{id}` under /Tankservice/v2 from a synthetic
+catalogue (seeded, any size) or from recorded fixtures, checks that every
+request carries an X-Checksum in the format the integration generates, and
+can inject latency, slow requests, server errors and 403 blocks. Point the
+integration at it with `FuelPriceAPI(base_url=...)` or
+`python fuel_price_sweep.py --base-url ...`. Run from the repository root:
+
+    python directlease_standin.py [--stations 4500] [--port 8765]
+        [--latency 0.05] [--slow-rate 0.02] [--error-rate 0.01]
+        [--forbidden-rate 0.01] [--places-file places.json]
+        [--details-file details.json]
+
+Benchmarks use it in-process:
+
+    standin = DirectLeaseStandIn(StandInConfig(stations=20000))
+    base_url = await standin.start()
+    ...
+    await standin.stop()
+
+or on a thread of its own, so its work does not show up as event-loop
+blocking of the code under test:
+
+    standin, base_url, stop = start_in_thread(StandInConfig(stations=20000))
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+
+from aiohttp import web
+
+API_PREFIX = "/Tankservice/v2"
+
+# <yyyymmdd>_<uuid4>/<unix timestamp>/<sha1 of the request path>
+CHECKSUM_PATTERN = re.compile(
+    r"^(?P<date>\d{8})_(?P<uuid>[0-9a-f]{8}-[0-9a-f]{4}-4[0-9a-f]{3}-[89ab][0-9a-f]{3}-[0-9a-f]{12})"
+    r"/(?P<timestamp>\d+)/(?P<hash>[0-9a-f]{40})$"
+)
+CHECKSUM_MAX_SKEW = 300  # seconds between the checksum timestamp and now
+
+BRANDS = ["Shell", "BP", "Esso", "TotalEnergies", "Tango", "Tinq", "Texaco", "Argos", "Gulf", "AVIA"]
+CITIES = ["Amsterdam", "Rotterdam", "Utrecht", "Hoorn", "Zwolle", "Eindhoven", "Groningen", "Breda"]
+
+# Population centres, where stations are denser
+CENTRES = [(52.37, 4.90), (51.92, 4.48), (52.09, 5.12), (52.64, 5.06), (51.44, 5.47), (53.22, 6.57)]
+
+# Fuel keys of a detail document with their typical price (tenths of a cent)
+FUEL_PRICES = {"e10": 1899, "euro98": 2049, "diesel": 1699, "autogas": 849}
+
+
+@dataclass
+class StandInConfig:
+    """Catalogue source and fault injection of the stand-in."""
+
+    stations: int = 4500
+    seed: int = 1
+    latency: float = 0.0  # seconds added to every detail request
+    places_latency: float = 0.0  # seconds added to every places request
+    jitter: float = 0.0  # uniform extra latency, seconds
+    slow_rate: float = 0.0  # share of detail requests that take slow_latency
+    slow_latency: float = 1.0  # seconds
+    error_rate: float = 0.0  # share of requests answered with a 500
+    forbidden_rate: float = 0.0  # share of requests answered with a 403
+    price_change_rate: float = 0.0  # chance a detail request finds a new price
+    validate_checksum: bool = True
+    gzip: bool = True
+    places_file: str | None = None  # recorded /places response (JSON list)
+    details_file: str | None = None  # recorded details (JSON object id -> document)
+
+
+def make_places(count, seed=1):
+    """Return `count` places spread over the Netherlands, denser around cities."""
+    rng = random.Random(seed)
+    places = []
+    for station_id in range(1, count + 1):
+        if rng.random() < 0.5:
+            lat, lng = rng.choice(CENTRES)
+            lat += rng.gauss(0, 0.12)
+            lng += rng.gauss(0, 0.18)
+        else:
+            lat = 50.75 + rng.random() * 2.8
+            lng = 3.35 + rng.random() * 3.85
+        places.append({
+            "id": station_id,
+            "lat": round(lat, 6),
+            "lng": round(lng, 6),
+            "brand": rng.choice(BRANDS),
+            "city": rng.choice(CITIES),
+            "logo": f"https://tankservice.app-it-up.com/logos/{station_id % 50}.png",
+            "fuels": sorted(rng.sample(list(FUEL_PRICES), rng.randint(2, 4))),
+        })
+    return places
+
+
+def make_detail(place, seed=1):
+    """Return a detail document for a catalogue place (deterministic per station)."""
+    rng = random.Random(seed * 1_000_003 + int(place["id"]))
+    fuels = place.get("fuels") or list(FUEL_PRICES)
+    services = rng.sample(["shop", "carwash", "unmanned", "toilet", "adblue"], rng.randint(0, 3))
+    opening = [{"Day": day, "Open": "06:00", "Close": "22:00", "types": ["fuel"]} for day in range(7)]
+    if "shop" in services:
+        opening.append({"Day": 0, "Open": "07:00", "Close": "21:00", "types": ["shop"]})
+    return {
+        "id": place["id"],
+        "name": f"{place.get('brand', 'Unknown')} {place.get('city', '')}".strip(),
+        "brand": place.get("brand", "Unknown"),
+        "address": f"Stationsweg {rng.randint(1, 200)}",
+        "city": place.get("city", ""),
+        "postalCode": f"{rng.randint(1000, 9999)}{rng.choice('ABCDEFGHJKLMNPRSTVWXZ')}{rng.choice('ABCDEFGHJKLMNPRSTVWXZ')}",
+        "lat": place["lat"],
+        "lng": place["lng"],
+        "fuels": [
+            {"key": key, "name": key.upper(), "price": FUEL_PRICES[key] + rng.randint(-120, 180)}
+            for key in fuels
+            if key in FUEL_PRICES
+        ],
+        "services": services,
+        "openingTimes": opening,
+    }
+
+
+def validate_checksum(header, raw_path, now=None):
+    """Return why an X-Checksum header is invalid for a request path, or None."""
+    if not header:
+        return "missing X-Checksum"
+    match = CHECKSUM_PATTERN.match(header)
+    if match is None:
+        return "malformed X-Checksum"
+    now = time.time() if now is None else now
+    timestamp = int(match["timestamp"])
+    if abs(now - timestamp) > CHECKSUM_MAX_SKEW:
+        return "X-Checksum timestamp out of range"
+    if abs((datetime.strptime(match["date"], "%Y%m%d") - datetime.fromtimestamp(timestamp)).days) > 1:
+        return "X-Checksum date does not match its timestamp"
+    base = f"{match['date']}_{match['uuid']}/{timestamp}//{raw_path.lstrip('/')}/X-Checksum"
+    if hashlib.sha1(base.encode("utf-8")).hexdigest() != match["hash"]:
+        return "X-Checksum hash does not match the request"
+    return None
+
+
+def load_fixtures(places_file, details_file=None):
+    """Load a recorded places list and (optionally) recorded detail documents."""
+    with open(places_file, encoding="utf-8") as source:
+        places = json.load(source)
+    details = {}
+    if details_file:
+        with open(details_file, encoding="utf-8") as source:
+            details = {int(station_id): detail for station_id, detail in json.load(source).items()}
+    return places, details
+
+
+class DirectLeaseStandIn:
+    """In-process aiohttp server imitating the Tank Service endpoints."""
+
+    def __init__(self, config=None):
+        """Build the catalogue; detail documents are generated on first request."""
+        self.config = config or StandInConfig()
+        if self.config.places_file:
+            self.places, self.details = load_fixtures(self.config.places_file, self.config.details_file)
+        else:
+            self.places, self.details = make_places(self.config.stations, self.config.seed), {}
+        self._by_id = {int(place["id"]): place for place in self.places}
+        self._places_body = json.dumps(self.places, separators=(",", ":")).encode("utf-8")
+        self._rng = random.Random(self.config.seed)
+        self._runner = None
+        self.base_url = None
+        self.counts = {"places": 0, "detail": 0, "not_found": 0, "errors": 0, "forbidden": 0, "bad_checksum": 0}
+
+    def app(self):
+        """Return the aiohttp application."""
+        app = web.Application()
+        app.router.add_get(f"{API_PREFIX}/places", self._async_places)
+        app.router.add_get(f"{API_PREFIX}/places/{{station_id}}", self._async_detail)
+        return app
+
+    async def start(self, host="127.0.0.1", port=0):
+        """Start serving and return the base URL (port 0 picks a free port)."""
+        self._runner = web.AppRunner(self.app(), access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        bound_host, bound_port = self._runner.addresses[0][:2]
+        self.base_url = f"http://{bound_host}:{bound_port}{API_PREFIX}"
+        return self.base_url
+
+    async def stop(self):
+        """Stop serving."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def reset_counts(self):
+        """Zero the request counters."""
+        for key in self.counts:
+            self.counts[key] = 0
+
+    async def _async_inject(self, request, latency):
+        """Apply checksum validation and fault injection; return a response to send instead."""
+        config = self.config
+        if config.validate_checksum:
+            reason = validate_checksum(request.headers.get("X-Checksum"), request.raw_path)
+            if reason is not None:
+                self.counts["bad_checksum"] += 1
+                return web.json_response({"error": reason}, status=403)
+        if config.jitter:
+            latency += self._rng.random() * config.jitter
+        if latency:
+            await asyncio.sleep(latency)
+        roll = self._rng.random()
+        if roll < config.forbidden_rate:
+            self.counts["forbidden"] += 1
+            return web.Response(status=403, text="Forbidden")
+        if roll < config.forbidden_rate + config.error_rate:
+            self.counts["errors"] += 1
+            return web.Response(status=500, text="Internal Server Error")
+        return None
+
+    async def _async_places(self, request):
+        """Serve the national places list."""
+        self.counts["places"] += 1
+        failure = await self._async_inject(request, self.config.places_latency)
+        if failure is not None:
+            return failure
+        response = web.Response(body=self._places_body, content_type="application/json")
+        if self.config.gzip:
+            response.enable_compression()
+        return response
+
+    async def _async_detail(self, request):
+        """Serve the detail document of one station."""
+        self.counts["detail"] += 1
+        latency = self.config.latency
+        if self.config.slow_rate and self._rng.random() < self.config.slow_rate:
+            latency = self.config.slow_latency
+        failure = await self._async_inject(request, latency)
+        if failure is not None:
+            return failure
+        try:
+            station_id = int(request.match_info["station_id"])
+        except ValueError:
+            station_id = None
+        detail = self.details.get(station_id)
+        if detail is None:
+            place = self._by_id.get(station_id)
+            if place is None:
+                self.counts["not_found"] += 1
+                return web.json_response({"error": "not found"}, status=404)
+            detail = self.details[station_id] = make_detail(place, self.config.seed)
+        if self.config.price_change_rate and self._rng.random() < self.config.price_change_rate:
+            for fuel in detail.get("fuels", []):
+                fuel["price"] = max(1, fuel["price"] + self._rng.choice((-1, 1)) * self._rng.randint(5, 40))
+        return web.json_response(detail)
+
+
+def start_in_thread(config=None):
+    """Run a stand-in on its own event loop thread; return (stand-in, base URL, stop)."""
+    standin = DirectLeaseStandIn(config)
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, name="directlease-standin", daemon=True)
+    thread.start()
+    base_url = asyncio.run_coroutine_threadsafe(standin.start(), loop).result()
+
+    def stop():
+        asyncio.run_coroutine_threadsafe(standin.stop(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+    return standin, base_url, stop
+
+
+def parse_args():
+    """Parse the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--stations", type=int, default=4500, help="synthetic catalogue size")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds per detail request")
+    parser.add_argument("--places-latency", type=float, default=0.0, help="seconds per places request")
+    parser.add_argument("--jitter", type=float, default=0.0, help="extra random latency, seconds")
+    parser.add_argument("--slow-rate", type=float, default=0.0, help="share of slow detail requests")
+    parser.add_argument("--slow-latency", type=float, default=1.0, help="seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of 500 responses")
+    parser.add_argument("--forbidden-rate", type=float, default=0.0, help="share of 403 responses")
+    parser.add_argument("--price-change-rate", type=float, default=0.0, help="chance a detail request sees a new price")
+    parser.add_argument("--no-checksum", action="store_true", help="accept requests without a valid X-Checksum")
+    parser.add_argument("--no-gzip", action="store_true", help="serve the places list uncompressed")
+    parser.add_argument("--places-file", help="recorded /places response (JSON list)")
+    parser.add_argument("--details-file", help="recorded details (JSON object station id -> document)")
+    return parser.parse_args()
+
+
+async def serve(args):
+    """Run the stand-in until interrupted, printing request counts every minute."""
+    standin = DirectLeaseStandIn(StandInConfig(
+        stations=args.stations,
+        seed=args.seed,
+        latency=args.latency,
+        places_latency=args.places_latency,
+        jitter=args.jitter,
+        slow_rate=args.slow_rate,
+        slow_latency=args.slow_latency,
+        error_rate=args.error_rate,
+        forbidden_rate=args.forbidden_rate,
+        price_change_rate=args.price_change_rate,
+        validate_checksum=not args.no_checksum,
+        gzip=not args.no_gzip,
+        places_file=args.places_file,
+        details_file=args.details_file,
+    ))
+    base_url = await standin.start(args.host, args.port)
+    print(f"Serving {len(standin.places)} stations at {base_url}")
+    try:
+        while True:
+            await asyncio.sleep(60)
+            print(f"Requests: {standin.counts}")
+    finally:
+        await standin.stop()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(serve(parse_args()))
+    except KeyboardInterrupt:
+        pass
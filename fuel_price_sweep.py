@@ -0,0 +1,15 @@
+"""Command-line price sweeps across many postcodes.
+
+Runs the integration's sweep (custom_components/nl_fuel_prices/sweep.py)
+without Home Assistant: the package is loaded as a bare namespace, so its
+Home Assistant setup is never imported. Run from the repository root:
+
+    python fuel_price_sweep.py postcodes.csv --format jsonl --output prices.jsonl
+"""
+import sys
+
+from _standalone import load_module
+
+
+if __name__ == "__main__":
+    sys.exit(load_module("sweep").main())
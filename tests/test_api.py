@@ -0,0 +1,229 @@
+"""Tests for the API client against the local DirectLease stand-in."""
+import asyncio
+from datetime import datetime
+from time import monotonic, time
+
+import pytest
+
+from directlease_standin import DirectLeaseStandIn, StandInConfig
+from nl_fuel_prices.api import (
+    DETAIL_FETCHED_AT,
+    FUEL_TYPE_MAP,
+    HEDGE_MIN_SAMPLES,
+    FuelPriceAPI,
+    FuelPriceAPIError,
+)
+from nl_fuel_prices.cache import TTLCache
+from nl_fuel_prices.rate_limiter import (
+    PRIORITY_BACKGROUND,
+    PRIORITY_CHEAPEST,
+    PRIORITY_DETAIL,
+)
+
+
+def run_with_standin(test, **config):
+    """Run `test(api, standin)` against a fresh stand-in and client."""
+
+    async def _run():
+        standin = DirectLeaseStandIn(StandInConfig(stations=200, **config))
+        base_url = await standin.start()
+        api = FuelPriceAPI(base_url=base_url)
+        try:
+            return await test(api, standin)
+        finally:
+            await api.async_close()
+            await standin.stop()
+
+    return asyncio.run(_run())
+
+
+def test_joiner_promotes_a_background_flight():
+    async def _test(api, standin):
+        api.limiter.set_budget(36000, 1)  # a token every 0.1s
+        assert api.limiter.try_acquire()
+        finished = []
+
+        async def _detail(station_id, priority):
+            await api.async_get_station_detail(station_id, priority)
+            finished.append((station_id, priority))
+
+        background = asyncio.ensure_future(_detail(1, PRIORITY_BACKGROUND))
+        await asyncio.sleep(0.01)
+        sweep = asyncio.ensure_future(_detail(2, PRIORITY_DETAIL))
+        await asyncio.sleep(0.01)
+        cheapest = asyncio.ensure_future(_detail(1, PRIORITY_CHEAPEST))
+        await asyncio.wait_for(asyncio.gather(background, sweep, cheapest), 5)
+        return finished, standin.counts["detail"], api.coalesced_requests
+
+    finished, requests, coalesced = run_with_standin(_test)
+    assert finished[-1] == (2, PRIORITY_DETAIL)
+    assert requests == 2
+    assert coalesced == 1
+
+
+def test_latency_budget_dropping_every_detail_raises():
+    async def _test(api, standin):
+        try:
+            await api.get_fuel_prices(52.37, 4.90, 50, "euro95", latency_budget=0.05)
+        except FuelPriceAPIError as err:
+            return err
+        return None
+
+    error = run_with_standin(_test, latency=1.0)
+    assert error is not None
+    assert "latency budget" in str(error)
+
+
+def test_latency_budget_keeps_the_details_that_arrived():
+    async def _test(api, standin):
+        return await api.get_fuel_prices(52.37, 4.90, 50, "euro95", latency_budget=2)
+
+    stations = run_with_standin(_test, latency=0.01)
+    assert stations
+    assert stations == sorted(stations, key=lambda station: station.price)
+
+
+def priced_fuel_type(api, detail):
+    """Return a fuel type the detail document has a price for."""
+    return next(
+        fuel_type for fuel_type, price in zip(FUEL_TYPE_MAP, api.station_prices(detail)) if price
+    )
+
+
+def test_station_last_updated_is_the_fetch_time():
+    async def _test(api, standin):
+        catalogue = await api.async_get_places()
+        detail = await api.async_get_station_detail(1)
+        detail[DETAIL_FETCHED_AT] -= 3600  # as if crawled an hour ago
+        station_info = catalogue.station(catalogue.row_of("1"), 0.0)
+        return detail, api._build_station(station_info, detail, priced_fuel_type(api, detail))
+
+    detail, station = run_with_standin(_test)
+    assert datetime.fromisoformat(station.last_updated) == datetime.fromtimestamp(
+        detail[DETAIL_FETCHED_AT]
+    )
+
+
+def test_crawled_details_serve_lookups_within_their_max_age():
+    async def _test(api, standin):
+        api.crawled_details = TTLCache(3600)
+        detail = await api.async_get_station_detail(1)
+        fuel_type = priced_fuel_type(api, detail)
+        # Crawled ten minutes ago, without a price for any fuel
+        api.crawled_details.set("1", {**detail, "fuels": [], DETAIL_FETCHED_AT: time() - 600})
+        api._detail_cache.clear()
+        standin.reset_counts()
+        served = await api.async_get_station_detail(1, crawled_max_age=900)
+        crawled_price = await api.async_get_station_price(1, fuel_type, crawled_max_age=900)
+        requests = standin.counts["detail"]
+        live_price = await api.async_get_station_price(1, fuel_type, crawled_max_age=300)
+        return served, crawled_price, live_price, requests, standin.counts["detail"]
+
+    served, crawled_price, live_price, requests_before, requests_after = run_with_standin(_test)
+    assert served["fuels"] == []
+    assert crawled_price is None
+    assert requests_before == 0
+    # Too old for a five-minute max age: fetched live
+    assert live_price is not None
+    assert requests_after == 1
+
+
+def test_lookups_without_a_max_age_skip_crawled_details():
+    async def _test(api, standin):
+        api.crawled_details = TTLCache(3600)
+        detail = await api.async_get_station_detail(1)
+        api.crawled_details.set("1", {**detail, "fuels": []})
+        api._detail_cache.clear()
+        standin.reset_counts()
+        served = await api.async_get_station_detail(1)
+        return served, standin.counts["detail"]
+
+    served, requests = run_with_standin(_test)
+    assert served["fuels"]
+    assert requests == 1
+
+
+def delay_detail_requests(standin, *latencies):
+    """Give the stand-in's next detail requests these latencies (then none)."""
+    inject = standin._async_inject
+    queue = list(latencies)
+
+    async def _async_inject(request, latency):
+        if "/places/" in request.path and queue:
+            latency = queue.pop(0)
+        return await inject(request, latency)
+
+    standin._async_inject = _async_inject
+
+
+def learn_latency(api, seconds):
+    """Fill the latency samples so the hedging threshold is `seconds`."""
+    api._detail_latencies.extend([seconds] * HEDGE_MIN_SAMPLES)
+
+
+def test_detail_requests_are_not_hedged_without_samples():
+    async def _test(api, standin):
+        delay_detail_requests(standin, 0.2)
+        await api.async_get_station_detail(1, hedge=True)
+        return api.hedged_requests, standin.counts["detail"]
+
+    assert run_with_standin(_test) == (0, 1)
+
+
+def test_slow_detail_request_is_hedged():
+    async def _test(api, standin):
+        learn_latency(api, 0.02)
+        delay_detail_requests(standin, 0.5)
+        started = monotonic()
+        detail = await api.async_get_station_detail(1, hedge=True)
+        return detail, monotonic() - started, api, standin.counts["detail"]
+
+    detail, elapsed, api, requests = run_with_standin(_test)
+    assert detail["id"] == 1
+    assert elapsed < 0.3
+    assert requests == 2
+    assert (api.hedged_requests, api.hedge_wins) == (1, 1)
+    # The losing primary counts as a slow sample instead of being left out
+    assert len(api._detail_latencies) == HEDGE_MIN_SAMPLES + 2
+    assert max(api._detail_latencies) >= 0.02
+
+
+def test_hedged_request_takes_the_first_response():
+    async def _test(api, standin):
+        learn_latency(api, 0.02)
+        delay_detail_requests(standin, 0.1, 0.5)
+        started = monotonic()
+        await api.async_get_station_detail(1, hedge=True)
+        return monotonic() - started, api, standin.counts["detail"]
+
+    elapsed, api, requests = run_with_standin(_test)
+    assert elapsed < 0.3
+    assert requests == 2
+    assert (api.hedged_requests, api.hedge_wins) == (1, 0)
+
+
+def test_expired_latency_budget_cancels_abandoned_requests():
+    async def _test(api, standin):
+        with pytest.raises(FuelPriceAPIError):
+            await api.get_fuel_prices(52.37, 4.90, 50, "euro95", latency_budget=0.05)
+        await asyncio.sleep(0.01)
+        return api
+
+    api = run_with_standin(_test, latency=1.0)
+    assert not api._inflight
+    assert api._detail_latencies
+    assert min(api._detail_latencies) == pytest.approx(0.05, abs=0.02)
+
+
+def test_cancelled_caller_leaves_a_shared_request_running():
+    async def _test(api, standin):
+        delay_detail_requests(standin, 0.1)
+        first = asyncio.ensure_future(api.async_get_station_detail(1))
+        second = asyncio.ensure_future(api.async_get_station_detail(1))
+        await asyncio.sleep(0.02)
+        first.cancel()
+        return await second, standin.counts["detail"]
+
+    detail, requests = run_with_standin(_test)
+    assert detail["id"] == 1
+    assert requests == 1
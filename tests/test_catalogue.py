@@ -0,0 +1,110 @@
+"""Tests for the columnar station catalogue against brute force."""
+import logging
+import random
+
+import pytest
+
+from nl_fuel_prices import catalogue as catalogue_module
+from nl_fuel_prices.catalogue import CatalogueBuilder, StationCatalogue, haversine
+
+LOCATIONS = [(52.37, 4.90), (51.92, 4.48), (53.22, 6.57), (50.80, 5.70)]
+
+
+@pytest.fixture(scope="module")
+def places():
+    rng = random.Random(7)
+    return [
+        {
+            "id": station_id,
+            "lat": 50.75 + rng.random() * 2.8,
+            "lng": 3.35 + rng.random() * 3.85,
+            "brand": rng.choice(["Shell", "BP", "Esso"]),
+            "city": rng.choice(["A", "B"]),
+        }
+        for station_id in range(1, 3001)
+    ]
+
+
+@pytest.fixture(scope="module")
+def catalogue(places):
+    return StationCatalogue.from_places(places)
+
+
+def brute_force(places, latitude, longitude, radius):
+    """Return sorted (distance, id) of every place within the radius."""
+    return sorted(
+        (haversine(latitude, longitude, place["lat"], place["lng"]), place["id"])
+        for place in places
+        if haversine(latitude, longitude, place["lat"], place["lng"]) <= radius
+    )
+
+
+def as_ids(catalogue, matches):
+    return sorted((distance, catalogue.ids[row]) for distance, row in matches)
+
+
+@pytest.mark.parametrize("latitude,longitude", LOCATIONS)
+@pytest.mark.parametrize("radius", [1, 5, 25, 100])
+def test_radius_query_matches_brute_force(places, catalogue, latitude, longitude, radius):
+    expected = brute_force(places, latitude, longitude, radius)
+    assert as_ids(catalogue, catalogue.query_radius(latitude, longitude, radius)) == expected
+
+
+@pytest.mark.parametrize("latitude,longitude", LOCATIONS)
+def test_band_contains_every_match(catalogue, latitude, longitude):
+    view = catalogue.band(latitude, 25)
+    rows = range(view.start, view.start + len(view.ids))
+    for _, row in catalogue.query_radius(latitude, longitude, 25):
+        assert row in rows
+
+
+@pytest.mark.parametrize("latitude,longitude", LOCATIONS)
+@pytest.mark.parametrize("radius,count", [(5, 1), (10, 5), (25, 20), (100, 50), (10, 0)])
+def test_nearest_equals_sorted_radius_query(catalogue, latitude, longitude, radius, count):
+    expected = sorted(catalogue.query_radius(latitude, longitude, radius))[:count]
+    assert catalogue.nearest(latitude, longitude, radius, count) == expected
+
+
+def test_query_radius_many_matches_single_queries(catalogue):
+    queries = [(lat, lon, radius) for lat, lon in LOCATIONS for radius in (5, 25)]
+    for matches, query in zip(catalogue.query_radius_many(queries), queries):
+        expected = catalogue.query_radius(*query)
+        assert [row for _, row in matches] == [row for _, row in expected]
+        assert [distance for distance, _ in matches] == pytest.approx(
+            [distance for distance, _ in expected]
+        )
+
+
+def test_builder_skips_invalid_and_duplicate_places():
+    builder = CatalogueBuilder()
+    for place in (
+        {"id": 1, "lat": 52.0, "lng": 5.0},
+        {"id": 1, "lat": 52.1, "lng": 5.1},
+        {"id": "x", "lat": 52.0, "lng": 5.0},
+        {"id": 2, "lat": None, "lng": 5.0},
+        {"id": 3, "lat": "51.5", "lng": "4.5", "brand": "BP"},
+    ):
+        builder.add(place)
+    catalogue = builder.build()
+    assert list(catalogue.ids) == [3, 1]  # ordered by latitude
+    assert builder.skipped == 3
+    assert catalogue.station(catalogue.row_of("3")).brand == "BP"
+    assert 2 not in catalogue
+
+
+def test_query_radius_many_without_numpy(monkeypatch, places, catalogue):
+    monkeypatch.setattr(catalogue_module, "np", None)
+    queries = [(lat, lon, radius) for lat, lon in LOCATIONS for radius in (5, 25)]
+    results = catalogue.query_radius_many(queries)
+    for matches, (latitude, longitude, radius) in zip(results, queries):
+        assert as_ids(catalogue, matches) == brute_force(places, latitude, longitude, radius)
+
+
+def test_numpy_fallback_is_logged_once(monkeypatch, caplog, catalogue):
+    monkeypatch.setattr(catalogue_module, "np", None)
+    monkeypatch.setattr(catalogue_module, "_fallback_logged", False)
+    queries = [(lat, lon, 5) for lat, lon in LOCATIONS]
+    with caplog.at_level(logging.DEBUG, logger=catalogue_module.__name__):
+        catalogue.query_radius_many(queries)
+        catalogue.query_radius_many(queries)
+    assert caplog.text.count("numpy is not installed") == 1
@@ -0,0 +1,75 @@
+"""Tests for the DirectLease circuit breaker."""
+import pytest
+
+from nl_fuel_prices import circuit_breaker
+from nl_fuel_prices.circuit_breaker import (
+    STATE_CLOSED,
+    STATE_HALF_OPEN,
+    STATE_OPEN,
+    CircuitBreaker,
+)
+
+
+@pytest.fixture
+def breaker(monkeypatch, clock):
+    monkeypatch.setattr(circuit_breaker, "monotonic", clock)
+    # Backoff without jitter: the upper end of the equal-jitter range
+    monkeypatch.setattr(circuit_breaker.random, "uniform", lambda low, high: high)
+    return CircuitBreaker(failure_threshold=3, base_backoff=60, max_backoff=240)
+
+
+def test_opens_after_consecutive_failures(breaker):
+    for _ in range(2):
+        breaker.record_failure()
+        assert breaker.state == STATE_CLOSED
+    breaker.record_failure()
+    assert breaker.state == STATE_OPEN
+    assert not breaker.allow_request()
+    assert breaker.total_rejected == 1
+
+
+def test_success_resets_the_failure_count(breaker):
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == STATE_CLOSED
+
+
+def test_half_open_allows_a_single_probe(breaker, clock):
+    for _ in range(3):
+        breaker.record_failure()
+    clock.advance(60)
+    assert breaker.state == STATE_HALF_OPEN
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+    breaker.record_success()
+    assert breaker.state == STATE_CLOSED
+    assert breaker.allow_request()
+
+
+def test_failed_probe_doubles_the_backoff(breaker, clock):
+    for _ in range(3):
+        breaker.record_failure()
+    assert breaker.retry_in() == 60
+    clock.advance(60)
+    assert breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == STATE_OPEN
+    assert breaker.retry_in() == 120
+    clock.advance(120)
+    breaker.allow_request()
+    breaker.record_failure()
+    clock.advance(240)
+    breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.retry_in() == 240  # capped at max_backoff
+
+
+def test_aborted_probe_frees_the_slot(breaker, clock):
+    for _ in range(3):
+        breaker.record_failure()
+    clock.advance(60)
+    assert breaker.allow_request()
+    breaker.abort_probe()
+    assert breaker.allow_request()
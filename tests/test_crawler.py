@@ -0,0 +1,84 @@
+"""Tests for the background station crawler's schedule."""
+import pytest
+
+from nl_fuel_prices import crawler
+from nl_fuel_prices.catalogue import StationCatalogue
+from nl_fuel_prices.crawler import (
+    CRAWL_BASE_INTERVAL,
+    CRAWL_MAX_INTERVAL,
+    CRAWL_MIN_INTERVAL,
+    StationCrawler,
+    crawl_interval,
+)
+
+
+def test_crawl_interval_grows_with_distance():
+    assert crawl_interval(0, 0) == CRAWL_BASE_INTERVAL
+    assert crawl_interval(10, 0) == 2 * CRAWL_BASE_INTERVAL
+    assert crawl_interval(None, 0) == CRAWL_MAX_INTERVAL
+
+
+def test_crawl_interval_shrinks_with_volatility():
+    assert crawl_interval(0, 1) == CRAWL_MIN_INTERVAL
+    assert CRAWL_MIN_INTERVAL < crawl_interval(0, 0.5) < CRAWL_BASE_INTERVAL
+
+
+def test_near_stations_are_due_first(monkeypatch, clock):
+    monkeypatch.setattr(crawler, "monotonic", clock)
+    station_crawler = StationCrawler(api=None)
+    # Station 1 at the location, 2 just outside the radius, 3 far away
+    station_crawler._catalogue = StationCatalogue.from_places([
+        {"id": 1, "lat": 52.0, "lng": 5.0},
+        {"id": 2, "lat": 52.1, "lng": 5.0},
+        {"id": 3, "lat": 53.5, "lng": 5.0},
+    ])
+    station_crawler.set_locations([(52.0, 5.0, 5)])
+    station_crawler._rebuild_queue()
+
+    due = {station_id: at for at, _, station_id in station_crawler._queue}
+    assert due[1] == clock.now
+    assert clock.now < due[2] < due[3]
+    assert station_crawler._states[3].excess_km is None
+    assert station_crawler.stats()["overdue"] == 1
+
+
+def _crawler_around(monkeypatch, clock, budget, stations):
+    """Return a crawler with `stations` places on a line north of its location."""
+    monkeypatch.setattr(crawler, "monotonic", clock)
+    station_crawler = StationCrawler(api=None, budget=budget)
+    station_crawler._catalogue = StationCatalogue.from_places([
+        {"id": station_id, "lat": 52.0 + station_id * 0.002, "lng": 5.0}
+        for station_id in range(1, stations + 1)
+    ])
+    station_crawler.set_locations([(52.0, 5.0, 5)])
+    station_crawler._rebuild_queue()
+    return station_crawler
+
+
+def hourly_rate(station_crawler):
+    return sum(3600 / state.interval for state in station_crawler._states.values())
+
+
+def test_schedule_within_budget_is_not_stretched(monkeypatch, clock):
+    station_crawler = _crawler_around(monkeypatch, clock, 1000, 200)
+    assert station_crawler.stretch_inside == station_crawler.stretch_outside == 1
+    assert hourly_rate(station_crawler) == pytest.approx(station_crawler.demand)
+
+
+def test_short_budget_stretches_outside_stations_first(monkeypatch, clock):
+    # About 22 stations inside the 5km radius, 200 in total
+    station_crawler = _crawler_around(monkeypatch, clock, 60, 200)
+    assert station_crawler.demand > 60
+    assert station_crawler.stretch_inside == 1
+    assert station_crawler.stretch_outside > 1
+    assert hourly_rate(station_crawler) == pytest.approx(60)
+    inside = [state for state in station_crawler._states.values() if state.excess_km == 0]
+    assert all(state.interval == CRAWL_BASE_INTERVAL for state in inside)
+
+
+def test_inside_stations_keep_a_share_of_a_short_budget(monkeypatch, clock):
+    station_crawler = _crawler_around(monkeypatch, clock, 10, 200)
+    assert station_crawler.stretch_inside > 1
+    assert station_crawler.stretch_outside > 1
+    assert hourly_rate(station_crawler) == pytest.approx(10)
+    assert station_crawler.stats()["stretch_inside"] == round(station_crawler.stretch_inside, 2)
@@ -0,0 +1,60 @@
+"""Tests for the diagnostics payload and notification delivery counters."""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from nl_fuel_prices.api import FuelPriceAPI  # noqa: E402
+from nl_fuel_prices.const import CONF_LOCATION_LAT, DOMAIN  # noqa: E402
+from nl_fuel_prices.delivery_stats import DeliveryStats  # noqa: E402
+from nl_fuel_prices.diagnostics import async_get_config_entry_diagnostics  # noqa: E402
+
+
+def make_entry():
+    """Return a config entry stand-in."""
+    return SimpleNamespace(
+        entry_id="failed", title="Home", data={CONF_LOCATION_LAT: 52.1}, options={}
+    )
+
+
+def test_diagnostics_without_any_shared_state():
+    hass = SimpleNamespace(data={})
+
+    payload = asyncio.run(async_get_config_entry_diagnostics(hass, make_entry()))
+
+    assert payload["entry"]["title"] == "Home"
+    assert payload["entry"]["data"][CONF_LOCATION_LAT] != 52.1
+    assert payload["coordinator"] is None
+    assert payload["api"] is None
+    assert payload["scheduler"] is None
+
+
+def test_diagnostics_of_an_entry_that_failed_to_load():
+    async def _run():
+        api = FuelPriceAPI()
+        try:
+            hass = SimpleNamespace(data={DOMAIN: {"api": api}})
+            return await async_get_config_entry_diagnostics(hass, make_entry())
+        finally:
+            await api.async_close()
+
+    payload = asyncio.run(_run())
+
+    assert payload["coordinator"] is None
+    assert payload["api"]["base_url"]
+    assert payload["rate_limiter"]["budget_per_hour"] > 0
+
+
+def test_delivery_stats_count_queued_notifications():
+    delivery = DeliveryStats()
+    delivery.record("notify.phone")
+    delivery.record("notify.phone", ValueError("unknown service"))
+    delivery.record("notify.tablet")
+
+    stats = delivery.as_dict()
+    assert stats["queued"] == 2
+    assert stats["failed"] == 1
+    assert stats["services"]["notify.phone"]["last_queued"] is not None
+    assert stats["services"]["notify.phone"]["last_error"] == "unknown service"
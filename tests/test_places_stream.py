@@ -0,0 +1,61 @@
+"""Tests for the incremental places list parser."""
+import json
+
+import pytest
+
+from nl_fuel_prices.places_stream import PLACE_FIELDS, PlacesStreamParser
+
+PLACES = [
+    {"id": 1, "lat": 52.1, "lng": 4.9, "brand": "Shell", "city": "Amsterdam", "logo": "x.png"},
+    {"id": 2, "lat": 51.9, "lng": 4.5, "brand": "Esso", "city": "Rotterdam éü", "fuels": ["e10"]},
+    {"id": 3, "lat": 52.0, "lng": 5.1, "brand": "Tinq", "city": "Utrecht"},
+]
+
+
+def parse_in_chunks(body: bytes, size: int) -> list:
+    parser = PlacesStreamParser()
+    for start in range(0, len(body), size):
+        parser.feed(body[start:start + size])
+    return parser.close()
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64, 100000])
+def test_any_chunk_boundary_gives_the_same_places(size):
+    body = json.dumps(PLACES, indent=1).encode("utf-8")
+    expected = [{key: place[key] for key in PLACE_FIELDS} for place in PLACES]
+    assert parse_in_chunks(body, size) == expected
+
+
+def test_multibyte_characters_split_across_chunks():
+    body = json.dumps(PLACES, ensure_ascii=False).encode("utf-8")
+    split = body.index("é".encode("utf-8")) + 1  # inside the two-byte sequence
+    parser = PlacesStreamParser()
+    parser.feed(body[:split])
+    parser.feed(body[split:])
+    assert parser.close()[1]["city"] == "Rotterdam éü"
+
+
+def test_sink_receives_full_objects():
+    received = []
+    parser = PlacesStreamParser(sink=received.append)
+    parser.feed(json.dumps(PLACES).encode("utf-8"))
+    assert parser.close() == []
+    assert received == PLACES
+
+
+def test_non_objects_are_skipped():
+    parser = PlacesStreamParser()
+    parser.feed(b'[1, "two", {"id": 3, "lat": 1, "lng": 2}, null]')
+    assert parser.close() == [{"id": 3, "lat": 1, "lng": 2}]
+    assert parser.skipped == 3
+
+
+@pytest.mark.parametrize(
+    "body",
+    [b'{"id": 1}', b'[{"id": 1}', b'[{"id": 1}] trailing', b'[{"id": 1,]'],
+)
+def test_invalid_bodies_raise(body):
+    parser = PlacesStreamParser()
+    with pytest.raises(ValueError):
+        parser.feed(body)
+        parser.close()
@@ -0,0 +1,50 @@
+"""Tests for price-planned detail requests."""
+from time import time
+
+from nl_fuel_prices.catalogue import StationCatalogue
+from nl_fuel_prices.planner import PriceBook, exploration_slots, plan_candidates
+
+# Ten stations along a meridian, about 1.1 km apart (id = distance rank)
+CATALOGUE = StationCatalogue.from_places(
+    [{"id": station_id, "lat": 52.0 + station_id * 0.01, "lng": 5.0} for station_id in range(1, 11)]
+)
+MATCHES = CATALOGUE.query_radius(52.0, 5.0, 50)
+
+
+def planned_ids(prices, count=5):
+    return [CATALOGUE.ids[row] for _, row in plan_candidates(CATALOGUE, MATCHES, prices, "euro95", count)]
+
+
+def test_exploration_slots():
+    assert [exploration_slots(count) for count in (0, 1, 2, 3, 5, 10, 20)] == [0, 0, 1, 1, 2, 4, 8]
+
+
+def test_without_prices_the_nearest_stations_are_planned():
+    assert planned_ids(PriceBook()) == [1, 2, 3, 4, 5]
+
+
+def test_cheapest_known_stations_fill_all_but_the_exploration_quota():
+    prices = PriceBook()
+    for station_id, price in ((10, 1.70), (9, 1.75), (8, 1.80), (7, 1.90), (6, 1.95)):
+        prices.record("euro95", station_id, price)
+    # Three exploit slots by price, two exploration slots for the nearest unseen
+    assert planned_ids(prices) == [10, 9, 8, 1, 2]
+
+
+def test_stalest_prices_are_explored_once_every_station_is_known():
+    prices = PriceBook()
+    now = time()
+    for station_id in range(1, 11):
+        prices.record("euro95", station_id, 2.0 - station_id / 100, observed=now - station_id)
+    # Cheapest three exploit, then the two oldest observations not already chosen
+    assert planned_ids(prices) == [10, 9, 8, 7, 6]
+    prices.record("euro95", 1, 1.99, observed=now - 1000)
+    assert planned_ids(prices)[3] == 1
+
+
+def test_prices_expire_after_max_age():
+    prices = PriceBook(max_age=60)
+    prices.record("euro95", 4, 1.5, observed=time() - 61)
+    assert prices.get("euro95", 4) is None
+    assert len(prices) == 1
+    assert planned_ids(prices) == [1, 2, 3, 4, 5]
@@ -0,0 +1,119 @@
+"""Tests for the integration-wide token bucket."""
+import asyncio
+
+from nl_fuel_prices import rate_limiter
+from nl_fuel_prices.rate_limiter import (
+    PRIORITY_BACKGROUND,
+    PRIORITY_CATALOGUE,
+    PRIORITY_CHEAPEST,
+    PRIORITY_DETAIL,
+    TokenBucket,
+    WaitTicket,
+)
+
+
+def test_burst_is_granted_immediately(monkeypatch, clock):
+    monkeypatch.setattr(rate_limiter, "monotonic", clock)
+    bucket = TokenBucket(60, 3)
+    assert [bucket.try_acquire() for _ in range(4)] == [True, True, True, False]
+    assert bucket.used_in_window() == 3
+
+
+def test_tokens_refill_at_budget_rate(monkeypatch, clock):
+    monkeypatch.setattr(rate_limiter, "monotonic", clock)
+    bucket = TokenBucket(60, 1)  # one token per minute
+    assert bucket.try_acquire()
+    clock.advance(30)
+    assert not bucket.try_acquire()
+    clock.advance(30)
+    assert bucket.try_acquire()
+
+
+def test_budget_window_forgets_old_requests(monkeypatch, clock):
+    monkeypatch.setattr(rate_limiter, "monotonic", clock)
+    bucket = TokenBucket(3600, 5)
+    for _ in range(5):
+        assert bucket.try_acquire()
+    clock.advance(3601)
+    assert bucket.used_in_window() == 0
+
+
+def test_waiters_are_served_by_priority():
+    async def run():
+        bucket = TokenBucket(36000, 1)  # a token every 0.1s
+        await bucket.acquire()
+        order = []
+
+        async def waiter(name, priority):
+            await bucket.acquire(priority)
+            order.append(name)
+
+        tasks = [
+            asyncio.ensure_future(waiter("background", PRIORITY_BACKGROUND)),
+            asyncio.ensure_future(waiter("detail", PRIORITY_DETAIL)),
+            asyncio.ensure_future(waiter("cheapest", PRIORITY_CHEAPEST)),
+            asyncio.ensure_future(waiter("catalogue", PRIORITY_CATALOGUE)),
+        ]
+        await asyncio.wait_for(asyncio.gather(*tasks), 2)
+        return order
+
+    assert asyncio.run(run()) == ["cheapest", "catalogue", "detail", "background"]
+
+
+def test_cancelled_waiter_does_not_take_a_token():
+    async def run():
+        bucket = TokenBucket(36000, 1)
+        await bucket.acquire()
+        cancelled = asyncio.ensure_future(bucket.acquire(PRIORITY_CHEAPEST))
+        kept = asyncio.ensure_future(bucket.acquire(PRIORITY_DETAIL))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        await asyncio.wait_for(kept, 1)
+        return bucket.total_granted
+
+    assert asyncio.run(run()) == 2
+
+
+def test_lowering_the_budget_caps_the_burst(monkeypatch, clock):
+    monkeypatch.setattr(rate_limiter, "monotonic", clock)
+    bucket = TokenBucket(600, 10)
+    bucket.set_budget(60, 2)
+    assert bucket.stats()["tokens_available"] == 2
+    assert bucket.rate == 60 / 3600
+
+
+def test_raising_the_budget_wakes_a_waiter_sooner():
+    async def run():
+        bucket = TokenBucket(1, 1)  # next token in an hour
+        await bucket.acquire()
+        waiter = asyncio.ensure_future(bucket.acquire(PRIORITY_DETAIL))
+        await asyncio.sleep(0)
+        bucket.set_budget(36000)  # a token every 0.1s
+        await asyncio.wait_for(waiter, 1)
+        return bucket.total_granted
+
+    assert asyncio.run(run()) == 2
+
+
+def test_promoted_waiter_moves_up_the_queue():
+    async def run():
+        bucket = TokenBucket(36000, 1)
+        await bucket.acquire()
+        order = []
+        ticket = WaitTicket(PRIORITY_BACKGROUND)
+
+        async def waiter(name, priority=PRIORITY_DETAIL, ticket=None):
+            await bucket.acquire(priority, ticket)
+            order.append(name)
+
+        tasks = [
+            asyncio.ensure_future(waiter("background", ticket=ticket)),
+            asyncio.ensure_future(waiter("detail")),
+        ]
+        await asyncio.sleep(0)
+        bucket.promote(ticket, PRIORITY_CHEAPEST)
+        assert bucket.stats()["waiting"] == 2
+        await asyncio.wait_for(asyncio.gather(*tasks), 2)
+        return order
+
+    assert asyncio.run(run()) == ["background", "detail"]
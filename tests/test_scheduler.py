@@ -0,0 +1,119 @@
+"""Tests for the time-of-day scheduler's coalescing."""
+import asyncio
+from datetime import datetime, time, timedelta, timezone
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from homeassistant.util import dt as dt_util  # noqa: E402
+
+from nl_fuel_prices import scheduler  # noqa: E402
+from nl_fuel_prices.scheduler import FuelPriceScheduler  # noqa: E402
+
+
+class FakeHass:
+    """Collect the tasks the scheduler creates."""
+
+    def __init__(self):
+        self.tasks = []
+
+    def async_create_task(self, coro):
+        self.tasks.append(coro)
+
+    def run_tasks(self):
+        """Run the collected tasks to completion."""
+
+        async def _run():
+            await asyncio.gather(*self.tasks)
+
+        asyncio.run(_run())
+
+
+@pytest.fixture(autouse=True)
+def frozen_now(monkeypatch):
+    """Freeze the scheduler's clock well before the jobs' times of day."""
+    now = dt_util.as_local(datetime(2026, 1, 15, 0, 0, tzinfo=timezone.utc))
+    monkeypatch.setattr(dt_util, "now", lambda time_zone=None: now)
+    return now
+
+
+@pytest.fixture
+def timers(monkeypatch):
+    armed = []
+
+    def _track(hass, action, when):
+        armed.append(when)
+        return lambda: None
+
+    monkeypatch.setattr(scheduler, "async_track_point_in_time", _track)
+    return armed
+
+
+async def _action(scheduled_for):
+    """Job action without effect."""
+
+
+def _batch_recorder(batches):
+    async def _handler(jobs):
+        batches.append([job.job_id for _, job in jobs])
+
+    return _handler
+
+
+def test_jobs_in_the_window_are_batched(timers, frozen_now):
+    hass = FakeHass()
+    fuel_scheduler = FuelPriceScheduler(hass, coalesce_window=timedelta(minutes=5))
+    batches = []
+    fuel_scheduler.async_set_batch_handler("update", _batch_recorder(batches))
+    for job_id, minute in (("a", 0), ("b", 3), ("c", 10)):
+        fuel_scheduler.async_add_job(job_id, "update", "entry", time(7, minute), _action)
+
+    first = min(job.next_run for job in fuel_scheduler.get_jobs())
+    assert first.date() == frozen_now.date()
+    fuel_scheduler._async_fire(first)
+    hass.run_tasks()
+
+    assert batches == [["a", "b"]]
+    assert len(hass.tasks) == 1
+    assert timers[-1] == first.replace(minute=10)
+    runs = {job.job_id: job.next_run for job in fuel_scheduler.get_jobs()}
+    assert runs["a"] == first + timedelta(days=1)
+    assert runs["b"] == first.replace(minute=3) + timedelta(days=1)
+
+
+def test_one_timer_for_many_jobs(timers):
+    fuel_scheduler = FuelPriceScheduler(FakeHass())
+    for minute in range(30, 0, -1):
+        fuel_scheduler.async_add_job(f"job{minute}", "update", "entry", time(6, minute), _action)
+    assert timers[-1] == min(job.next_run for job in fuel_scheduler.get_jobs())
+    assert dt_util.as_local(timers[-1]).minute == 1
+
+
+def test_removed_jobs_do_not_fire(timers):
+    hass = FakeHass()
+    fuel_scheduler = FuelPriceScheduler(hass)
+    fuel_scheduler.async_add_job("a", "update", "entry", time(7, 0), _action)
+    fuel_scheduler.async_add_job("b", "update", "other", time(7, 0), _action)
+    fuel_scheduler.async_remove_entry_jobs("entry")
+    fuel_scheduler._async_fire(fuel_scheduler.get_jobs()[0].next_run)
+    assert len(hass.tasks) == 1
+    hass.run_tasks()
+    assert [job.job_id for job in fuel_scheduler.get_jobs()] == ["b"]
+
+
+def test_unbatched_kinds_are_not_fired_early(timers, frozen_now):
+    hass = FakeHass()
+    fuel_scheduler = FuelPriceScheduler(hass, coalesce_window=timedelta(minutes=5))
+    fuel_scheduler.async_add_job("a", "report", "entry", time(7, 0), _action)
+    fuel_scheduler.async_add_job("b", "report", "entry", time(7, 3), _action)
+
+    first = min(job.next_run for job in fuel_scheduler.get_jobs())
+    fuel_scheduler._async_fire(first)
+    hass.run_tasks()
+
+    assert len(hass.tasks) == 1
+    runs = {job.job_id: job.next_run for job in fuel_scheduler.get_jobs()}
+    assert runs["b"] == first.replace(minute=3)
+    assert runs["b"].date() == frozen_now.date()
+    assert timers[-1] == runs["b"]
@@ -0,0 +1,103 @@
+"""Tests for the command-line price sweep."""
+import asyncio
+import csv
+import io
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from directlease_standin import DirectLeaseStandIn, StandInConfig
+from nl_fuel_prices.models import StationPrice
+from nl_fuel_prices.sweep import CSV_FIELDS, ResultWriter, SweepRow, async_sweep, parse_args, read_rows
+
+INPUT = """postcode,fuel_type,radius,latitude,longitude
+1012 ab,euro95,,52.3731,4.8926
+3011AA,DIESEL,25,51.9225,4.4792
+9999ZZ,kerosine,,,
+12AB,euro95,,,
+3511AA,lpg,five,,
+1012AB,euro98,,,
+"""
+
+ROOT = Path(__file__).parent.parent
+
+
+def make_station(rank):
+    return StationPrice(
+        id=str(rank), name=f"Station {rank}", brand="Shell", address="Hoofdstraat 1, Ede",
+        latitude=52.0, longitude=5.6, fuel_type="euro95", price=1.8 + rank / 100,
+        opening_hours="06:00-22:00", last_updated="2024-11-30T10:15:00", distance=float(rank),
+        rank=rank,
+    )
+
+
+def test_read_rows_normalizes_and_skips_invalid_rows():
+    rows = list(read_rows(io.StringIO(INPUT), 10))
+    assert rows == [
+        SweepRow(1, "1012AB", "euro95", 10.0, 52.3731, 4.8926),
+        SweepRow(2, "3011AA", "diesel", 25.0, 51.9225, 4.4792),
+        SweepRow(6, "1012AB", "euro98", 10.0),
+    ]
+
+
+def test_csv_writer_writes_one_line_per_station():
+    output = io.StringIO()
+    writer = ResultWriter(output, "csv")
+    row = SweepRow(3, "1012AB", "euro95", 10, 52.37, 4.89)
+    writer.write(row, [make_station(1), make_station(2)])
+    writer.write(row, [])
+    lines = list(csv.DictReader(io.StringIO(output.getvalue())))
+    assert list(lines[0]) == list(CSV_FIELDS)
+    assert [(line["row"], line["rank"], line["station_id"]) for line in lines] == [
+        ("3", "1", "1"), ("3", "2", "2"),
+    ]
+
+
+def test_jsonl_writer_writes_one_line_per_row():
+    output = io.StringIO()
+    writer = ResultWriter(output, "jsonl")
+    writer.write(SweepRow(1, "1012AB", "euro95", 10, 52.37, 4.89), [make_station(1)])
+    writer.write(SweepRow(2, "3011AA", "diesel", 5, 51.92, 4.48), [])
+    first, second = (json.loads(line) for line in output.getvalue().splitlines())
+    assert first["stations"] == [make_station(1).as_dict()]
+    assert (second["row"], second["stations"]) == (2, [])
+
+
+def test_sweep_against_the_standin():
+    rows = "postcode,fuel_type,latitude,longitude\n" + "".join(
+        f"1012AB,{fuel_type},52.37,4.89\n" for fuel_type in ("euro95", "diesel", "euro95")
+    )
+
+    async def _run():
+        standin = DirectLeaseStandIn(StandInConfig(stations=500))
+        base_url = await standin.start()
+        output = io.StringIO()
+        try:
+            args = parse_args(["-", "--format", "jsonl", "--base-url", base_url, "--batch-size", "2"])
+            report = await async_sweep(args, io.StringIO(rows), output)
+        finally:
+            await standin.stop()
+        return report, output.getvalue(), dict(standin.counts)
+
+    report, output, counts = asyncio.run(_run())
+    results = [json.loads(line) for line in output.splitlines()]
+    assert [result["row"] for result in results] == [1, 2, 3]
+    assert all(result["stations"] for result in results)
+    assert report["rows"] == 3
+    assert report["failed_rows"] == 0
+    assert report["stations"] == sum(len(result["stations"]) for result in results)
+    assert counts["places"] == 1
+    # Row 3 finds the details of row 1 in the detail cache
+    assert counts["detail"] == report["requests"]["detail"] <= 2 * 5
+
+
+def test_cli_help_runs_without_home_assistant():
+    environment = {key: value for key, value in os.environ.items() if key != "PYTHONPATH"}
+    result = subprocess.run(
+        [sys.executable, "fuel_price_sweep.py", "--help"],
+        cwd=ROOT, env=environment, capture_output=True, text=True, timeout=60,
+    )
+    assert result.returncode == 0, result.stderr
+    assert "usage: python fuel_price_sweep.py" in result.stdout
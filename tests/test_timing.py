@@ -0,0 +1,47 @@
+"""Tests for the refresh stage timings."""
+import asyncio
+
+import pytest
+
+from nl_fuel_prices import timing
+from nl_fuel_prices.timing import StageTimings, collect_spans, format_spans, span
+
+
+def test_spans_are_summed_per_stage(monkeypatch, clock):
+    monkeypatch.setattr(timing, "monotonic", clock)
+    with collect_spans() as spans:
+        for seconds in (0.1, 0.2):
+            with span("decode"):
+                clock.advance(seconds)
+    assert spans == {"decode": pytest.approx(0.3)}
+    assert format_spans(spans) == "decode 300.0ms"
+
+
+def test_spans_reach_nested_collectors_and_child_tasks():
+    async def run():
+        with collect_spans() as outer:
+            with collect_spans() as inner:
+                await asyncio.gather(asyncio.create_task(timed("details")))
+        return outer, inner
+
+    async def timed(stage):
+        with span(stage):
+            await asyncio.sleep(0)
+
+    outer, inner = asyncio.run(run())
+    assert set(outer) == set(inner) == {"details"}
+
+
+def test_span_outside_a_collector_is_a_noop():
+    with span("places"):
+        pass
+
+
+def test_stage_statistics():
+    timings = StageTimings(samples=10)
+    for milliseconds in range(1, 21):
+        timings.add({"places": milliseconds / 1000, "unknown": 1.0})
+    assert timings.stats() == {
+        "places": {"samples": 10, "p50": 16.0, "p95": 20.0, "max": 20.0}
+    }
+    assert timings.percentile("build", 0.5) is None
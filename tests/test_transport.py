@@ -0,0 +1,56 @@
+"""Tests for the DirectLease transport's session handling."""
+import asyncio
+
+import aiohttp
+
+from directlease_standin import DirectLeaseStandIn, StandInConfig
+from nl_fuel_prices.transport import REQUEST_HEADERS, DirectLeaseTransport
+
+
+def test_session_factory_gets_tracing_and_is_limited_per_host():
+    created = []
+    received = []
+
+    def _factory(**kwargs):
+        # Like Home Assistant: the session gets its own default headers
+        created.append(kwargs)
+        kwargs.pop("headers", None)
+        return aiohttp.ClientSession(headers={"User-Agent": "HomeAssistant/test"}, **kwargs)
+
+    async def _run():
+        standin = DirectLeaseStandIn(
+            StandInConfig(stations=10, latency=0.1, validate_checksum=False)
+        )
+        base_url = await standin.start()
+        inject = standin._async_inject
+
+        async def _async_inject(request, latency):
+            received.append(request.headers)
+            return await inject(request, latency)
+
+        standin._async_inject = _async_inject
+        transport = DirectLeaseTransport(limit_per_host=2, session_factory=_factory)
+
+        async def _get(station_id):
+            async with transport.get(f"{base_url}/places/{station_id}", "detail", 5) as response:
+                await response.read()
+                return response.status
+
+        try:
+            statuses = await asyncio.gather(*(_get(station_id) for station_id in range(1, 5)))
+            return statuses, transport.stats(), list(transport._timings)
+        finally:
+            await transport.async_close()
+            await standin.stop()
+
+    statuses, stats, timings = asyncio.run(_run())
+    assert statuses == [200] * 4
+    assert len(created) == 1
+    assert len(created[0]["trace_configs"]) == 1
+    # The mobile headers go with every request, not with the session
+    for headers in received:
+        for name, value in REQUEST_HEADERS.items():
+            assert headers[name] == value
+    assert stats["dedicated_session"]
+    # Four requests through two slots: the last two waited for the first two
+    assert sorted(timing.queued > 0.05 for timing in timings) == [False, False, True, True]